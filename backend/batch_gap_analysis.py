@@ -0,0 +1,71 @@
+"""
+Batch gap analysis: scores every (resume, JD) pair of a JSONL file with the
+same hybrid score as /api/gap-analyzer and writes one JSONL result per pair.
+
+Input lines are {"id": ..., "resume_text": ..., "jd_text": ...} ("id" is
+optional). Each unique text is extracted and embedded once, however many
+pairs it is in. Provider keys come from OPENAI_API_KEY, GEMINI_API_KEY,
+MISTRAL_API_KEY and GROQ_API_KEY (or .env).
+
+Usage (from backend/):
+    python batch_gap_analysis.py pairs.jsonl -o scores.jsonl --model openai
+    python batch_gap_analysis.py pairs.jsonl -o scores.jsonl --model openai --llm-batch provider
+    python batch_gap_analysis.py pairs.jsonl -o scores.jsonl --model mistral --llm-batch local
+
+--llm-batch provider submits the LLM extraction as a Batch API job (openai,
+groq): about half the price, results within the job's completion window.
+--llm-batch local runs the same path in-process, for tests.
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from dotenv import load_dotenv
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of pairs")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file for the results")
+    parser.add_argument("--model", default="mistral", help="provider for extraction and embeddings")
+    parser.add_argument("--llm-batch", choices=("provider", "local"), help="run the LLM extraction as a batch job")
+    parser.add_argument("--embedding-mode", choices=("full", "chunked"), default=None)
+    parser.add_argument("--chunk-aggregation", choices=("mean", "max"), default=None)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    load_dotenv()
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from services.batch_analysis import batch_gap_analysis, get_batch_submitter, read_pairs, write_results
+
+    keys = {
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "gemini_api_key": os.getenv("GEMINI_API_KEY"),
+        "mistral_api_key": os.getenv("MISTRAL_API_KEY"),
+        "groq_api_key": os.getenv("GROQ_API_KEY"),
+    }
+    submitter = None
+    if args.llm_batch:
+        submitter = get_batch_submitter(
+            args.llm_batch, args.model,
+            keys["openai_api_key"] or keys["mistral_api_key"], keys["groq_api_key"], keys["gemini_api_key"]
+        )
+
+    pairs = read_pairs(args.input)
+    results, stats = batch_gap_analysis(
+        pairs, args.model, **keys,
+        submitter=submitter, embedding_mode=args.embedding_mode, chunk_aggregation=args.chunk_aggregation
+    )
+    write_results(args.output, results)
+
+    print(json.dumps(stats, indent=2))
+    return 1 if stats["failed_pairs"] or stats["invalid_pairs"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for transcript canonicalization.
+
+Checks that fix_transcript stays linear in transcript length and flat as the
+skills list grows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_fix_transcript
+"""
+import random
+import string
+import time
+
+from services import video_processor
+from services.video_processor import (
+    SKILLS,
+    build_variation_map,
+    compile_variation_pattern,
+    normalize,
+)
+
+WORDS = (
+    "i have worked with on a team building services using and the for "
+    "deployed production pipelines long chain next js tensor flow node js "
+    "react python docker kubernetes stream lit fast api"
+).split()
+
+
+def make_transcript(n_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def make_skills(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    synthetic = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        for _ in range(max(0, n - len(SKILLS)))
+    ]
+    return list(SKILLS) + synthetic
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_transcript_length():
+    print("transcript words | ms     | us/word")
+    for n_words in (1_000, 5_000, 25_000, 125_000):
+        text = make_transcript(n_words)
+        elapsed = best_of(lambda: video_processor.fix_transcript(text))
+        print(f"{n_words:>16} | {elapsed * 1e3:6.2f} | {elapsed * 1e6 / n_words:.3f}")
+
+
+def bench_skills_size():
+    text = normalize(make_transcript(25_000))
+    print("skills | variants | ms")
+    for n_skills in (len(SKILLS), 1_000, 10_000, 50_000):
+        variation_map = build_variation_map(make_skills(n_skills))
+        pattern = compile_variation_pattern(variation_map)
+        elapsed = best_of(lambda: pattern.sub(lambda m: variation_map[m.group(0)], text))
+        print(f"{n_skills:>6} | {len(variation_map):>8} | {elapsed * 1e3:.2f}")
+
+
+if __name__ == "__main__":
+    bench_transcript_length()
+    print()
+    bench_skills_size()
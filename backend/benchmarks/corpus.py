@@ -0,0 +1,119 @@
+"""
+Synthetic benchmark corpus: resumes and JDs as text, PDF and DOCX, plus
+short video clips for the video analyzer.
+"""
+import os
+import random
+import shutil
+import subprocess
+from typing import Dict, List
+
+from services.skill_extractor import SKILL_WHITELIST
+
+ROLES = ["Backend Engineer", "Data Scientist", "Frontend Developer", "DevOps Engineer", "ML Engineer"]
+VERBS = ["Built", "Designed", "Maintained", "Migrated", "Optimized", "Led", "Automated"]
+OBJECTS = ["REST APIs", "data pipelines", "dashboards", "CI/CD workflows", "recommendation models", "microservices"]
+
+
+def make_resume(rng: random.Random, skills: List[str], n_jobs: int = 3) -> str:
+    lines = [
+        "Jane Doe",
+        "Email: jane.doe@example.com | Phone: +1 555 0100",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(2, 12)} years of experience.",
+        "",
+        "Experience",
+    ]
+    for _ in range(n_jobs):
+        lines.append(f"{rng.choice(ROLES)} at Company {rng.randint(1, 999)}")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(skills, 2))}."
+            )
+        lines.append("")
+    lines += [
+        "Education",
+        "B.Sc. Computer Science, State University",
+        "",
+        "Skills",
+        ", ".join(skills),
+    ]
+    return "\n".join(lines)
+
+
+def make_jd(rng: random.Random, skills: List[str]) -> str:
+    return "\n".join([
+        f"Job Title: {rng.choice(ROLES)}",
+        "",
+        "Responsibilities",
+        *(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}." for _ in range(5)),
+        "",
+        "Requirements",
+        *(f"- Experience with {s}" for s in skills),
+    ])
+
+
+def write_pdf(text: str, path: str) -> None:
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def write_docx(text: str, path: str) -> None:
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_clip(path: str, seconds: int = 3) -> None:
+    """Short test-pattern clip when ffmpeg is installed, otherwise placeholder bytes
+    (the benchmark's Whisper stand-in never decodes it)."""
+    if shutil.which("ffmpeg"):
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size=320x240:rate=10",
+                "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+                "-shortest", path,
+            ],
+            check=True,
+        )
+    else:
+        with open(path, "wb") as f:
+            f.write(os.urandom(4096))
+
+
+def build_corpus(out_dir: str, n_resumes: int = 20, n_jds: int = 3, n_clips: int = 2, seed: int = 0) -> Dict:
+    """Writes the corpus under out_dir and returns texts and file paths."""
+    rng = random.Random(seed)
+    skills = sorted(SKILL_WHITELIST)
+    os.makedirs(out_dir, exist_ok=True)
+
+    corpus = {"resumes": [], "jds": [], "resume_files": [], "jd_files": [], "clips": []}
+
+    for i in range(n_resumes):
+        text = make_resume(rng, rng.sample(skills, 10))
+        corpus["resumes"].append(text)
+        path = os.path.join(out_dir, f"resume_{i}.{'pdf' if i % 2 == 0 else 'docx'}")
+        (write_pdf if path.endswith(".pdf") else write_docx)(text, path)
+        corpus["resume_files"].append(path)
+
+    for i in range(n_jds):
+        text = make_jd(rng, rng.sample(skills, 8))
+        corpus["jds"].append(text)
+        path = os.path.join(out_dir, f"jd_{i}.pdf")
+        write_pdf(text, path)
+        corpus["jd_files"].append(path)
+
+    for i in range(n_clips):
+        path = os.path.join(out_dir, f"clip_{i}.mp4")
+        write_clip(path)
+        corpus["clips"].append(path)
+
+    return corpus
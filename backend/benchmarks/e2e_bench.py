@@ -0,0 +1,188 @@
+"""
+End-to-end benchmark for /api/gap-analyzer, /api/resume-screening and
+/api/video-gap-analyzer with recorded provider stand-ins (no API keys).
+
+Reports p50/p95/p99 latency and requests/sec per concurrency level, plus
+per-stage timings (parse, spacy, llm, embed, readability, transcription).
+
+Usage (from backend/):
+    python -m benchmarks.e2e_bench --requests 50 --concurrency 1,4,16
+    python -m benchmarks.e2e_bench --endpoints gap --llm-latency 0.8 --llm-cache
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+ENDPOINTS = ("gap", "screening", "video")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=30, help="requests per endpoint and concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="subset of: gap,screening,video")
+    parser.add_argument("--model", default="openai", help="provider name sent with gap/video requests")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.1)
+    parser.add_argument("--transcription-latency", type=float, default=2.0)
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency stddev as a fraction of the mean")
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache enabled")
+    parser.add_argument("--resumes", type=int, default=20, help="synthetic resumes in the corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_out", help="also write results to this file")
+    return parser.parse_args(argv)
+
+# ---------- Stats ---------- #
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1e3, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1e3, 2),
+        "p95_ms": round(percentile(values, 95) * 1e3, 2),
+        "p99_ms": round(percentile(values, 99) * 1e3, 2),
+    }
+
+# ---------- Requests ---------- #
+
+def make_requests(client, corpus: Dict, model: str) -> Dict[str, Callable[[int], object]]:
+    resumes, jds = corpus["resumes"], corpus["jds"]
+    resume_files, jd_files, clips = corpus["resume_files"], corpus["jd_files"], corpus["clips"]
+    keys = {f"{p}_api_key": "fake" for p in ("openai", "gemini", "mistral", "groq")}
+
+    def gap(i: int):
+        return client.post("/api/gap-analyzer", json={
+            "resume_text": resumes[i % len(resumes)],
+            "jd_text": jds[i % len(jds)],
+            "model": model,
+            **keys,
+        })
+
+    def screening(i: int):
+        batch = [resume_files[(i + j) % len(resume_files)] for j in range(5)]
+        jd_path = jd_files[i % len(jd_files)]
+        handles = [open(p, "rb") for p in [jd_path, *batch]]
+        try:
+            files = [("jd_file", (os.path.basename(jd_path), handles[0]))]
+            files += [("resumes", (os.path.basename(p), h)) for p, h in zip(batch, handles[1:])]
+            return client.post("/api/resume-screening", files=files, data={"openai_api_key": "fake"})
+        finally:
+            for h in handles:
+                h.close()
+
+    def video(i: int):
+        clip = clips[i % len(clips)]
+        with open(clip, "rb") as f:
+            return client.post(
+                "/api/video-gap-analyzer",
+                files={"video": (os.path.basename(clip), f, "video/mp4")},
+                data={"jd_text": jds[i % len(jds)], "model": model, **keys},
+            )
+
+    return {"gap": gap, "screening": screening, "video": video}
+
+
+def run_level(send: Callable[[int], object], n_requests: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+
+    def one(i: int):
+        start = time.perf_counter()
+        response = send(i)
+        return time.perf_counter() - start, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, status in pool.map(one, range(n_requests)):
+            latencies.append(elapsed)
+            errors += status != 200
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(n_requests / wall, 2),
+        **summarize(latencies),
+    }
+
+# ---------- Main ---------- #
+
+def main(argv=None):
+    args = parse_args(argv)
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    work_dir = tempfile.mkdtemp(prefix="e2e_bench_")
+
+    # must be set before the services read them at import time
+    if not args.llm_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "0"
+    # fake embeddings must not end up in the real skill-vector cache
+    os.environ["SKILL_VECTOR_CACHE_DIR"] = os.path.join(work_dir, "skill_vectors")
+
+    from benchmarks.fakes import install_fakes, stage_timer
+    from benchmarks.corpus import build_corpus
+
+    install_fakes(
+        llm_latency=args.llm_latency,
+        embed_latency=args.embed_latency,
+        transcription_latency=args.transcription_latency,
+        jitter=args.jitter,
+    )
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    corpus = build_corpus(os.path.join(work_dir, "corpus"), n_resumes=args.resumes, seed=args.seed)
+    client = TestClient(app)
+    senders = make_requests(client, corpus, args.model)
+
+    # warm-up: model loads and the skill matrix build should not count
+    for name in endpoints:
+        senders[name](0)
+
+    results = {}
+    for name in endpoints:
+        results[name] = {"levels": [], "stages": {}}
+        print(f"\n== {name} ==")
+        print("concurrency |    rps | p50 ms | p95 ms | p99 ms | errors")
+        for level in levels:
+            stage_timer.reset()
+            row = run_level(senders[name], args.requests, level)
+            row["stages"] = {stage: summarize(v) for stage, v in sorted(stage_timer.samples.items())}
+            results[name]["levels"].append(row)
+            print(
+                f"{level:>11} | {row['rps']:>6} | {row['p50_ms']:>6} | "
+                f"{row['p95_ms']:>6} | {row['p99_ms']:>6} | {row['errors']}"
+            )
+
+        print("stage (last level) | calls | p50 ms | p95 ms | p99 ms")
+        for stage, stats in results[name]["levels"][-1]["stages"].items():
+            print(
+                f"{stage:>18} | {stats['count']:>5} | {stats['p50_ms']:>6} | "
+                f"{stats['p95_ms']:>6} | {stats['p99_ms']:>6}"
+            )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
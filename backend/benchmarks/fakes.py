@@ -0,0 +1,263 @@
+"""
+Provider stand-ins for benchmarks: replay recorded responses with a
+configurable latency so the full pipeline runs without API keys.
+
+install_fakes() patches the provider clients, embedding models and Whisper
+where the services look them up (the provider SDK modules, which the
+services import on first use), and wraps the local stages (parsing, spaCy,
+readability) with timers.
+"""
+import os
+import json
+import time
+import asyncio
+import random
+import hashlib
+import importlib
+import threading
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, List
+
+RECORDINGS_FILE = os.path.join(os.path.dirname(__file__), "recordings.json")
+
+# ---------- Stage Timings ---------- #
+
+class StageTimer:
+    """Thread-safe collection of per-call durations (seconds) per stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def wrap(self, stage: str, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        timed.__wrapped__ = fn
+        return timed
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+
+
+stage_timer = StageTimer()
+
+# ---------- Latency ---------- #
+
+class Latency:
+    def __init__(self, mean: float, jitter: float = 0.2, seed: int = 0):
+        self.mean = mean
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        with self._lock:
+            return max(0.0, self._rng.gauss(self.mean, self.mean * self.jitter))
+
+    def sleep(self, stage: str) -> None:
+        delay = self._delay()
+        time.sleep(delay)
+        stage_timer.record(stage, delay)
+
+    async def asleep(self, stage: str) -> None:
+        delay = self._delay()
+        await asyncio.sleep(delay)
+        stage_timer.record(stage, delay)
+
+# ---------- Fakes ---------- #
+
+def _message(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeChat:
+    """Stands in for ChatOpenAI/ChatGroq/... and the raw OpenAI client, sync and async."""
+
+    latency: Latency = Latency(0.0)
+    recordings: Dict = {}
+
+    def __init__(self, *args, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _recording(self, prompt: str) -> str:
+        key = "readability_feedback" if "resume expert" in prompt else (
+            "video_feedback" if "VIDEO RESUME" in prompt else "extract_skills"
+        )
+        return self.recordings[key]
+
+    def _reply(self, prompt: str) -> str:
+        self.latency.sleep("llm")
+        return self._recording(prompt)
+
+    async def _areply(self, prompt: str) -> str:
+        await self.latency.asleep("llm")
+        return self._recording(prompt)
+
+    # OpenAI().chat.completions.create(...)
+    def _create(self, model=None, messages=None, **kwargs):
+        return _message(self._reply(messages[-1]["content"]))
+
+    def invoke(self, prompt):
+        return SimpleNamespace(content=self._reply(str(prompt)))
+
+    def predict(self, prompt):
+        return self._reply(prompt)
+
+    async def ainvoke(self, prompt):
+        return SimpleNamespace(content=await self._areply(str(prompt)))
+
+    async def apredict(self, prompt):
+        return await self._areply(prompt)
+
+
+class FakeAsyncOpenAI(FakeChat):
+    """AsyncOpenAI(...) used as an async context manager."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._acreate))
+
+    async def _acreate(self, model=None, messages=None, **kwargs):
+        return _message(await self._areply(messages[-1]["content"]))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeMistralAsyncClient(FakeChat):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def chat(self, model=None, messages=None, **kwargs):
+        return _message(await self._areply(messages[-1]["content"]))
+
+    async def close(self):
+        pass
+
+
+class FakeEmbeddings:
+    """Deterministic pseudo-random vectors seeded by the text hash."""
+
+    latency: Latency = Latency(0.0)
+    dim = 384
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _vector(self, text: str) -> List[float]:
+        import numpy as np
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).standard_normal(self.dim).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        self.latency.sleep("embed")
+        return self._vector(text)
+
+    def embed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.latency.sleep("embed")
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await self.latency.asleep("embed")
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        await self.latency.asleep("embed")
+        return [self._vector(t) for t in texts]
+
+
+class FakeWhisper:
+    latency: Latency = Latency(0.0)
+    recordings: Dict = {}
+
+    def transcribe(self, audio_path, **kwargs):
+        self.latency.sleep("transcription")
+        segments = []
+        for seg in self.recordings["transcript_segments"]:
+            words = seg["text"].split()
+            step = (seg["end"] - seg["start"]) / max(1, len(words))
+            segments.append(SimpleNamespace(
+                start=seg["start"],
+                end=seg["end"],
+                text=seg["text"],
+                words=[
+                    SimpleNamespace(word=" " + w, start=seg["start"] + i * step, end=seg["start"] + (i + 1) * step)
+                    for i, w in enumerate(words)
+                ],
+            ))
+        return iter(segments), None
+
+
+def _fake_extract_audio(video_path: str) -> str:
+    audio_path = video_path + ".wav"
+    open(audio_path, "wb").close()
+    return audio_path
+
+# ---------- Install ---------- #
+
+def _patch(module_name: str, name: str, value) -> None:
+    setattr(importlib.import_module(module_name), name, value)
+
+
+def install_fakes(
+    llm_latency: float = 0.5,
+    embed_latency: float = 0.1,
+    transcription_latency: float = 2.0,
+    jitter: float = 0.2,
+    recordings_file: str = RECORDINGS_FILE
+) -> None:
+    """Patch provider clients, embeddings and Whisper; wrap local stages with timers."""
+    from services import (
+        pdf_parser,
+        readability,
+        skill_extractor,
+        video_feedback,
+        video_processor,
+    )
+
+    with open(recordings_file, "r", encoding="utf-8") as f:
+        recordings = json.load(f)
+
+    FakeChat.latency = Latency(llm_latency, jitter, seed=1)
+    FakeChat.recordings = recordings
+    FakeEmbeddings.latency = Latency(embed_latency, jitter, seed=2)
+    FakeWhisper.latency = Latency(transcription_latency, jitter, seed=3)
+    FakeWhisper.recordings = recordings
+
+    # LLM providers
+    _patch("langchain_groq", "ChatGroq", FakeChat)
+    _patch("langchain_google_genai", "ChatGoogleGenerativeAI", FakeChat)
+    _patch("openai", "AsyncOpenAI", FakeAsyncOpenAI)
+    _patch("mistralai.async_client", "MistralAsyncClient", FakeMistralAsyncClient)
+    fake_get_llm = lambda *args, **kwargs: FakeChat()
+    readability.get_llm = fake_get_llm
+    video_feedback.get_llm = fake_get_llm
+
+    # Embeddings
+    _patch("langchain_community.embeddings", "OpenAIEmbeddings", FakeEmbeddings)
+    _patch("langchain_community.embeddings", "HuggingFaceEmbeddings", FakeEmbeddings)
+    _patch("langchain_mistralai", "MistralAIEmbeddings", FakeEmbeddings)
+    _patch("langchain_google_genai", "GoogleGenerativeAIEmbeddings", FakeEmbeddings)
+
+    # Whisper / ffmpeg
+    video_processor.whisper_model = FakeWhisper()
+    video_processor.extract_audio = _fake_extract_audio
+
+    # Local stages
+    pdf_parser.parse_pdf = stage_timer.wrap("parse", pdf_parser.parse_pdf)
+    pdf_parser.parse_docx = stage_timer.wrap("parse", pdf_parser.parse_docx)
+    skill_extractor.extract_skills_spacy = stage_timer.wrap("spacy", skill_extractor.extract_skills_spacy)
+    readability.calculate_readability_score = stage_timer.wrap("readability", readability.calculate_readability_score)
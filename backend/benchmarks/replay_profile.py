@@ -0,0 +1,75 @@
+"""
+Replays a request captured by the profiling middleware (services/profiling.py)
+in-process and prints its cProfile hot spots, so a slow production input can
+be reproduced offline.
+
+Usage (from backend/):
+    python -m benchmarks.replay_profile profiles/1718000000_ab12cd34ef56ab78.json
+    python -m benchmarks.replay_profile <record.json> --fakes --repeat 5
+"""
+import sys
+import time
+import json
+import pstats
+import argparse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("record", help="profile record (.json) written by the profiling middleware")
+    parser.add_argument("--fakes", action="store_true", help="replay against recorded provider stand-ins")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.record, "r", encoding="utf-8") as f:
+        record = json.load(f)
+    body_path = args.record[:-len(".json")] + ".body"
+    try:
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except FileNotFoundError:
+        sys.exit(f"No stored input at {body_path} (set PROFILE_STORE_INPUTS=1 to keep request bodies)")
+
+    if args.fakes:
+        from benchmarks.fakes import install_fakes
+        install_fakes(llm_latency=0.0, embed_latency=0.0, transcription_latency=0.0)
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.profiling import profile_session
+
+    sessions = []
+
+    # TestClient runs the app on its own event-loop thread; profile there and
+    # in the threadpool workers that run sync endpoints
+    async def profiled_app(scope, receive, send):
+        with profile_session() as session:
+            await app(scope, receive, send)
+        sessions.append(session)
+
+    client = TestClient(profiled_app)
+    url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+
+    print(f"{record['method']} {url} digest={record['digest'][:16]} recorded={record['elapsed_seconds']}s")
+
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        response = client.request(record["method"], url, content=body, headers={"content-type": record["content_type"]})
+        print(f"run {i + 1}: status={response.status_code} {time.perf_counter() - start:.3f}s")
+
+    stats = pstats.Stats()
+    for session in sessions:
+        session_stats = session.stats()
+        if session_stats is not None:
+            stats.add(session_stats)
+    stats.sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 import os
+import time
+import importlib
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -6,13 +11,10 @@ from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv()
 
-# Import routers
-from routers import (
-    gap_analyzer,
-    resume_advisor,
-    resume_screening,
-    video_gap_analyzer,  
-)
+from services.metrics import metrics_middleware
+from services.profiling import PROFILING_ENABLED, profiling_middleware
+from services.startup import ROUTERS, enabled_routers, record_startup
+from services.warmup import start_warm_up
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -33,11 +35,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ✅ ATS Routers
-app.include_router(gap_analyzer.router, prefix="/api", tags=["Gap Analyzer"])
-app.include_router(resume_advisor.router, prefix="/api", tags=["Resume Advisor"])
-app.include_router(resume_screening.router, prefix="/api", tags=["Resume Screening"])
-app.include_router(video_gap_analyzer.router, prefix="/api", tags=["Video Gap Analyzer"])  
+# Per-route latency / in-flight requests for /metrics
+app.middleware("http")(metrics_middleware)
+
+# Opt-in CPU/allocation profiles for sampled or slow requests (PROFILING_ENABLED=1)
+if PROFILING_ENABLED:
+    app.middleware("http")(profiling_middleware)
+
+# Per-worker warm-up in the background; /ready answers 503 until it is done
+app.add_event_handler("startup", start_warm_up)
+
+# ✅ ATS Routers: only those in ENABLED_ROUTERS (default: all) are imported;
+# provider SDKs and models load on their first use
+routers = enabled_routers()
+for name in routers:
+    module = importlib.import_module(f"routers.{name}")
+    app.include_router(module.router, prefix="/api", tags=[ROUTERS[name]])
+
+# 📈 Monitoring (Prometheus scrape target and readiness probe, outside /api)
+from routers import metrics, health
+app.include_router(metrics.router, tags=["Metrics"])
+app.include_router(health.router, tags=["Health"])
+
+record_startup(time.perf_counter() - _import_started, routers)
 
 # Root endpoint for health check
 @app.get("/")
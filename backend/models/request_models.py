@@ -3,12 +3,15 @@ from typing import List, Optional
 
 class GapAnalyzerRequest(BaseModel):
     resume_text: str
-    jd_text: str
-    model: str  # e.g., "openai", "mistral", "gemini", "groq", etc.
+    jd_text: Optional[str] = None
+    jd_id: Optional[str] = None  # registered JD (POST /api/jds) instead of jd_text
+    model: str  # e.g., "openai", "mistral", "gemini", "groq", "local" (offline)
     openai_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
     mistral_api_key: Optional[str] = None
     groq_api_key: Optional[str] = None
+    incremental: bool = False  # reuse cached per-paragraph results from earlier runs
+    document_id: Optional[str] = None  # from /upload-resume: use the file's layout while resume_text is unedited
 
 class GapAnalyzerResponse(BaseModel):
     score: float  # ATS score (0-100)
@@ -21,7 +24,7 @@ class GapAnalyzerResponse(BaseModel):
 class ResumeAdvisorRequest(BaseModel):
     resume: str
     jd: str
-    model: str  # openai, mistral, gemini, groq
+    model: str  # openai, mistral, gemini, groq, local
     openai_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
     mistral_api_key: Optional[str] = None
@@ -29,3 +32,39 @@ class ResumeAdvisorRequest(BaseModel):
 
 class ResumeAdvisorResponse(BaseModel):
     advisor_output: str  # The AI-generated resume improvement advice
+
+# ---------- Talent Pool Models ----------
+class TalentPoolSearchRequest(BaseModel):
+    jd_text: str
+    model: str  # openai, mistral, gemini, groq, local
+    top_k: int = 20
+    openai_api_key: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+    mistral_api_key: Optional[str] = None
+    groq_api_key: Optional[str] = None
+
+# ---------- Job Matcher Models ----------
+class JobInput(BaseModel):
+    jd_text: str
+    job_id: Optional[str] = None
+    title: Optional[str] = None
+
+class JobMatchRequest(BaseModel):
+    resume_text: str
+    jobs: List[JobInput]  # open roles to score the resume against
+    model: str  # openai, mistral, gemini, groq, local
+    top_k: Optional[int] = None  # return only the best k roles
+    openai_api_key: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+    mistral_api_key: Optional[str] = None
+    groq_api_key: Optional[str] = None
+
+# ---------- JD Registry Models ----------
+class JDRegisterRequest(BaseModel):
+    jd_text: str
+    model: str  # artifacts are computed for this model right away
+    title: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+    mistral_api_key: Optional[str] = None
+    groq_api_key: Optional[str] = None
@@ -1,45 +1,85 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from typing import Dict, Optional
 from models.request_models import GapAnalyzerRequest
-from services.embeddings import calculate_gap_score
-from services.pdf_parser import extract_text
-from services.readability import calculate_readability
+from services.llm_utils import SUPPORTED_MODELS
+from services.embeddings import acalculate_gap_score
+from services.pdf_parser import extract_document, extract_text
+from services.document_layout import get_document, layout_for, register_document
+from services.readability import acalculate_readability, aget_readability_feedback
+from services.incremental_analysis import analyze_incremental
+from routers.jd_registry import load_jd
+from services.admission import admit
+from services.profiling import ProfiledRoute
+from services.async_runtime import run_blocking
+import asyncio
 import tempfile
 import shutil
 import os
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
-@router.post("/gap-analyzer")
+
+def load_document(document_id: Optional[str], resume_text: str) -> Optional[Dict]:
+    """
+    The uploaded file's document for a request's `document_id`, or None
+    when there is none or resume_text was edited since the upload.
+    """
+    if not document_id:
+        return None
+    document = get_document(document_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired document_id: {document_id}. Upload the file again.")
+    return layout_for(resume_text, document)
+
+@router.post("/gap-analyzer", dependencies=[Depends(admit("analysis"))])
 async def analyze_gap(data: GapAnalyzerRequest):
     """
     Computes ATS score and readability score with feedback.
     Supports user-provided API keys for OpenAI, Gemini, Mistral, and Groq.
+    The JD is given as `jd_text` or as a registered `jd_id`; a `document_id`
+    from /upload-resume lets the analysis use the resume file's layout.
     """
 
     # Normalize model name
     model_name = (data.model or "").lower()
-    if model_name not in ["openai", "mistral", "gemini", "groq"]:
+    if model_name not in SUPPORTED_MODELS:
         raise ValueError(f"Unsupported model selected: {data.model}")
 
-    # --- ATS Score ---
-    ats_result = calculate_gap_score(
-        resume_text=data.resume_text,
-        jd_text=data.jd_text,
-        user_model=model_name,
+    jd_text, jd_artifacts = await run_blocking(
+        load_jd, data.jd_id, data.jd_text, model_name,
         openai_api_key=data.openai_api_key,
         gemini_api_key=data.gemini_api_key,
         mistral_api_key=data.mistral_api_key,
         groq_api_key=data.groq_api_key
     )
 
-    # --- Readability Score & Feedback ---
-    readability_result = calculate_readability(
-        resume_text=data.resume_text,
-        model_name=model_name,
-        openai_api_key=data.openai_api_key,
-        gemini_api_key=data.gemini_api_key,
-        mistral_api_key=data.mistral_api_key,
-        groq_api_key=data.groq_api_key
+    document = load_document(data.document_id, data.resume_text)
+
+    if data.incremental:
+        return await analyze_gap_incremental(data, model_name, jd_text, jd_artifacts, document)
+
+    # --- ATS Score | Readability Score & Feedback (concurrently) ---
+    ats_result, readability_result = await asyncio.gather(
+        acalculate_gap_score(
+            resume_text=data.resume_text,
+            jd_text=jd_text,
+            user_model=model_name,
+            openai_api_key=data.openai_api_key,
+            gemini_api_key=data.gemini_api_key,
+            mistral_api_key=data.mistral_api_key,
+            groq_api_key=data.groq_api_key,
+            jd_artifacts=jd_artifacts,
+            resume_document=document
+        ),
+        acalculate_readability(
+            resume_text=data.resume_text,
+            model_name=model_name,
+            openai_api_key=data.openai_api_key,
+            gemini_api_key=data.gemini_api_key,
+            mistral_api_key=data.mistral_api_key,
+            groq_api_key=data.groq_api_key,
+            document=document
+        )
     )
 
     # --- Combine Results ---
@@ -56,24 +96,72 @@ async def analyze_gap(data: GapAnalyzerRequest):
         "readability_feedback": readability_result["llm_feedback"],
     }
 
+async def analyze_gap_incremental(data: GapAnalyzerRequest, model_name: str, jd_text: str, jd_artifacts=None, document=None):
+    """
+    Same response as /gap-analyzer, recomputing only the resume paragraphs
+    that changed since earlier runs.
+    """
+    result, feedback = await asyncio.gather(
+        run_blocking(
+            analyze_incremental,
+            resume_text=data.resume_text,
+            jd_text=jd_text,
+            user_model=model_name,
+            openai_api_key=data.openai_api_key,
+            gemini_api_key=data.gemini_api_key,
+            mistral_api_key=data.mistral_api_key,
+            groq_api_key=data.groq_api_key,
+            jd_artifacts=jd_artifacts,
+            document=document
+        ),
+        # LLM feedback reads the whole resume, so it always runs
+        aget_readability_feedback(
+            data.resume_text,
+            model_name,
+            openai_api_key=data.openai_api_key,
+            gemini_api_key=data.gemini_api_key,
+            mistral_api_key=data.mistral_api_key,
+            groq_api_key=data.groq_api_key,
+            document=document
+        )
+    )
+
+    return {
+        # ATS
+        "score": result["score"],
+        "matched_skills": result["matched_skills"],
+        "missing_skills": result["missing_skills"],
+        "total_resume_skills": result["total_resume_skills"],
+        "total_jd_skills": result["total_jd_skills"],
+
+        # Readability
+        "readability_score": result["readability"]["readability_score"],
+        "readability_feedback": feedback,
+
+        # Incremental stats
+        "changed_blocks": result["changed_blocks"],
+        "total_blocks": result["total_blocks"],
+    }
+
 @router.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+def upload_resume(file: UploadFile = File(...)):
     """
-    Upload resume (PDF/DOCX), extract text and return it.
+    Upload resume (PDF/DOCX), extract text and return it, with the
+    `document_id` to pass to /gap-analyzer so it can use the file's layout.
     """
     with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as tmp:
         shutil.copyfileobj(file.file, tmp)
         tmp_path = tmp.name
 
     try:
-        text = extract_text(tmp_path)
+        document = extract_document(tmp_path)
     finally:
         os.remove(tmp_path)
 
-    return {"extracted_text": text}
+    return {"extracted_text": document["text"], "document_id": register_document(document)}
 
 @router.post("/upload-jd")
-async def upload_jd(file: UploadFile = File(...)):
+def upload_jd(file: UploadFile = File(...)):
     """
     Upload Job Description (PDF/DOCX), extract text and return it.
     """
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.warmup import readiness
+
+router = APIRouter()
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness probe: 503 until this worker has finished its warm-up (models
+    loaded and run once), then 200. Per-step warm-up seconds, any failed
+    steps, the app's import time and the enabled routers are included.
+    """
+    state = readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from typing import Dict, Optional, Tuple
+from models.request_models import JDRegisterRequest
+from services.jd_registry import get_jd_registry, summarize_jd
+from services.pdf_parser import extract_text
+from services.llm_utils import SUPPORTED_MODELS
+from services.admission import admit
+from services.profiling import ProfiledRoute
+import tempfile
+import shutil
+import os
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+def load_jd(
+    jd_id: Optional[str],
+    jd_text: Optional[str],
+    model_name: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None
+) -> Tuple[str, Optional[Dict]]:
+    """
+    (jd_text, registry artifacts or None) for endpoints that accept either a
+    registered `jd_id` or raw JD text.
+    """
+    if jd_id:
+        try:
+            artifacts = get_jd_registry().artifacts(
+                jd_id,
+                model_name,
+                openai_api_key=openai_api_key,
+                gemini_api_key=gemini_api_key,
+                mistral_api_key=mistral_api_key,
+                groq_api_key=groq_api_key,
+            )
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+        return artifacts["jd_text"], artifacts
+
+    if not jd_text:
+        raise HTTPException(status_code=400, detail="Provide jd_text or a registered jd_id.")
+    return jd_text, None
+
+
+def _register(jd_text: str, title: Optional[str], model: str, **keys) -> Dict:
+    model_name = (model or "").lower()
+    if model_name not in SUPPORTED_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported model selected: {model}")
+    if not jd_text.strip():
+        raise HTTPException(status_code=400, detail="Job description is empty.")
+
+    registry = get_jd_registry()
+    record = registry.register(jd_text, title=title)
+
+    # extract + embed now, so later requests only read the artifacts
+    registry.artifacts(record["jd_id"], model_name, **keys)
+    return summarize_jd(record)
+
+
+@router.post("/jds", dependencies=[Depends(admit("analysis"))])
+def register_jd(data: JDRegisterRequest):
+    """
+    Register a Job Description: extracts its skills and embedding once and
+    returns a `jd_id` accepted by the gap analyzer, screening and video analyzer.
+    """
+    return _register(
+        data.jd_text,
+        data.title,
+        data.model,
+        openai_api_key=data.openai_api_key,
+        gemini_api_key=data.gemini_api_key,
+        mistral_api_key=data.mistral_api_key,
+        groq_api_key=data.groq_api_key,
+    )
+
+
+@router.post("/jds/upload", dependencies=[Depends(admit("analysis"))])
+def register_jd_file(
+    jd_file: UploadFile = File(...),
+    model: str = Form(...),
+    title: Optional[str] = Form(None),
+    openai_api_key: Optional[str] = Form(None),
+    gemini_api_key: Optional[str] = Form(None),
+    mistral_api_key: Optional[str] = Form(None),
+    groq_api_key: Optional[str] = Form(None),
+):
+    """
+    Register a Job Description from a PDF/DOCX file.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{jd_file.filename}") as tmp:
+        shutil.copyfileobj(jd_file.file, tmp)
+        tmp_path = tmp.name
+
+    try:
+        jd_text = extract_text(tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+    return _register(
+        jd_text,
+        title or jd_file.filename,
+        model,
+        openai_api_key=openai_api_key,
+        gemini_api_key=gemini_api_key,
+        mistral_api_key=mistral_api_key,
+        groq_api_key=groq_api_key,
+    )
+
+
+@router.get("/jds")
+def list_jds():
+    return {"jds": get_jd_registry().list()}
+
+
+@router.get("/jds/{jd_id}")
+def get_jd(jd_id: str):
+    record = get_jd_registry().get(jd_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+    return {**summarize_jd(record), "jd_text": record["jd_text"]}
+
+
+@router.delete("/jds/{jd_id}")
+def delete_jd(jd_id: str):
+    if not get_jd_registry().delete(jd_id):
+        raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+    return {"deleted": jd_id}
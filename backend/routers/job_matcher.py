@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from models.request_models import JobMatchRequest
+from services.job_matching import rank_jobs_for_resume
+from services.llm_utils import SUPPORTED_MODELS
+from services.admission import admit
+from services.profiling import ProfiledRoute
+import os
+
+router = APIRouter(route_class=ProfiledRoute)
+
+MAX_JOBS_PER_REQUEST = int(os.getenv("MAX_JOBS_PER_REQUEST", "500"))
+
+
+@router.post("/job-matcher", dependencies=[Depends(admit("analysis"))])
+def match_jobs(data: JobMatchRequest):
+    """
+    Score one resume against many Job Descriptions and rank the roles.
+    The resume is extracted and embedded once; JD skills and vectors are
+    cached across requests.
+    """
+    model_name = (data.model or "").lower()
+    if model_name not in SUPPORTED_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported model selected: {data.model}")
+
+    if not data.jobs:
+        raise HTTPException(status_code=400, detail="Provide at least one job description.")
+
+    if len(data.jobs) > MAX_JOBS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_JOBS_PER_REQUEST} job descriptions per request.")
+
+    return rank_jobs_for_resume(
+        resume_text=data.resume_text,
+        jobs=[job.model_dump() for job in data.jobs],
+        user_model=model_name,
+        openai_api_key=data.openai_api_key,
+        gemini_api_key=data.gemini_api_key,
+        mistral_api_key=data.mistral_api_key,
+        groq_api_key=data.groq_api_key,
+        top_k=data.top_k,
+    )
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus text exposition: stage and provider-call latency histograms,
+    request latency and in-flight requests per route, cache hit/miss counts
+    and LLM token usage.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
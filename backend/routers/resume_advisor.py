@@ -1,20 +1,24 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from pydantic import BaseModel
-from services.llm_utils import get_llm
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from services.llm_utils import get_llm, MODEL_MAP, LLM_TEMPERATURE, LOCAL_MODEL
+from services.local_provider import local_advisor_feedback
+from services.skill_extractor import compare_skills
+from services.llm_cache import cached_llm_call
 from services.pdf_parser import extract_text
+from services.prompt_builder import fit_to_budget
+from services.admission import admit
+from services.profiling import ProfiledRoute
 import tempfile
 import shutil
 import os
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # ---------- Request & Response Models ----------
 class ResumeAdvisorRequest(BaseModel):
     resume: str
     jd: str
-    model: str  # "openai", "mistral", "gemini", or "groq"
+    model: str  # "openai", "mistral", "gemini", "groq" or "local"
     openai_api_key: str | None = None
     mistral_api_key: str | None = None
     gemini_api_key: str | None = None
@@ -23,14 +27,35 @@ class ResumeAdvisorRequest(BaseModel):
 class ResumeAdvisorResponse(BaseModel):
     advisor_output: str
 
+ADVISOR_PROMPT = """
+        You are an expert career advisor helping users tailor their resume for a specific job description.
+
+        Job Description:
+        {jd}
+
+        Resume:
+        {resume}
+
+        Based on this, please:
+        1. Identify missing skills, qualifications, or experiences
+        2. Suggest specific additions or edits to improve the resume
+        3. Make your suggestions actionable and concise
+        4. Format your response as readable bullet points under clear headings like "Missing Skills" and "Suggestions". Do not use JSON or brackets.
+        """
+
 # ---------- Endpoint ----------
-@router.post("/resume-advisor", response_model=ResumeAdvisorResponse)
-async def resume_advisor(data: ResumeAdvisorRequest):
+@router.post("/resume-advisor", response_model=ResumeAdvisorResponse, dependencies=[Depends(admit("analysis"))])
+def resume_advisor(data: ResumeAdvisorRequest):
     """
     Generates actionable resume improvement suggestions based on the job description.
-    Supports OpenAI, Mistral, Gemini, and Groq models.
+    Supports OpenAI, Mistral, Gemini, Groq and the offline local provider.
     """
     try:
+        # Offline provider: rule-based advice from the skill comparison
+        if (data.model or "").strip().lower() == LOCAL_MODEL:
+            skill_data = compare_skills(data.resume, data.jd, model=LOCAL_MODEL)
+            return ResumeAdvisorResponse(advisor_output=local_advisor_feedback(skill_data))
+
         # ✅ Select appropriate LLM dynamically
         llm = get_llm(
             model_name=data.model,
@@ -40,28 +65,31 @@ async def resume_advisor(data: ResumeAdvisorRequest):
             groq_api_key=data.groq_api_key,
         )
 
-        # Prompt template
-        prompt = PromptTemplate.from_template("""
-        You are an expert career advisor helping users tailor their resume for a specific job description.
-
-        Job Description:
-        {jd}
-
-        Resume:
-        {resume}
-
-        Based on this, please:
-        1. Identify missing skills, qualifications, or experiences
-        2. Suggest specific additions or edits to improve the resume
-        3. Make your suggestions actionable and concise
-        4. Format your response as readable bullet points under clear headings like "Missing Skills" and "Suggestions". Do not use JSON or brackets.
-        """)
+        # Prompt template (langchain is imported on the first LLM request)
+        from langchain.prompts import PromptTemplate
+        from langchain.chains import LLMChain
+        prompt = PromptTemplate.from_template(ADVISOR_PROMPT)
+
+        # Fit resume and JD into the provider's token budget (resume trimmed first)
+        model_name = (data.model or "").strip().lower()
+        fitted = fit_to_budget(
+            ADVISOR_PROMPT.format(jd="", resume=""),
+            {"jd": data.jd, "resume": data.resume},
+            provider=model_name,
+            priorities={"jd": 1, "resume": 0},
+        )
 
         # LLM Chain
         chain = LLMChain(llm=llm, prompt=prompt)
 
         # Run LLM
-        response = chain.run(resume=data.resume, jd=data.jd)
+        rendered = ADVISOR_PROMPT.format(**fitted)
+        response = cached_llm_call(
+            "resume_advisor", model_name, MODEL_MAP[model_name], LLM_TEMPERATURE, rendered,
+            lambda: chain.run(**fitted),
+            semantic_text="\n\n".join(fitted.values()),
+            credentials=(data.openai_api_key, data.mistral_api_key, data.gemini_api_key, data.groq_api_key)
+        )
 
         return ResumeAdvisorResponse(advisor_output=response.strip())
 
@@ -70,7 +98,7 @@ async def resume_advisor(data: ResumeAdvisorRequest):
 
 # ---------- File Upload Endpoints ----------
 @router.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+def upload_resume(file: UploadFile = File(...)):
     """
     Upload resume (PDF/DOCX), extract text and return it.
     """
@@ -86,7 +114,7 @@ async def upload_resume(file: UploadFile = File(...)):
     return {"extracted_text": text}
 
 @router.post("/upload-jd")
-async def upload_jd(file: UploadFile = File(...)):
+def upload_jd(file: UploadFile = File(...)):
     """
     Upload Job Description (PDF/DOCX), extract text and return it.
     """
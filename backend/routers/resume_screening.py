@@ -1,74 +1,123 @@
 # routers/resume_screening.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from typing import List, Optional
 import tempfile
 import shutil
 import os
 
-from services.pdf_parser import extract_text
-from services.embeddings import calculate_gap_score  # Use embeddings module
+from services.pdf_parser import extract_document, extract_text
+from services.skill_extractor import extract_jd_skills, hybrid_extract_skills, match_skills
+from services.embeddings import get_embedding_model, batch_gap_scores  # Use embeddings module
+from services.candidate_store import get_candidate_store
+from services.readability_rules import batch_readability_scores
+from services.llm_utils import LOCAL_MODEL
+from routers.jd_registry import load_jd
+from services.admission import admit, screening_cost
+from services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-@router.post("/resume-screening")
-async def resume_screening(
-    jd_file: UploadFile = File(...),
+@router.post("/resume-screening", dependencies=[Depends(admit("screening", screening_cost))])
+def resume_screening(
     resumes: List[UploadFile] = File(...),
+    jd_file: Optional[UploadFile] = File(None),
     openai_api_key: Optional[str] = Form(None),
+    add_to_pool: bool = Form(False),
+    model: str = Form("openai"),
+    jd_id: Optional[str] = Form(None),
 ):
     """
-    Screen multiple resumes against a Job Description using OpenAI embeddings (text-embedding-3-small).
-    Returns ATS scores, matched and missing skills for each resume ranked descending.
+    Screen multiple resumes against a Job Description using OpenAI embeddings (text-embedding-3-small),
+    or fully offline with model="local" (whitelist extraction + local MiniLM embeddings).
+    Returns ATS scores, matched and missing skills and the readability score for each resume ranked descending.
+    With `add_to_pool`, the screened resumes are also stored in that model's talent pool.
+    The JD is given as `jd_file` or as a registered `jd_id`.
     """
 
-    if not openai_api_key:
+    model_name = (model or "").lower()
+    if model_name not in ("openai", LOCAL_MODEL):
+        raise HTTPException(status_code=400, detail=f"Unsupported model for screening: {model}")
+
+    if model_name == "openai" and not openai_api_key:
         raise HTTPException(status_code=400, detail="OpenAI API key is required.")
 
     if not (2 <= len(resumes) <= 10):
         raise HTTPException(status_code=400, detail="Upload between 2 and 10 resumes.")
 
-    # --- Extract JD text ---
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{jd_file.filename}") as tmp:
-        shutil.copyfileobj(jd_file.file, tmp)
-        jd_path = tmp.name
-    try:
-        jd_text = extract_text(jd_path)
-    finally:
-        os.remove(jd_path)
+    # --- JD: registered artifacts, or extract text and skills once ---
+    jd_text = None
+    if not jd_id:
+        if jd_file is None:
+            raise HTTPException(status_code=400, detail="Provide jd_file or a registered jd_id.")
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{jd_file.filename}") as tmp:
+            shutil.copyfileobj(jd_file.file, tmp)
+            jd_path = tmp.name
+        try:
+            jd_text = extract_text(jd_path)
+        finally:
+            os.remove(jd_path)
+
+    jd_text, jd_artifacts = load_jd(jd_id, jd_text, model_name, openai_api_key=openai_api_key)
+
+    if jd_artifacts is not None:
+        jd_skills, jd_norm_set = jd_artifacts["jd_skills"], jd_artifacts["jd_norm_set"]
+    else:
+        jd_skills, jd_norm_set = extract_jd_skills(jd_text, model=model_name, openai_key=openai_api_key)
 
-    results = []
+    names = []
+    resume_texts = []
+    resume_documents = []
+    resume_skill_sets = []  # expanded against this JD, for scoring
+    pool_skill_sets = []  # as extracted, for the talent pool
 
-    # --- Process each resume ---
+    # --- Extract each resume and its skills ---
     for resume in resumes:
         with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{resume.filename}") as tmp:
             shutil.copyfileobj(resume.file, tmp)
             resume_path = tmp.name
         try:
-            resume_text = extract_text(resume_path)
+            document = extract_document(resume_path)
         finally:
             os.remove(resume_path)
+        resume_text = document["text"]
 
-        # --- Calculate ATS score using OpenAI embeddings ---
-        ats_result = calculate_gap_score(
-            resume_text=resume_text,
-            jd_text=jd_text,
-            user_model="openai",
-            openai_api_key=openai_api_key
+        resume_skills = hybrid_extract_skills(resume_text, model_name, openai_api_key, None, None, document)
+        skill_data = match_skills(resume_skills, jd_skills, jd_norm_set)
+
+        names.append(resume.filename)
+        resume_texts.append(resume_text)
+        resume_documents.append(document)
+        resume_skill_sets.append(skill_data["total_resume_skills"])
+        pool_skill_sets.append(resume_skills)
+
+    # --- Embed JD once and all resumes in one batch ---
+    embedder = get_embedding_model(model_name, openai_api_key=openai_api_key)
+    jd_vec = jd_artifacts["jd_vec"] if jd_artifacts is not None else embedder.embed_query(jd_text)
+    resume_matrix = embedder.embed_queries(resume_texts)
+
+    # --- Readability rules for the whole batch in one vectorized pass ---
+    readability_scores = [
+        r["readability_score"] for r in batch_readability_scores(resume_texts, documents=resume_documents)
+    ]
+
+    if add_to_pool:
+        get_candidate_store(model_name).add_many(
+            resume_matrix, pool_skill_sets, names=names, readability_scores=readability_scores
         )
 
-        results.append({
-            "resume_name": resume.filename,
-            "score": ats_result["score"],
-            "skill_score": ats_result.get("skill_score"),
-            "embedding_score": ats_result.get("embedding_score"),
-            "matched_skills": ats_result.get("matched_skills", []),
-            "missing_skills": ats_result.get("missing_skills", []),
-            "total_resume_skills": ats_result.get("total_resume_skills", 0),
-            "total_jd_skills": ats_result.get("total_jd_skills", 0),
-        })
-
-    # --- Rank resumes by score descending ---
-    ranked_results = sorted(results, key=lambda x: x["score"], reverse=True)
+    # --- Score and rank all resumes in one vectorized pass ---
+    ranked_results = batch_gap_scores(
+        jd_vec,
+        resume_matrix,
+        jd_skills,
+        resume_skill_sets,
+        names=list(range(len(names)))
+    )
+
+    for result in ranked_results:
+        i = result.pop("name")
+        result["resume_name"] = names[i]
+        result["readability_score"] = readability_scores[i]
 
     return {"ranked_resumes": ranked_results}
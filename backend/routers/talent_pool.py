@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from typing import Optional
+from models.request_models import TalentPoolSearchRequest
+from services.embeddings import add_resume_to_pool, search_candidate_pool
+from services.candidate_store import get_candidate_store
+from services.pdf_parser import extract_document
+from services.llm_utils import SUPPORTED_MODELS
+from services.admission import admit
+from services.profiling import ProfiledRoute
+import tempfile
+import shutil
+import os
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.post("/talent-pool/candidates", dependencies=[Depends(admit("analysis"))])
+def add_candidate(
+    resume: UploadFile = File(...),
+    model: str = Form(...),
+    candidate_name: Optional[str] = Form(None),
+    openai_api_key: Optional[str] = Form(None),
+    gemini_api_key: Optional[str] = Form(None),
+    mistral_api_key: Optional[str] = Form(None),
+    groq_api_key: Optional[str] = Form(None),
+):
+    """
+    Add a resume (PDF/DOCX) to the talent pool of the selected embedding model.
+    """
+    model_name = (model or "").lower()
+    if model_name not in SUPPORTED_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported model selected: {model}")
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{resume.filename}") as tmp:
+        shutil.copyfileobj(resume.file, tmp)
+        tmp_path = tmp.name
+
+    try:
+        document = extract_document(tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+    candidate_id = add_resume_to_pool(
+        document["text"],
+        model_name,
+        openai_api_key=openai_api_key,
+        gemini_api_key=gemini_api_key,
+        mistral_api_key=mistral_api_key,
+        groq_api_key=groq_api_key,
+        candidate_name=candidate_name or resume.filename,
+        document=document,
+    )
+
+    return {
+        "candidate_id": candidate_id,
+        "pool_size": len(get_candidate_store(model_name)),
+    }
+
+
+@router.post("/talent-pool/search", dependencies=[Depends(admit("analysis"))])
+def search_talent_pool(data: TalentPoolSearchRequest):
+    """
+    Return the best matching pooled resumes for a Job Description.
+    ANN shortlist by embedding, re-ranked with the hybrid ATS score.
+    """
+    model_name = (data.model or "").lower()
+    if model_name not in SUPPORTED_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported model selected: {data.model}")
+
+    results = search_candidate_pool(
+        jd_text=data.jd_text,
+        user_model=model_name,
+        openai_api_key=data.openai_api_key,
+        gemini_api_key=data.gemini_api_key,
+        mistral_api_key=data.mistral_api_key,
+        groq_api_key=data.groq_api_key,
+        top_k=data.top_k,
+    )
+
+    return {
+        "pool_size": len(get_candidate_store(model_name)),
+        "candidates": results,
+    }
@@ -1,53 +1,68 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from services.video_processor import transcribe_video
-from services.embeddings import calculate_gap_score
-from services.video_feedback import generate_video_feedback
+from fastapi import APIRouter, Depends, UploadFile, File, Form
+from routers.jd_registry import load_jd
+from services.llm_utils import SUPPORTED_MODELS
+from services.video_processor import transcribe_video_timed, find_skill_mentions
+from services.embeddings import acalculate_gap_score
+from services.video_feedback import agenerate_video_feedback
+from services.async_runtime import run_blocking
+from services.admission import admit, video_cost
+from services.profiling import ProfiledRoute
 import tempfile
 import shutil
 import os
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-@router.post("/video-gap-analyzer")
+@router.post("/video-gap-analyzer", dependencies=[Depends(admit("video", video_cost))])
 async def analyze_video_gap(
     video: UploadFile = File(...),
-    jd_text: str = Form(...),
+    jd_text: str = Form(None),
     model: str = Form(...),
     openai_api_key: str = Form(None),
     gemini_api_key: str = Form(None),
     mistral_api_key: str = Form(None),
     groq_api_key: str = Form(None),
+    jd_id: str = Form(None),
 ):
     """
     Video Resume Gap Analyzer:
-    - Transcribes video
+    - Transcribes video (with word timestamps)
     - Computes ATS score
+    - Locates matched skill mentions in the video
     - Generates AI feedback (plain text)
+    Accepts `jd_text` or a registered `jd_id`.
     """
 
     model_name = (model or "").lower()
 
-    if model_name not in ["openai", "mistral", "gemini", "groq"]:
+    if model_name not in SUPPORTED_MODELS:
         raise ValueError(f"Unsupported model selected: {model}")
 
+    jd_text, jd_artifacts = await run_blocking(
+        load_jd, jd_id, jd_text, model_name,
+        openai_api_key=openai_api_key,
+        gemini_api_key=gemini_api_key,
+        mistral_api_key=mistral_api_key,
+        groq_api_key=groq_api_key,
+    )
+
     # -------------------------------
     # Save uploaded video temporarily
     # -------------------------------
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{video.filename}") as tmp:
-        shutil.copyfileobj(video.file, tmp)
-        tmp_path = tmp.name
+    tmp_path = await run_blocking(_save_upload, video)
 
     try:
         # -------------------------------
         # 1️⃣ Transcription
         # -------------------------------
-        transcript_text = transcribe_video(tmp_path)
+        timed_transcript = await run_blocking(transcribe_video_timed, tmp_path)
+        transcript_text = timed_transcript.text
 
         # -------------------------------
         # 2️⃣ ATS Score
         # -------------------------------
-        ats_result = calculate_gap_score(
+        ats_result = await acalculate_gap_score(
             resume_text=transcript_text,
             jd_text=jd_text,
             user_model=model_name,
@@ -55,12 +70,18 @@ async def analyze_video_gap(
             gemini_api_key=gemini_api_key,
             mistral_api_key=mistral_api_key,
             groq_api_key=groq_api_key,
+            jd_artifacts=jd_artifacts,
         )
 
         # -------------------------------
-        # 3️⃣ AI Video Feedback (TEXT ONLY)
+        # 3️⃣ Where each matched skill is mentioned
+        # -------------------------------
+        skill_mentions = find_skill_mentions(timed_transcript, ats_result["matched_skills"])
+
+        # -------------------------------
+        # 4️⃣ AI Video Feedback (TEXT ONLY)
         # -------------------------------
-        video_feedback = generate_video_feedback(
+        video_feedback = await agenerate_video_feedback(
             transcript_text=transcript_text,
             jd_text=jd_text,
             matched_skills=ats_result["matched_skills"],
@@ -94,6 +115,15 @@ async def analyze_video_gap(
         # Optional debug
         "transcript_preview": transcript_text[:500],
 
+        # Seconds into the video where each matched skill is spoken
+        "skill_mentions": skill_mentions,
+
         # ✅ CLEAN TEXT FEEDBACK
         "video_feedback": video_feedback
-    }
\ No newline at end of file
+    }
+
+
+def _save_upload(video: UploadFile) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{video.filename}") as tmp:
+        shutil.copyfileobj(video.file, tmp)
+        return tmp.name
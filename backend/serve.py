@@ -0,0 +1,183 @@
+"""
+Production entry point: loads the app once, then forks worker processes
+that share the listening socket, the preloaded models (copy-on-write) and
+a cross-process cache tier.
+
+Each worker warms up after the fork and reports ready on /ready. Workers
+that die are restarted; SIGTERM/SIGINT shut all of them down gracefully.
+
+Usage (from backend/):
+    python serve.py                       # one worker per core
+    python serve.py --workers 4 --port 8000
+    python serve.py --workers 1           # single process, no shared cache
+
+For development keep using `uvicorn main:app --reload`. Fork-based, so
+POSIX only.
+"""
+import os
+import gc
+import sys
+import time
+import signal
+import socket
+import logging
+import argparse
+from dotenv import load_dotenv
+
+logger = logging.getLogger("serve")
+
+DEFAULT_SHARED_CACHE_DIR = os.path.join(os.path.dirname(__file__), "services", ".cache", "shared")
+RESTART_DELAY = 1.0
+
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=default_workers(), help="default: $WEB_CONCURRENCY or one per core")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--no-preload", dest="preload", action="store_false", help="import the app in each worker instead of once before forking")
+    parser.add_argument("--shared-cache-dir", default=None, help=f"cross-process cache (default with >1 worker: {DEFAULT_SHARED_CACHE_DIR})")
+    parser.add_argument("--no-shared-cache", dest="shared_cache", action="store_false")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0, help="seconds to finish in-flight requests on shutdown")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+# ---------- Environment ---------- #
+
+def configure_environment(args) -> None:
+    """Must run before the app is imported: services read these at import."""
+    if args.shared_cache and (args.workers > 1 or args.shared_cache_dir):
+        os.environ.setdefault("SHARED_CACHE_DIR", args.shared_cache_dir or DEFAULT_SHARED_CACHE_DIR)
+    elif not args.shared_cache:
+        os.environ["SHARED_CACHE_DIR"] = ""
+
+    # split the cores between workers instead of every worker's native
+    # thread pools (torch, BLAS, CTranslate2) assuming all of them
+    threads = str(max(1, (os.cpu_count() or 1) // max(1, args.workers)))
+    for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "WHISPER_CPU_THREADS"):
+        os.environ.setdefault(name, threads)
+
+
+def load_app(preload: bool):
+    from main import app
+    if preload:
+        from services.warmup import preload as preload_models
+        preload_models()
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+# ---------- Workers ---------- #
+
+def run_worker(app, sock: socket.socket, args) -> None:
+    import uvicorn
+
+    if app is None:
+        app = load_app(preload=False)
+
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        backlog=args.backlog,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, args) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+
+    # child: own process group, so a terminal Ctrl+C reaches only the
+    # supervisor, which then stops workers with a single SIGTERM each
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    code = 0
+    try:
+        run_worker(app, sock, args)
+    except BaseException:
+        logger.exception("worker %d crashed", os.getpid())
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def supervise(app, sock: socket.socket, args) -> None:
+    workers = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(args.workers):
+        workers[spawn_worker(app, sock, args)] = True
+    logger.info("serving on %s:%d with %d workers (pids %s)", args.host, args.port, args.workers, sorted(workers))
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        if workers.pop(pid, None) is None:
+            continue
+        if not stopping:
+            logger.warning("worker %d exited with %d; restarting", pid, os.waitstatus_to_exitcode(status))
+            time.sleep(RESTART_DELAY)
+            if not stopping:
+                workers[spawn_worker(app, sock, args)] = True
+
+    logger.info("all workers stopped")
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s [%(process)d] %(levelname)s %(message)s")
+    if args.workers < 1:
+        sys.exit("--workers must be at least 1")
+
+    configure_environment(args)
+
+    start = time.perf_counter()
+    app = load_app(args.preload) if args.preload or args.workers == 1 else None
+    if app is not None:
+        logger.info("app loaded in %.1fs", time.perf_counter() - start)
+        # keep the preloaded heap out of the GC's reach so collections in
+        # workers do not touch (and un-share) its pages
+        gc.collect()
+        gc.freeze()
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+
+    if args.workers == 1:
+        run_worker(app, sock, args)
+    else:
+        supervise(app, sock, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from typing import Awaitable, Callable, Dict, List, Tuple
+from fastapi import HTTPException, Request
+from services.metrics import Counter, Gauge, Histogram, register_collector
+
+# Admission control for the expensive endpoints. Each lane admits requests
+# up to a cost budget (a video counts by size, a screening batch by its
+# resume count); beyond that they wait in a bounded priority queue, and
+# are shed with 429 (queue full) or 503 (waited too long) plus Retry-After
+# instead of piling up. Limits are per worker process.
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+
+# lane -> (capacity, queue), both in cost units
+DEFAULT_LANES = {
+    "video": (2, 6),
+    "screening": (20, 60),
+    "analysis": (8, 32),
+}
+# Overrides as "lane=capacity/queue,...", e.g. "video=4/8,analysis=16/64"
+ADMISSION_LANES = os.getenv("ADMISSION_LANES", "")
+
+# Longest a request may wait for a slot before it is shed with 503
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "15"))
+# One video cost unit per this many MB of upload (duration is only known after decoding)
+ADMISSION_VIDEO_MB_PER_UNIT = float(os.getenv("ADMISSION_VIDEO_MB_PER_UNIT", "25"))
+
+# X-Priority request header -> queue priority (lower is served first)
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# ---------- Metrics ---------- #
+
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight_cost", "Cost units admitted and running per lane.", ["lane"])
+ADMISSION_QUEUED = Gauge("admission_queued_cost", "Cost units waiting for admission per lane.", ["lane"])
+ADMISSION_QUEUE_DEPTH = Gauge("admission_queue_depth", "Requests waiting for admission per lane.", ["lane"])
+ADMISSION_WAIT_SECONDS = Histogram("admission_wait_seconds", "Time admitted requests spent queued.", ["lane"])
+ADMISSION_REJECTED = Counter("admission_rejected_total", "Requests shed by admission control.", ["lane", "reason"])
+
+register_collector(lambda: [
+    *ADMISSION_IN_FLIGHT.render(),
+    *ADMISSION_QUEUED.render(),
+    *ADMISSION_QUEUE_DEPTH.render(),
+    *ADMISSION_WAIT_SECONDS.render(),
+    *ADMISSION_REJECTED.render(),
+])
+
+# ---------- Lanes ---------- #
+
+class _Waiter:
+    __slots__ = ("cost", "future", "granted", "abandoned")
+
+    def __init__(self, cost: int, future: asyncio.Future):
+        self.cost = cost
+        self.future = future
+        self.granted = False
+        self.abandoned = False
+
+
+class AdmissionLane:
+    """
+    Cost-budgeted concurrency limit with a bounded priority wait queue.
+
+    State is guarded by a thread lock and waiters are woken through their
+    own event loop, so the lane is safe to share between event loops (the
+    test client runs one per request).
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue: int, max_wait: float = ADMISSION_MAX_WAIT):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # moving average of seconds per admitted cost unit, for Retry-After
+        self._unit_seconds = 1.0
+
+    def _retry_after(self, ahead: int) -> int:
+        return int(min(60, max(1, math.ceil(self._unit_seconds * ahead / self.capacity))))
+
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.in_flight, self.name)
+        ADMISSION_QUEUED.set(self.queued, self.name)
+        ADMISSION_QUEUE_DEPTH.set(sum(1 for _, _, w in self._waiters if not w.abandoned), self.name)
+
+    def _reject(self, status: int, reason: str, retry_after: int) -> HTTPException:
+        ADMISSION_REJECTED.inc(self.name, reason)
+        detail = (
+            f"The {self.name} endpoints are at capacity; retry in {retry_after}s."
+            if status == 429 else
+            f"Timed out waiting for {self.name} capacity; retry in {retry_after}s."
+        )
+        return HTTPException(status_code=status, detail=detail, headers={"Retry-After": str(retry_after)})
+
+    async def acquire(self, cost: int, priority: int = PRIORITIES["normal"]) -> int:
+        """Waits for `cost` units (capped at capacity) and returns the units held."""
+        cost = min(max(1, cost), self.capacity)
+
+        with self._lock:
+            if not self._waiters and self.in_flight + cost <= self.capacity:
+                self.in_flight += cost
+                self._publish()
+                ADMISSION_WAIT_SECONDS.observe(0.0, self.name)
+                return cost
+
+            # low priority gets half the queue, so it is shed first
+            limit = self.max_queue if priority <= PRIORITIES["normal"] else self.max_queue // 2
+            if self.queued + cost > limit:
+                raise self._reject(429, "queue_full", self._retry_after(self.in_flight + self.queued))
+
+            waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+            heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+            self.queued += cost
+            self._publish()
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            with self._lock:
+                if not waiter.granted:
+                    waiter.abandoned = True
+                    self.queued -= cost
+                    self._publish()
+                    if isinstance(exc, asyncio.CancelledError):
+                        raise
+                    raise self._reject(503, "timeout", self._retry_after(self.in_flight + self.queued))
+            if isinstance(exc, asyncio.CancelledError):
+                self.release(cost, 0.0)
+                raise
+            # granted just as the wait timed out: keep the slot
+
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start, self.name)
+        return cost
+
+    def release(self, cost: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= cost
+            if seconds > 0:
+                self._unit_seconds = 0.8 * self._unit_seconds + 0.2 * (seconds / cost)
+            self._grant()
+            self._publish()
+
+    def _grant(self) -> None:
+        # caller holds the lock; strict priority order, no overtaking
+        while self._waiters:
+            _, _, waiter = self._waiters[0]
+            if waiter.abandoned:
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight + waiter.cost > self.capacity:
+                return
+            heapq.heappop(self._waiters)
+            waiter.granted = True
+            self.queued -= waiter.cost
+            self.in_flight += waiter.cost
+            waiter.future.get_loop().call_soon_threadsafe(_resolve, waiter.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _parse_lanes(spec: str) -> Dict[str, Tuple[int, int]]:
+    lanes = dict(DEFAULT_LANES)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, limits = item.partition("=")
+        capacity, _, queue = limits.partition("/")
+        lanes[name.strip()] = (int(capacity), int(queue or capacity))
+    return lanes
+
+
+LANES: Dict[str, AdmissionLane] = {
+    name: AdmissionLane(name, capacity, queue)
+    for name, (capacity, queue) in _parse_lanes(ADMISSION_LANES).items()
+}
+
+# ---------- Request Costs ---------- #
+
+async def unit_cost(request: Request) -> int:
+    return 1
+
+
+async def video_cost(request: Request) -> int:
+    """One unit per ADMISSION_VIDEO_MB_PER_UNIT of uploaded video."""
+    form = await request.form()  # already parsed for the endpoint; cached
+    video = form.get("video")
+    size = getattr(video, "size", None) or int(request.headers.get("content-length", 0))
+    return max(1, math.ceil(size / (ADMISSION_VIDEO_MB_PER_UNIT * 1024 * 1024)))
+
+
+async def screening_cost(request: Request) -> int:
+    """One unit per resume in the batch."""
+    form = await request.form()
+    return max(1, len(form.getlist("resumes")))
+
+# ---------- Dependency ---------- #
+
+def admit(lane_name: str, cost: Callable[[Request], Awaitable[int]] = unit_cost):
+    """
+    Route dependency that holds a slot in `lane_name` while the endpoint
+    runs. Use as `dependencies=[Depends(admit("video", video_cost))]`.
+    Priority comes from the X-Priority header (high, normal, low).
+    """
+    lane = LANES[lane_name]
+
+    async def dependency(request: Request):
+        if not ADMISSION_ENABLED:
+            yield
+            return
+
+        priority = PRIORITIES.get(request.headers.get("x-priority", "normal").lower(), PRIORITIES["normal"])
+        held = await lane.acquire(await cost(request), priority)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            lane.release(held, time.perf_counter() - start)
+
+    return dependency
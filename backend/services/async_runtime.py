@@ -0,0 +1,68 @@
+import os
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Awaitable, Callable, TypeVar
+from starlette.concurrency import run_in_threadpool
+from services.profiling import profile_thread
+
+T = TypeVar("T")
+
+# The service layer is async-native: provider calls await the providers'
+# async clients, so one event loop holds many of them in flight. CPU-bound
+# leaf stages (spaCy, local embedding models) are offloaded to this pool so
+# they neither block the loop nor serialize behind each other.
+ASYNC_OFFLOAD_THREADS = int(os.getenv("ASYNC_OFFLOAD_THREADS", "0")) or min(32, (os.cpu_count() or 1) + 4)
+
+_offload = ThreadPoolExecutor(ASYNC_OFFLOAD_THREADS, thread_name_prefix="offload")
+_local = threading.local()
+
+
+def _profiled(fn: Callable[..., T], *args, **kwargs) -> T:
+    with profile_thread():
+        return fn(*args, **kwargs)
+
+
+async def run_cpu(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a CPU-bound leaf function in the offload pool. `fn` must not call
+    run_sync()/run_blocking() itself, or a saturated pool could wait on itself.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_offload, partial(context.run, _profiled, fn, *args, **kwargs))
+
+
+async def run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs blocking synchronous code (file IO, Whisper, sync service calls
+    that may use run_sync()) in the request threadpool, off the event loop.
+    """
+    return await run_in_threadpool(_profiled, fn, *args, **kwargs)
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code; the sync service
+    functions are thin wrappers over their async versions through this.
+
+    Each calling thread keeps one event loop and reuses it. Calling this
+    from a running event loop would block that loop, so it raises instead:
+    async code should await the async version.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError("run_sync() called from a running event loop; await the async version instead")
+
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(awaitable)
+
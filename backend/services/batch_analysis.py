@@ -0,0 +1,447 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from services.skill_extractor import (
+    acall_skill_provider,
+    aextract_skills_llm,
+    extract_skills_local,
+    extract_skills_spacy_batch,
+    filter_jd_skills,
+    norms_to_bitset,
+    N_SKILLS,
+    parse_skills,
+    skill_prompt,
+    skills_to_bitset,
+)
+from services.embeddings import get_embedding_model, pairwise_cosine_similarity, pairwise_gap_scores
+from services.chunked_embeddings import EMBEDDING_MODE, CHUNK_AGGREGATION, embed_chunks, split_into_chunks, chunked_similarity
+from services.llm_cache import cache_response, cached_response
+from services.llm_utils import MODEL_MAP, LOCAL_MODEL
+from services.prompt_builder import record_llm_call
+from services.async_runtime import run_blocking, run_cpu, run_sync
+
+logger = logging.getLogger(__name__)
+
+# Offline gap analysis of many (resume, JD) pairs, e.g. a nightly export.
+# Texts repeat across pairs (one JD against hundreds of resumes, a resume
+# screened against several roles), so every unique text is extracted and
+# embedded exactly once and the pairs are then scored in one vectorized
+# pass: provider cost and wall time scale with unique texts, not pairs.
+
+# Provider calls (LLM extraction, embedding batches) in flight at once
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+# Texts per embed_queries call
+BATCH_EMBED_SIZE = int(os.getenv("BATCH_EMBED_SIZE", "128"))
+
+# Pairs scored per vectorized pass (bounds the N x d and N x N_SKILLS temporaries)
+BATCH_SCORE_CHUNK = int(os.getenv("BATCH_SCORE_CHUNK", "4096"))
+
+# Provider batch jobs: poll interval (seconds) and requests per job (OpenAI's limit)
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "30"))
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "50000"))
+
+# Chat endpoints of providers with an OpenAI-compatible Batch API
+BATCH_BASE_URLS = {
+    "openai": None,
+    "groq": "https://api.groq.com/openai/v1",
+}
+
+# ---------- Input / Output ---------- #
+
+def read_pairs(path: str) -> List[Dict]:
+    """
+    Pairs from a JSONL file, one {"resume_text", "jd_text", "id"?} object
+    per line ("id" defaults to the line number). Lines that cannot be used
+    come back as {"id", "error"} and are reported instead of scored.
+    """
+    pairs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                pairs.append({"id": line_no, "error": f"invalid JSON: {exc}"})
+                continue
+
+            pair_id = record.get("id", line_no) if isinstance(record, dict) else line_no
+            if not isinstance(record, dict) or not record.get("resume_text") or not record.get("jd_text"):
+                pairs.append({"id": pair_id, "error": "resume_text and jd_text are required"})
+                continue
+            pairs.append({"id": pair_id, "resume_text": record["resume_text"], "jd_text": record["jd_text"]})
+    return pairs
+
+
+def write_results(path: str, results: List[Dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+# ---------- Provider Batch Jobs ---------- #
+
+def batch_request_line(custom_id: str, model: str, prompt: str) -> str:
+    """One chat completion request in the Batch API input format."""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {"model": model, "messages": [{"role": "user", "content": prompt}]},
+    })
+
+
+def parse_batch_output(lines) -> Dict[str, Optional[str]]:
+    """custom_id -> response text from Batch API output lines; failed requests map to None."""
+    results = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        content = None
+        if not record.get("error") and response.get("status_code") == 200:
+            content = response["body"]["choices"][0]["message"]["content"].strip()
+        results[record["custom_id"]] = content
+    return results
+
+
+class OpenAIBatchSubmitter:
+    """
+    Runs prompts through an OpenAI-compatible Batch API (OpenAI, Groq):
+    the requests are uploaded as one JSONL file per job, the jobs are
+    polled until they finish and their output files parsed. Batch requests
+    are billed at about half the online price, in exchange for results
+    within the completion window instead of seconds.
+    """
+
+    def __init__(self, model: str, api_key: str, poll_interval: float = BATCH_POLL_INTERVAL, completion_window: str = "24h"):
+        if model not in BATCH_BASE_URLS:
+            raise ValueError(f"No batch endpoint for model: {model}")
+        if not api_key:
+            raise ValueError(f"An API key is required for {model} batch jobs.")
+        from openai import OpenAI
+        self.model = model
+        self.client = OpenAI(api_key=api_key, base_url=BATCH_BASE_URLS[model])
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    def _submit(self, lines: List[str]) -> str:
+        upload = self.client.files.create(file=("requests.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window=self.completion_window
+        )
+        logger.info("batch job %s submitted: %d requests", batch.id, len(lines))
+        return batch.id
+
+    def _collect(self, batch_id: str) -> Dict[str, Optional[str]]:
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+
+        logger.info("batch job %s %s", batch_id, batch.status)
+        # expired jobs still return the requests they completed
+        if not batch.output_file_id:
+            return {}
+        return parse_batch_output(self.client.files.content(batch.output_file_id).text.splitlines())
+
+    def run(self, prompts: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """custom_id -> response text (None for requests the job did not complete)."""
+        lines = [batch_request_line(cid, MODEL_MAP[self.model], prompt) for cid, prompt in prompts.items()]
+        # all jobs are submitted before any is waited on, so they run side by side
+        batch_ids = [self._submit(lines[i:i + BATCH_MAX_REQUESTS]) for i in range(0, len(lines), BATCH_MAX_REQUESTS)]
+
+        results = dict.fromkeys(prompts)
+        for batch_id in batch_ids:
+            results.update(self._collect(batch_id))
+        return results
+
+
+class LocalBatchSubmitter:
+    """
+    In-process stand-in for a provider batch endpoint, for tests and
+    benchmarks: builds the same request lines, answers them through the
+    online skill-extraction call and hands the answers back as Batch API
+    output lines, so the whole batch path runs without a batch job.
+    """
+
+    def __init__(self, model: str, openai_key=None, groq_key=None, gemini_key=None, concurrency: int = BATCH_CONCURRENCY):
+        self.model = model
+        self.keys = (openai_key, groq_key, gemini_key)
+        self.concurrency = concurrency
+
+    async def _answer(self, line: str, limit: asyncio.Semaphore) -> str:
+        request = json.loads(line)
+        record = {"custom_id": request["custom_id"], "response": None, "error": None}
+        async with limit:
+            try:
+                content = await acall_skill_provider(request["body"]["messages"][-1]["content"], self.model, *self.keys)
+            except Exception as exc:
+                record["error"] = {"message": str(exc)}
+            else:
+                choice = {"message": {"role": "assistant", "content": content or ""}}
+                record["response"] = {"status_code": 200, "body": {"choices": [choice]}}
+        return json.dumps(record)
+
+    async def _run(self, lines: List[str]) -> List[str]:
+        limit = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._answer(line, limit) for line in lines))
+
+    def run(self, prompts: Dict[str, str]) -> Dict[str, Optional[str]]:
+        lines = [batch_request_line(cid, MODEL_MAP.get(self.model, self.model), prompt) for cid, prompt in prompts.items()]
+        results = dict.fromkeys(prompts)
+        results.update(parse_batch_output(run_sync(self._run(lines))))
+        return results
+
+
+def get_batch_submitter(kind: str, model: str, openai_key=None, groq_key=None, gemini_key=None):
+    """"provider" -> the model's own Batch API, "local" -> the in-process stand-in."""
+    if kind == "local":
+        return LocalBatchSubmitter(model, openai_key, groq_key, gemini_key)
+    if kind == "provider":
+        return OpenAIBatchSubmitter(model, groq_key if model == "groq" else openai_key)
+    raise ValueError(f"Unknown batch submitter: {kind}")
+
+# ---------- Unique Texts ---------- #
+
+def _dedupe(pairs: List[Dict]) -> Tuple[List[str], List[int], List[int]]:
+    """(unique texts, resume text index per pair, JD text index per pair)."""
+    index: Dict[str, int] = {}
+
+    def ref(text: str) -> int:
+        return index.setdefault(text, len(index))
+
+    resume_idx = [ref(p["resume_text"]) for p in pairs]
+    jd_idx = [ref(p["jd_text"]) for p in pairs]
+    return list(index), resume_idx, jd_idx
+
+# ---------- Extraction ---------- #
+
+async def _llm_skills_online(texts: List[str], model: str, keys: Tuple, stats: Dict) -> List:
+    """LLM skills per text through the cached online call, BATCH_CONCURRENCY at a time."""
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def extract(text):
+        async with limit:
+            return await aextract_skills_llm(text, model, *keys)
+
+    if model != LOCAL_MODEL:
+        stats["llm_online_requests"] += len(texts)
+    return await asyncio.gather(*(extract(t) for t in texts), return_exceptions=True)
+
+
+async def _llm_skills_batch(texts: List[str], model: str, keys: Tuple, submitter, stats: Dict) -> List:
+    """
+    LLM skills per text through a provider batch job. Prompts already in
+    the LLM cache are answered from it; the job's answers are cached under
+    the same keys as the online call, and requests the job did not
+    complete fall back to it.
+    """
+    provider_model = MODEL_MAP.get(model, model)
+    prompts = [skill_prompt(t, model) for t in texts]
+    responses: List[Optional[str]] = [cached_response("extract_skills", model, provider_model, None, p) for p in prompts]
+
+    pending = {str(i): prompts[i] for i, r in enumerate(responses) if r is None}
+    stats["llm_batch_requests"] += len(pending)
+    if pending:
+        answered = await run_blocking(submitter.run, pending)
+        for cid, response in answered.items():
+            if response is None:
+                continue
+            i = int(cid)
+            responses[i] = response
+            record_llm_call("extract_skills_batch", model, prompts[i], response)
+            cache_response("extract_skills", model, provider_model, None, prompts[i], response)
+
+    results: List = [None] * len(texts)
+    for i, response in enumerate(responses):
+        if response is not None:
+            results[i] = parse_skills(response, texts[i])
+
+    retry = [i for i, r in enumerate(results) if r is None]
+    if retry:
+        logger.warning("%d batch requests incomplete, extracting online", len(retry))
+        for i, skills in zip(retry, await _llm_skills_online([texts[i] for i in retry], model, keys, stats)):
+            results[i] = skills
+    return results
+
+
+async def extract_unique_skills(
+    texts: List[str],
+    model: str,
+    keys: Tuple,
+    submitter=None,
+    stats: Optional[Dict] = None,
+    aliases: Optional[List[Dict]] = None
+) -> List:
+    """
+    hybrid_extract_skills for every text: one nlp.pipe pass for spaCy,
+    concurrent with the LLM pass (online, or one batch job with
+    `submitter`). Texts whose extraction failed get the exception instead.
+    `aliases` gets each text's semantic aliases (for filter_jd_skills).
+    """
+    stats = stats if stats is not None else {"llm_online_requests": 0, "llm_batch_requests": 0}
+
+    async def llm():
+        if model == LOCAL_MODEL:
+            return await run_cpu(lambda: [extract_skills_local(t) for t in texts])
+        if submitter is not None:
+            return await _llm_skills_batch(texts, model, keys, submitter, stats)
+        return await _llm_skills_online(texts, model, keys, stats)
+
+    spacy_skills, llm_skills = await asyncio.gather(run_cpu(extract_skills_spacy_batch, texts, 64, aliases), llm())
+    return [
+        llm_set if isinstance(llm_set, BaseException) else spacy_set | llm_set
+        for spacy_set, llm_set in zip(spacy_skills, llm_skills)
+    ]
+
+# ---------- Embedding ---------- #
+
+async def embed_unique_texts(texts: List[str], embedder) -> List:
+    """
+    Vector per text from embed_queries batches of BATCH_EMBED_SIZE (the
+    vectors calculate_gap_score embeds each text to); failed batches give
+    their exception.
+    """
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def embed(batch):
+        async with limit:
+            return await embedder.aembed_queries(batch)
+
+    batches = [texts[i:i + BATCH_EMBED_SIZE] for i in range(0, len(texts), BATCH_EMBED_SIZE)]
+    vectors = []
+    for batch, embedded in zip(batches, await asyncio.gather(*(embed(b) for b in batches), return_exceptions=True)):
+        vectors.extend([embedded] * len(batch) if isinstance(embedded, BaseException) else embedded)
+    return vectors
+
+
+def _chunked_similarities(texts, resume_idx, jd_idx, embedder, model: str, strategy: str) -> List[float]:
+    # one pass embeds every unique chunk; the per-pair similarities then hit the chunk cache
+    embed_chunks(embedder, [c for t in texts for c in (split_into_chunks(t) or [t])], model)
+    return [chunked_similarity(texts[r], texts[j], embedder, model, strategy) for r, j in zip(resume_idx, jd_idx)]
+
+# ---------- Batch Gap Analysis ---------- #
+
+async def abatch_gap_analysis(
+    pairs: List[Dict],
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    submitter=None,
+    embedding_mode: Optional[str] = None,
+    chunk_aggregation: Optional[str] = None
+) -> Tuple[List[Dict], Dict]:
+    """
+    calculate_gap_score for every pair of `pairs` (as from read_pairs).
+
+    Returns (one result per pair in input order, run stats). A result is
+    {"id", **calculate_gap_score fields}, or {"id", "error"} when the pair
+    was invalid or one of its texts could not be extracted or embedded.
+
+    With `submitter` (see get_batch_submitter) the LLM extraction runs as a
+    provider batch job instead of online calls.
+    """
+    started = time.perf_counter()
+    keys = (openai_api_key or mistral_api_key, groq_api_key, gemini_api_key)
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+
+    valid = [p for p in pairs if "error" not in p]
+    texts, resume_idx, jd_idx = _dedupe(valid)
+    stats = {
+        "pairs": len(pairs),
+        "invalid_pairs": len(pairs) - len(valid),
+        "unique_texts": len(texts),
+        "unique_resumes": len(set(resume_idx)),
+        "unique_jds": len(set(jd_idx)),
+        "llm_online_requests": 0,
+        "llm_batch_requests": 0,
+    }
+
+    async def similarities():
+        if (embedding_mode or EMBEDDING_MODE) == "chunked":
+            sims = await run_blocking(
+                _chunked_similarities, texts, resume_idx, jd_idx, embedder, user_model, chunk_aggregation or CHUNK_AGGREGATION
+            )
+            return sims, [None] * len(texts)
+        return None, await embed_unique_texts(texts, embedder)
+
+    aliases: List[Dict] = []  # per text: semantic aliases of its spaCy pass
+    skills, (chunked_sims, vectors) = await asyncio.gather(
+        extract_unique_skills(texts, user_model, keys, submitter, stats, aliases), similarities()
+    )
+
+    def failure(i: int) -> Optional[BaseException]:
+        for value in (skills[i], vectors[i]):
+            if isinstance(value, BaseException):
+                return value
+        return None
+
+    # ---------- per unique text: skill bitsets, JD filter, normalized vector ---------- #
+    jd_ids = set(jd_idx)
+    dim = next((len(v) for v in vectors if v is not None and not isinstance(v, BaseException)), 0)
+    matrix = np.zeros((len(texts), dim))
+    resume_bits = np.zeros((len(texts), N_SKILLS), dtype=bool)
+    jd_bits, jd_norm_bits = resume_bits.copy(), resume_bits.copy()
+    for i in range(len(texts)):
+        if failure(i) is not None:
+            continue
+        resume_bits[i] = skills_to_bitset(skills[i])
+        if i in jd_ids:
+            jd_skills, jd_norm_set = filter_jd_skills(texts[i], skills[i], aliases[i])
+            jd_bits[i], jd_norm_bits[i] = skills_to_bitset(jd_skills), norms_to_bitset(jd_norm_set)
+        if vectors[i] is not None:
+            matrix[i] = vectors[i]
+
+    # ---------- pairs ---------- #
+    ok = [n for n, (r, j) in enumerate(zip(resume_idx, jd_idx)) if failure(r) is None and failure(j) is None]
+    scores = {}
+    for start in range(0, len(ok), BATCH_SCORE_CHUNK):
+        chunk = ok[start:start + BATCH_SCORE_CHUNK]
+        r = np.array([resume_idx[n] for n in chunk])
+        j = np.array([jd_idx[n] for n in chunk])
+        if chunked_sims is not None:
+            sims = [chunked_sims[n] for n in chunk]
+        else:
+            sims = pairwise_cosine_similarity(matrix[r], matrix[j])
+        scores.update(zip(chunk, pairwise_gap_scores(sims, resume_bits[r], jd_bits[j], jd_norm_bits[j])))
+
+    results, n = [], 0
+    for pair in pairs:
+        if "error" in pair:
+            results.append({"id": pair["id"], "error": pair["error"]})
+            continue
+        if n in scores:
+            results.append({"id": pair["id"], **scores[n]})
+        else:
+            error = failure(resume_idx[n]) or failure(jd_idx[n])
+            results.append({"id": pair["id"], "error": f"{type(error).__name__}: {error}"})
+        n += 1
+
+    stats["failed_pairs"] = len(valid) - len(ok)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return results, stats
+
+
+def batch_gap_analysis(
+    pairs: List[Dict],
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    submitter=None,
+    embedding_mode: Optional[str] = None,
+    chunk_aggregation: Optional[str] = None
+) -> Tuple[List[Dict], Dict]:
+    return run_sync(abatch_gap_analysis(
+        pairs, user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key,
+        submitter, embedding_mode, chunk_aggregation
+    ))
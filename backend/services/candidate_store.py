@@ -0,0 +1,502 @@
+import os
+import json
+import uuid
+import logging
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from services.skill_extractor import (
+    N_SKILLS, SKILL_IDS_DIGEST, SKILL_NORMS, bitset_to_skills, pack_bitset, remap_bitset, skills_to_bitset, unpack_bitset
+)
+
+CANDIDATE_STORE_DIR = os.getenv(
+    "CANDIDATE_STORE_DIR",
+    os.path.join(os.path.dirname(__file__), ".cache", "candidates")
+)
+
+# Pools smaller than this are searched exactly; larger ones through IVF
+IVF_MIN_TRAIN_SIZE = int(os.getenv("IVF_MIN_TRAIN_SIZE", "20000"))
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "8"))
+
+_CHUNK_ROWS = 65536
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): single-process serving only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ---------- Helpers ---------- #
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _nearest_centroid(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each (normalized) row."""
+    out = np.empty(len(rows), dtype=np.int32)
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        chunk = np.asarray(rows[start:start + _CHUNK_ROWS], dtype=np.float32)
+        out[start:start + len(chunk)] = (chunk @ centroids.T).argmax(axis=1)
+    return out
+
+
+def _train_centroids(data: np.ndarray, nlist: Optional[int], iterations: int, sample_size: int) -> np.ndarray:
+    """Spherical k-means on a sample of the (normalized) rows."""
+    n = len(data)
+    nlist = min(n, nlist or max(1, int(4 * np.sqrt(n))))
+    rng = np.random.default_rng(0)
+
+    sample_rows = np.sort(rng.choice(n, size=min(n, max(sample_size, nlist)), replace=False))
+    sample = np.asarray(data[sample_rows])
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = _nearest_centroid(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        counts = np.bincount(assign, minlength=nlist)
+        filled = counts > 0
+        centroids[filled] = _normalize_rows(sums[filled])
+
+    return centroids
+
+# ---------- Store ---------- #
+
+class CandidateStore:
+    """
+    Append-only pool of candidate embeddings and their skill sets.
+
+    Files under `path`:
+    - vectors.f32: row-normalized float32 rows, memory-mapped for search
+    - meta.jsonl: one {"id", "name", "skill_bits", "skill_ids", "readability_score"}
+      line per row, the skills as a packed whitelist bitset and the
+      SKILL_IDS_DIGEST of the whitelist it was packed with (older lines with
+      a "skills" list, or without a readability score, are still read)
+    - info.json: vector dimension, the pool size the index was trained at,
+      the index version and, per skill ids digest, the whitelist's
+      normalized skills in id order, so rows packed with an older
+      skills_list.json are remapped to the current ids when read
+    - centroids.<version>.npy / lists.<version>.i32: IVF coarse quantizer
+      and each row's list (version 0, from older pools, has no version in
+      the names). New rows are assigned to a list on insert.
+
+    The index is trained once the pool reaches IVF_MIN_TRAIN_SIZE and
+    retrained every time it doubles, by a background thread that never
+    blocks inserts or searches: k-means runs on a snapshot of the rows
+    without the pool locks, then, under the write lock, the rows added
+    since the snapshot are assigned to the new lists and info.json is
+    replaced to switch to the new version.
+
+    Several worker processes may share one pool: writes hold an exclusive
+    flock on `.lock`, training holds `.train.lock` (one trainer per pool),
+    and every process picks up rows appended by the others (and a retrained
+    index) before it searches or inserts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._mmap: Optional[np.ndarray] = None
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._training = False  # a background retrain of this process is running
+
+        with self._file_lock():
+            self._info = self._load_info()
+            self._info_stamp = self._stat_info()
+            self._record_skill_ids()
+            self._meta: List[Dict] = []
+            self._meta_offset = 0
+            self._sync()
+            self._centroids: Optional[np.ndarray] = self._load_centroids()
+            self._truncate_partial_writes()
+
+    # ----- persistence -----
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _index_file(self, kind: str, version: Optional[int] = None) -> str:
+        """The "centroids" or "lists" file of an index version (default: the current one)."""
+        version = self._info.get("index_version", 0) if version is None else version
+        ext = "npy" if kind == "centroids" else "i32"
+        return self._file(f"{kind}.{ext}" if version == 0 else f"{kind}.{version}.{ext}")
+
+    def _load_info(self) -> Dict:
+        if os.path.exists(self._file("info.json")):
+            with open(self._file("info.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"dim": None, "trained_size": 0}
+
+    def _stat_info(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._file("info.json"))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _save_info(self) -> None:
+        # replaced, not rewritten: readers see the old or the new index, never a mix
+        tmp = self._file(f"info.json.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._info, f)
+        os.replace(tmp, self._file("info.json"))
+        self._info_stamp = self._stat_info()
+
+    def _record_skill_ids(self) -> None:
+        """Add the current whitelist to info.json's skill id orders; caller holds the exclusive lock."""
+        skill_ids = self._info.setdefault("skill_ids", {})
+        if "" not in skill_ids and os.path.exists(self._file("meta.jsonl")):
+            # rows packed before the digest was recorded: assume the whitelist
+            # has not changed since they were written
+            skill_ids[""] = SKILL_NORMS
+        if SKILL_IDS_DIGEST not in skill_ids:
+            skill_ids[SKILL_IDS_DIGEST] = SKILL_NORMS
+            self._save_info()
+
+    def _skill_bits(self, entry: Dict) -> str:
+        """The entry's skills packed over the current skill ids."""
+        if "skills" in entry:
+            return pack_bitset(skills_to_bitset(entry["skills"]))
+        digest = entry.get("skill_ids", "")
+        if digest == SKILL_IDS_DIGEST:
+            return entry["skill_bits"]
+        norms = self._info.get("skill_ids", {}).get(digest)
+        if norms is None:
+            raise ValueError(f"Candidate pool {self.path} has rows packed with an unknown skill whitelist ({digest or 'untagged'}).")
+        return pack_bitset(remap_bitset(unpack_bitset(entry["skill_bits"], len(norms)), norms))
+
+    def _read_meta(self, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Complete meta lines from byte `offset` on, and the offset after the last one."""
+        meta = []
+        if os.path.exists(self._file("meta.jsonl")):
+            with open(self._file("meta.jsonl"), "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn last line from an interrupted insert
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    entry["skill_bits"] = self._skill_bits(entry)
+                    entry.pop("skills", None)
+                    entry.pop("skill_ids", None)
+                    meta.append(entry)
+                    offset += len(line)
+        return meta, offset
+
+    def _load_centroids(self) -> Optional[np.ndarray]:
+        path = self._index_file("centroids")
+        if os.path.exists(path):
+            return np.load(path)
+        return None
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """Inter-process lock on the pool files: shared for reads, exclusive for writes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._file(".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _train_lock(self, blocking: bool = True):
+        """One trainer per pool across processes; yields False when busy and not `blocking`."""
+        if fcntl is None:
+            yield True
+            return
+        with open(self._file(".train.lock"), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Pick up rows and a retrained index written by other processes (or the training thread)."""
+        stamp = self._stat_info()
+        if stamp != self._info_stamp:
+            index = (self._info.get("index_version", 0), self._info["trained_size"])
+            self._info, self._info_stamp = self._load_info(), stamp
+            if (self._info.get("index_version", 0), self._info["trained_size"]) != index:
+                self._centroids = self._load_centroids()
+                self._lists = None
+
+        try:
+            size = os.path.getsize(self._file("meta.jsonl"))
+        except FileNotFoundError:
+            return
+        if size <= self._meta_offset:
+            return
+
+        entries, self._meta_offset = self._read_meta(self._meta_offset)
+        if entries:
+            self._meta.extend(entries)
+            self._mmap = None
+            self._lists = None
+
+    def _truncate_partial_writes(self) -> None:
+        """Drop vector/list rows and meta bytes written by an insert that never completed."""
+        n = len(self._meta)
+        dim = self._info["dim"] or 0
+        path = self._file("meta.jsonl")
+        if os.path.exists(path) and os.path.getsize(path) > self._meta_offset:
+            with open(path, "r+b") as f:
+                f.truncate(self._meta_offset)
+        for path, row_bytes in ((self._file("vectors.f32"), dim * 4), (self._index_file("lists"), 4)):
+            if os.path.exists(path) and os.path.getsize(path) > n * row_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(n * row_bytes)
+
+    # ----- reads -----
+
+    def __len__(self) -> int:
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            return len(self._meta)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._info["dim"]
+
+    def candidate(self, row: int) -> Dict:
+        entry = self._meta[row]
+        return {
+            "id": entry["id"],
+            "name": entry["name"],
+            "skills": bitset_to_skills(unpack_bitset(entry["skill_bits"])),
+            "readability_score": entry.get("readability_score"),
+        }
+
+    def skill_bitsets(self, rows: Sequence[int]) -> np.ndarray:
+        """(len(rows) x N_SKILLS) bool matrix of the given rows' skills."""
+        return np.array([unpack_bitset(self._meta[row]["skill_bits"]) for row in rows], dtype=bool).reshape(len(rows), N_SKILLS)
+
+    def vectors(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Memory-mapped (N x d) matrix, or just the given rows."""
+        n = len(self._meta)
+        if self._mmap is None or self._mmap.shape[0] != n:
+            if n == 0:
+                self._mmap = np.zeros((0, self.dim or 0), dtype=np.float32)
+            else:
+                self._mmap = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(n, self.dim))
+        if rows is None:
+            return self._mmap
+        return np.asarray(self._mmap[np.asarray(rows, dtype=np.int64)])
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row order grouped by list, offsets) for the current IVF assignment."""
+        if self._lists is None:
+            assign = np.fromfile(self._index_file("lists"), dtype=np.int32, count=len(self._meta))
+            order = np.argsort(assign, kind="stable")
+            offsets = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = (order, offsets)
+        return self._lists
+
+    # ----- writes -----
+
+    def add(
+        self,
+        vector: Sequence[float],
+        skills: Iterable[str],
+        name: Optional[str] = None,
+        readability_score: Optional[int] = None,
+    ) -> str:
+        return self.add_many([vector], [skills], [name], [readability_score])[0]
+
+    def add_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        skill_sets: Sequence[Iterable[str]],
+        names: Optional[Sequence[Optional[str]]] = None,
+        readability_scores: Optional[Sequence[Optional[int]]] = None,
+    ) -> List[str]:
+        """Append candidates and return their ids."""
+        if len(skill_sets) == 0:
+            return []
+
+        matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(skill_sets), -1))
+        names = list(names) if names is not None else [None] * len(skill_sets)
+        readability_scores = list(readability_scores) if readability_scores is not None else [None] * len(skill_sets)
+
+        with self._lock, self._file_lock():
+            self._sync()
+            self._truncate_partial_writes()
+
+            if self.dim is None:
+                self._info["dim"] = int(matrix.shape[1])
+                self._save_info()
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Vector dimension {matrix.shape[1]} does not match pool dimension {self.dim}.")
+            self._record_skill_ids()
+
+            ids = [uuid.uuid4().hex for _ in names]
+
+            # vectors and list ids first; a row only exists once its meta line is written
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.write(matrix.tobytes())
+
+            if self._centroids is not None:
+                with open(self._index_file("lists"), "ab") as f:
+                    f.write(_nearest_centroid(matrix, self._centroids).tobytes())
+
+            entries = [
+                {"id": cid, "name": name, "skill_bits": pack_bitset(skills_to_bitset(skills)), "readability_score": readability}
+                for cid, name, skills, readability in zip(ids, names, skill_sets, readability_scores)
+            ]
+            lines = "".join(json.dumps({**entry, "skill_ids": SKILL_IDS_DIGEST}) + "\n" for entry in entries).encode("utf-8")
+            with open(self._file("meta.jsonl"), "ab") as f:
+                f.write(lines)
+
+            self._meta.extend(entries)
+            self._meta_offset += len(lines)
+            self._mmap = None
+            self._lists = None
+
+            retrain = self._needs_training() and not self._training
+            if retrain:
+                self._training = True
+
+        if retrain:
+            threading.Thread(target=self._train_in_background, daemon=True).start()
+
+        return ids
+
+    # ----- training -----
+
+    def _needs_training(self) -> bool:
+        n = len(self._meta)
+        return n >= IVF_MIN_TRAIN_SIZE and n >= 2 * self._info["trained_size"]
+
+    def _train_in_background(self) -> None:
+        try:
+            with self._train_lock(blocking=False) as acquired:
+                if not acquired:
+                    return  # another process is training this pool
+                with self._lock, self._file_lock(shared=True):
+                    self._sync()
+                    needed = self._needs_training()
+                if needed:
+                    self._retrain()
+        except Exception:
+            logger.exception("IVF training failed for %s", self.path)
+        finally:
+            self._training = False
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10, sample_size: int = 50000) -> None:
+        """(Re)train the IVF quantizer with spherical k-means now; inserts and searches carry on meanwhile."""
+        with self._train_lock():
+            self._retrain(nlist, iterations, sample_size)
+
+    def _retrain(self, nlist: Optional[int] = None, iterations: int = 10, sample_size: int = 50000) -> None:
+        # caller holds the train lock
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            n, dim = len(self._meta), self.dim
+            version = self._info.get("index_version", 0)
+        if n == 0:
+            return
+
+        # rows below n are never rewritten, so the snapshot needs no lock
+        snapshot = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(n, dim))
+        centroids = _train_centroids(snapshot, nlist, iterations, sample_size)
+        lists_path = self._index_file("lists", version + 1)
+        centroids_path = self._index_file("centroids", version + 1)
+        _nearest_centroid(snapshot, centroids).tofile(lists_path)
+        np.save(centroids_path, centroids)
+        del snapshot
+
+        with self._lock, self._file_lock():
+            self._sync()
+            old_files = [self._index_file("lists"), self._index_file("centroids")]
+
+            # rows inserted while training were assigned to the old lists
+            added = self.vectors()[n:]
+            if len(added):
+                with open(lists_path, "ab") as f:
+                    f.write(_nearest_centroid(added, centroids).tobytes())
+
+            self._info["index_version"] = version + 1
+            self._info["trained_size"] = n
+            self._save_info()
+            self._centroids = centroids
+            self._lists = None
+
+            for path in old_files:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    # ----- search -----
+
+    def search(self, query_vec: Sequence[float], k: int = 100, nprobe: int = IVF_NPROBE) -> List[Tuple[int, float]]:
+        """
+        Top-k rows by cosine similarity as (row, similarity), best first.
+        Exact below the IVF threshold, otherwise scans the `nprobe` closest lists.
+        """
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            n = len(self._meta)
+            if n == 0 or k <= 0:
+                return []
+
+            query = np.asarray(query_vec, dtype=np.float32)
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Query dimension {query.shape[0]} does not match pool dimension {self.dim}.")
+            query = query / max(np.linalg.norm(query), 1e-12)
+
+            data = self.vectors()
+
+            if self._centroids is None:
+                rows = None
+                sims = np.concatenate([
+                    np.asarray(data[start:start + _CHUNK_ROWS]) @ query
+                    for start in range(0, n, _CHUNK_ROWS)
+                ])
+            else:
+                order, offsets = self._inverted_lists()
+                probe = np.argsort(-(self._centroids @ query))[:nprobe]
+                rows = np.sort(np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe]))
+                sims = self.vectors(rows) @ query if len(rows) else np.zeros(0, dtype=np.float32)
+
+        k = min(k, len(sims))
+        if k == 0:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+
+        if rows is not None:
+            return [(int(rows[i]), float(sims[i])) for i in top]
+        return [(int(i), float(sims[i])) for i in top]
+
+
+_stores: Dict[str, CandidateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candidate_store(user_model: str) -> CandidateStore:
+    """
+    One pool per embedding provider, since vector spaces (and dimensions)
+    differ between providers.
+    """
+    key = (user_model or "").lower()
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = CandidateStore(os.path.join(CANDIDATE_STORE_DIR, key))
+        return _stores[key]
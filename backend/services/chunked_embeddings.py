@@ -0,0 +1,143 @@
+import os
+import re
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional
+from services.lru_cache import LRUCache
+from services.document_layout import layout_for, section_paragraphs
+
+# "full" embeds whole documents with embed_query; "chunked" embeds windows
+EMBEDDING_MODE = os.getenv("EMBEDDING_MODE", "full")
+CHUNK_AGGREGATION = os.getenv("CHUNK_AGGREGATION", "mean")  # mean | max
+
+# MiniLM truncates at 256 word pieces, so keep windows well below that
+CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", "150"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", "25"))
+CHUNK_BATCH_SIZE = int(os.getenv("CHUNK_BATCH_SIZE", "64"))
+CHUNK_CACHE_SIZE = int(os.getenv("CHUNK_CACHE_SIZE", "20000"))
+
+# ---------- Chunking ---------- #
+
+def _paragraph_chunks(words: List[str], max_words: int, overlap: int) -> List[str]:
+    """One chunk for a paragraph that fits in `max_words`, else overlapping windows from its start."""
+    if len(words) <= max_words:
+        return [" ".join(words)] if words else []
+
+    chunks = []
+    step = max(1, max_words - overlap)
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return chunks
+
+
+def split_into_chunks(
+    text: str,
+    max_words: int = CHUNK_MAX_WORDS,
+    overlap: int = CHUNK_OVERLAP_WORDS,
+    document: Optional[Dict] = None
+) -> List[str]:
+    """
+    One chunk per paragraph (split on blank lines); paragraphs longer than
+    `max_words` are cut into overlapping word windows.
+
+    Given the `document` the text was parsed from, its layout is used
+    instead: one chunk per section (heading and blocks) that fits in
+    `max_words`, else one per block of it, windowed the same way.
+
+    A chunk depends only on its own paragraph or section, never on what
+    comes before it, so editing one paragraph leaves every other chunk
+    byte-identical (and its cached vector reusable).
+    """
+    document = layout_for(text, document)
+    if document is not None:
+        chunks: List[str] = []
+        for section in section_paragraphs(document):
+            paragraphs = [p.split() for p in section]
+            if sum(len(words) for words in paragraphs) <= max_words:
+                chunks.extend(_paragraph_chunks([w for words in paragraphs for w in words], max_words, overlap))
+            else:
+                for words in paragraphs:
+                    chunks.extend(_paragraph_chunks(words, max_words, overlap))
+        return chunks
+
+    return [
+        chunk
+        for paragraph in re.split(r"\n\s*\n", text)
+        for chunk in _paragraph_chunks(paragraph.split(), max_words, overlap)
+    ]
+
+# ---------- Chunk Vector Cache ---------- #
+
+def chunk_key(model_key: str, chunk: str) -> str:
+    return hashlib.sha256(f"{model_key}\n{chunk}".encode("utf-8")).hexdigest()
+
+
+# (embedding model, chunk text) -> normalized vector
+chunk_cache = LRUCache(CHUNK_CACHE_SIZE, name="chunk_vectors")
+
+# ---------- Embedding ---------- #
+
+def embed_chunks(embedder, chunks: List[str], model_key: str) -> np.ndarray:
+    """
+    (n_chunks x d) row-normalized matrix. Only chunks missing from the cache
+    are sent to the provider, in batches of CHUNK_BATCH_SIZE.
+    """
+    keys = [chunk_key(model_key, c) for c in chunks]
+    vectors: List[Optional[np.ndarray]] = [chunk_cache.get(k) for k in keys]
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    for start in range(0, len(missing), CHUNK_BATCH_SIZE):
+        batch = missing[start:start + CHUNK_BATCH_SIZE]
+        embedded = embedder.embed_documents([chunks[i] for i in batch])
+        for i, vec in zip(batch, embedded):
+            vec = np.asarray(vec, dtype=np.float32)
+            vec = vec / max(np.linalg.norm(vec), 1e-12)
+            chunk_cache.put(keys[i], vec)
+            vectors[i] = vec
+
+    return np.vstack(vectors)
+
+
+def chunked_document_vector(text: str, embedder, model_key: str, document: Optional[Dict] = None) -> np.ndarray:
+    """Normalized mean of a document's chunk vectors (one vector per document)."""
+    matrix = embed_chunks(embedder, split_into_chunks(text, document=document) or [text], model_key)
+    mean = matrix.mean(axis=0)
+    return mean / max(np.linalg.norm(mean), 1e-12)
+
+
+def chunked_similarity(
+    resume_text: str,
+    jd_text: str,
+    embedder,
+    model_key: str,
+    strategy: str = CHUNK_AGGREGATION,
+    resume_document: Optional[Dict] = None
+) -> float:
+    """
+    Cosine similarity between two documents from their chunk vectors;
+    `resume_document` is the file the resume text was parsed from, if any.
+
+    - mean: cosine of the mean resume chunk and the mean JD chunk
+    - max: for every JD chunk take its best resume chunk, then average
+    """
+    resume_chunks = split_into_chunks(resume_text, document=resume_document) or [resume_text]
+    jd_chunks = split_into_chunks(jd_text) or [jd_text]
+
+    resume_matrix = embed_chunks(embedder, resume_chunks, model_key)
+    jd_matrix = embed_chunks(embedder, jd_chunks, model_key)
+
+    if strategy == "max":
+        sims = jd_matrix @ resume_matrix.T
+        return float(sims.max(axis=1).mean())
+
+    if strategy == "mean":
+        resume_mean = resume_matrix.mean(axis=0)
+        jd_mean = jd_matrix.mean(axis=0)
+        return float(
+            np.dot(resume_mean, jd_mean)
+            / max(np.linalg.norm(resume_mean) * np.linalg.norm(jd_mean), 1e-12)
+        )
+
+    raise ValueError(f"Unsupported chunk aggregation: {strategy}. Choose from mean, max.")
@@ -0,0 +1,212 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+from services.lru_cache import LRUCache
+from services.single_flight import text_digest
+
+# A parsed document keeps the layout the file format already knows: text
+# blocks in reading order with their font size and weight, which of them
+# are headings, and the section each heading opens. Consumers (readability
+# sections, chunking, spaCy) read it instead of re-splitting the flat text
+# and fuzzy-scanning every line for structure.
+#
+#   {"text": str,
+#    "blocks": [{"text", "page", "size", "bold", "heading"}],
+#    "sections": [{"key", "title", "start", "end"}]}   # blocks[start:end]
+#
+# A section's key is its SECTION_KEYWORDS entry, or None for other headings
+# (the candidate's name) and for the blocks before the first heading.
+
+# --- Section keywords mapping for flexible detection ---
+SECTION_KEYWORDS = {
+    "contact_info": ["contact", "email", "phone", "address", "mobile"],
+    "summary": ["summary", "objective", "profile", "overview"],
+    "work_experience": ["experience", "employment", "professional", "projects", "roles"],
+    "education": ["education", "degree", "university", "college", "school"],
+    "skills": ["skills", "technologies", "tools", "competencies"]
+}
+
+HEADING_MAX_WORDS = int(os.getenv("HEADING_MAX_WORDS", "6"))
+# lines this much larger than the body font are headings
+HEADING_SIZE_RATIO = float(os.getenv("HEADING_SIZE_RATIO", "1.15"))
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "5000"))
+
+# characters that make a short styled line a list ("Python, Java, Docker"), not a heading
+LIST_SEPARATORS = ",|;•·"
+
+CONTACT_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.\w+|\+\d[\d\s().-]{7,}\d")
+
+# ---------- Headings ---------- #
+
+def section_key(title: str) -> Optional[str]:
+    title = title.lower()
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(kw in title for kw in keywords):
+            return section
+    return None
+
+
+def _body_style(lines: List[Dict]):
+    """(font size, bold) carrying the most characters: the body text style."""
+    sizes, bold_chars = Counter(), 0
+    for line in lines:
+        chars = len(line["text"].strip())
+        if line.get("size"):
+            sizes[round(line["size"], 1)] += chars
+        if line.get("bold"):
+            bold_chars += chars
+    total = sum(len(line["text"].strip()) for line in lines)
+    return (sizes.most_common(1)[0][0] if sizes else None), bold_chars * 2 > total
+
+
+def _looks_like_heading(line: Dict, body_size: Optional[float], body_bold: bool) -> bool:
+    text = line["text"].strip()
+    words = text.split()
+    if not words or len(words) > HEADING_MAX_WORDS or text[-1] in ".,;":
+        return False
+    larger = bool(body_size and line.get("size") and line["size"] >= body_size * HEADING_SIZE_RATIO)
+    if larger or (line.get("bold") and not body_bold):
+        # styling alone is not enough: bold skill lists and emphasized
+        # phrases are body text
+        return section_key(text) is not None or (
+            not any(c in text for c in LIST_SEPARATORS) and (text.isupper() or text.istitle())
+        )
+    # "SKILLS" / "Work Experience" in the body font
+    return (
+        len(words) <= 3
+        and not any(c.isdigit() for c in text)
+        and (text.isupper() or text.istitle())
+        and section_key(text) is not None
+    )
+
+# ---------- Building ---------- #
+
+def build_document(text: str, lines: List[Dict]) -> Dict:
+    """
+    Structured document from styled lines in reading order, each
+    {"text", "size", "bold", "page", "block"} plus "heading": True where the
+    format marks headings itself (DOCX heading styles). Lines of one source
+    block are joined into one block; heading lines always get their own.
+    `text` is the flat text the parser returns, kept alongside.
+    """
+    body_size, body_bold = _body_style(lines)
+
+    blocks: List[Dict] = []
+    source_block = None
+    for line in lines:
+        line_text = line["text"].strip()
+        if not line_text:
+            continue
+
+        heading = bool(line.get("heading")) or _looks_like_heading(line, body_size, body_bold)
+        current = blocks[-1] if blocks else None
+        if heading or current is None or current["heading"] or line["block"] != source_block:
+            blocks.append({
+                "text": line_text,
+                "page": line.get("page", 0),
+                "size": line.get("size"),
+                "bold": bool(line.get("bold")),
+                "heading": heading,
+            })
+        else:
+            current["text"] += "\n" + line_text
+            current["size"] = max(current["size"] or 0, line.get("size") or 0) or None
+            current["bold"] = current["bold"] and bool(line.get("bold"))
+        source_block = line["block"]
+
+    sections: List[Dict] = []
+    for i, block in enumerate(blocks):
+        if block["heading"]:
+            sections.append({"key": section_key(block["text"]), "title": block["text"], "start": i, "end": i + 1})
+        elif not sections:
+            sections.append({"key": None, "title": "", "start": i, "end": i + 1})
+        else:
+            sections[-1]["end"] = i + 1
+
+    return {"text": text, "blocks": blocks, "sections": sections}
+
+# ---------- Registry ---------- #
+
+# document id -> document, for files uploaded ahead of the request that
+# analyzes them (POST /upload-resume returns the id). Layout is only ever
+# used when a request passes its document (or document_id) explicitly:
+# the same text always gets the same result, whatever this cache holds.
+_documents = LRUCache(DOCUMENT_CACHE_SIZE, name="documents")
+
+
+def register_document(document: Dict) -> str:
+    """Stores an uploaded file's document; returns its id (a digest of its text)."""
+    document_id = text_digest(document["text"])[:32]
+    _documents.put(document_id, document)
+    return document_id
+
+
+def get_document(document_id: str) -> Optional[Dict]:
+    """The registered document, or None when the id is unknown or was evicted."""
+    return _documents.get(document_id) if document_id else None
+
+
+def layout_for(text: str, document: Optional[Dict]) -> Optional[Dict]:
+    """`document` when it describes exactly `text`; edited text no longer has its layout."""
+    return document if document is not None and document["text"] == text else None
+
+
+def has_sections(document: Dict) -> bool:
+    """Whether any heading names a known section; flat documents fall back to the text heuristics."""
+    return any(section["key"] for section in document["sections"])
+
+# ---------- Consumers ---------- #
+
+def document_sections(document: Dict) -> Dict[str, bool]:
+    """
+    detect_sections from the layout: a section is present when a heading
+    names it. Contact details rarely get a heading, so they also count
+    when an email/phone or a contact keyword appears before the first
+    section.
+    """
+    detected = {section: False for section in SECTION_KEYWORDS}
+    for section in document["sections"]:
+        if section["key"]:
+            detected[section["key"]] = True
+
+    if not detected["contact_info"]:
+        blocks = document["blocks"]
+        for section in document["sections"]:
+            if section["key"]:
+                break
+            for block in blocks[section["start"]:section["end"]]:
+                lowered = block["text"].lower()
+                if CONTACT_PATTERN.search(block["text"]) or any(kw in lowered for kw in SECTION_KEYWORDS["contact_info"]):
+                    detected["contact_info"] = True
+
+    return detected
+
+
+def section_paragraphs(document: Dict) -> List[List[str]]:
+    """Per section, the texts of its blocks (heading first): units for section-aware chunking."""
+    blocks = document["blocks"]
+    return [[b["text"] for b in blocks[s["start"]:s["end"]]] for s in document["sections"]]
+
+
+def body_text(document: Dict) -> str:
+    """
+    The document without section headings and contact details (the
+    contact section, and contact lines before the first section), blocks
+    separated by blank lines so no sentence spans two blocks. What spaCy
+    reads. Other headings (job titles, employers) are content and kept.
+    """
+    blocks = document["blocks"]
+    parts = []
+    seen_section = False
+    for section in document["sections"]:
+        seen_section = seen_section or section["key"] is not None
+        if section["key"] == "contact_info":
+            continue
+        for block in blocks[section["start"]:section["end"]]:
+            if block["heading"] and section_key(block["text"]) is not None:
+                continue
+            if not seen_section and CONTACT_PATTERN.search(block["text"]):
+                continue
+            parts.append(block["text"])
+    return "\n\n".join(parts)
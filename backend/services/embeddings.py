@@ -1,14 +1,129 @@
+import asyncio
 import numpy as np
-from typing import Dict, Optional
-from langchain_community.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
-from langchain_mistralai import MistralAIEmbeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from services.skill_extractor import compare_skills  # Skill extraction module
+from typing import Dict, Iterable, List, Optional, Sequence
+from services.skill_extractor import (  # Skill extraction module
+    acompare_skill_sets,
+    ahybrid_extract_skills,
+    extract_jd_skills,
+    hybrid_extract_skills,
+    match_skills,
+    skills_to_bitset,
+    norms_to_bitset,
+    expand_bitsets,
+    SKILL_NAMES,
+    N_SKILLS,
+)
+from services.candidate_store import get_candidate_store
+from services.readability_rules import calculate_readability_score
+from services.llm_utils import LOCAL_MODEL
+from services.metrics import provider_call, stage
+from services.single_flight import SingleFlight, credential_digest, text_digest
+from services.async_runtime import run_blocking, run_cpu, run_sync
+from services.chunked_embeddings import (
+    EMBEDDING_MODE,
+    CHUNK_AGGREGATION,
+    chunked_document_vector,
+    chunked_similarity,
+)
 
 def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """Compute cosine similarity between two vectors."""
     return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
 
+def batch_cosine_similarity(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one vector against every row of an (N x d) matrix,
+    in float64 and in the order of operations of _cosine_similarity, so the
+    rounded scores match the single-pair path.
+    """
+    query = np.asarray(query_vec, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return (matrix @ query) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+
+# concurrent requests embedding the same text with the same model and keys share one call
+_embed_flights = SingleFlight("embeddings")
+
+# Gemini embeds queries and documents with different task types; embed_query
+# uses this one, and so do the batched query embeddings
+GEMINI_QUERY_TASK_TYPE = "RETRIEVAL_QUERY"
+
+class InstrumentedEmbeddings:
+    """
+    Wraps an embedding model so every call is timed per provider/model on
+    /metrics, and identical concurrent calls are coalesced.
+    """
+
+    def __init__(self, embedder, provider: str, credentials: str = ""):
+        self.embedder = embedder
+        self.provider = provider
+        self.credentials = credentials  # credential_digest of the keys the embedder uses
+        self.model = getattr(embedder, "model", None) or getattr(embedder, "model_name", None)
+        # in-process models (see _create_embedding_model) run in the offload pool
+        self.local = provider in ("groq", LOCAL_MODEL)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = ("query", self.provider, self.model, self.credentials, text_digest(text))
+        return _embed_flights.do(key, self._embed_query, text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        key = ("documents", self.provider, self.model, self.credentials, text_digest(*texts))
+        return _embed_flights.do(key, self._embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = ("query", self.provider, self.model, self.credentials, text_digest(text))
+        return await _embed_flights.ado(key, self._aembed_query, text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        key = ("documents", self.provider, self.model, self.credentials, text_digest(*texts))
+        return await _embed_flights.ado(key, self._aembed_documents, texts)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        embed_query for many texts in one batched call: the vectors the
+        single-pair path (calculate_gap_score) gets for each text.
+        """
+        key = ("queries", self.provider, self.model, self.credentials, text_digest(*texts))
+        return _embed_flights.do(key, self._embed_queries, texts)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        key = ("queries", self.provider, self.model, self.credentials, text_digest(*texts))
+        return await _embed_flights.ado(key, self._aembed_queries, texts)
+
+    def _embed_query(self, text: str) -> List[float]:
+        with stage("embed"), provider_call("embed_query", self.provider, self.model):
+            return self.embedder.embed_query(text)
+
+    def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with stage("embed"), provider_call("embed_documents", self.provider, self.model):
+            return self.embedder.embed_documents(texts)
+
+    def _embed_queries(self, texts: List[str]) -> List[List[float]]:
+        with stage("embed"), provider_call("embed_queries", self.provider, self.model):
+            if self.provider == "gemini":
+                return self.embedder.embed_documents(texts, task_type=GEMINI_QUERY_TASK_TYPE)
+            # the other providers embed queries and documents alike
+            return self.embedder.embed_documents(texts)
+
+    async def _aembed_query(self, text: str) -> List[float]:
+        with stage("embed"), provider_call("embed_query", self.provider, self.model):
+            if self.local:
+                return await run_cpu(self.embedder.embed_query, text)
+            return await self.embedder.aembed_query(text)
+
+    async def _aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        with stage("embed"), provider_call("embed_documents", self.provider, self.model):
+            if self.local:
+                return await run_cpu(self.embedder.embed_documents, texts)
+            return await self.embedder.aembed_documents(texts)
+
+    async def _aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        with stage("embed"), provider_call("embed_queries", self.provider, self.model):
+            if self.local:
+                return await run_cpu(self.embedder.embed_documents, texts)
+            if self.provider == "gemini":
+                return await run_blocking(self.embedder.embed_documents, texts, task_type=GEMINI_QUERY_TASK_TYPE)
+            return await self.embedder.aembed_documents(texts)
+
 def get_embedding_model(
     user_model: str,
     openai_api_key: Optional[str] = None,
@@ -22,12 +137,28 @@ def get_embedding_model(
     - mistral -> Mistral embeddings
     - groq -> HuggingFace embeddings (since Groq has no native embeddings)
     - gemini -> Google Generative AI embeddings
+    - local -> HuggingFace embeddings on CPU (offline provider)
     """
     user_model = (user_model or "").lower()
+    return InstrumentedEmbeddings(
+        _create_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key),
+        user_model,
+        credential_digest(openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+    )
+
+def _create_embedding_model(
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None
+):
+    # each provider's SDK is imported when its embeddings are first created
 
     if user_model == "openai":
         if not openai_api_key:
             raise ValueError("OpenAI API key is required when using OpenAI embeddings.")
+        from langchain_community.embeddings import OpenAIEmbeddings
         return OpenAIEmbeddings(
             model="text-embedding-3-small",
             openai_api_key=openai_api_key
@@ -36,13 +167,15 @@ def get_embedding_model(
     elif user_model == "gemini":
         if not gemini_api_key:
             raise ValueError("Gemini API key is required when using Gemini embeddings.")
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
         return GoogleGenerativeAIEmbeddings(
             model="text-embedding-004",
             google_api_key=gemini_api_key
         )
 
-    elif user_model == "groq":
+    elif user_model in ("groq", LOCAL_MODEL):
         # Groq has no embeddings → fallback to HuggingFace
+        from langchain_community.embeddings import HuggingFaceEmbeddings
         return HuggingFaceEmbeddings(
             model_name="sentence-transformers/all-MiniLM-L6-v2"
         )
@@ -50,6 +183,7 @@ def get_embedding_model(
     elif user_model == "mistral":
         if not mistral_api_key:
             raise ValueError("Mistral API key is required when using Mistral embeddings.")
+        from langchain_mistralai import MistralAIEmbeddings
         return MistralAIEmbeddings(
             model="mistral-embed",
             api_key=mistral_api_key
@@ -58,47 +192,91 @@ def get_embedding_model(
     else:
         raise ValueError(f"Unsupported model: {user_model}")
 
-def calculate_gap_score(
+async def acalculate_gap_score(
     resume_text: str,
     jd_text: str,
     user_model: str,
     openai_api_key: Optional[str] = None,
     gemini_api_key: Optional[str] = None,
     mistral_api_key: Optional[str] = None,
-    groq_api_key: Optional[str] = None
+    groq_api_key: Optional[str] = None,
+    add_to_pool: bool = False,
+    candidate_name: Optional[str] = None,
+    embedding_mode: Optional[str] = None,
+    chunk_aggregation: Optional[str] = None,
+    jd_artifacts: Optional[Dict] = None,
+    resume_document: Optional[Dict] = None
 ) -> Dict:
     """
     Calculates ATS score using a hybrid approach:
     - Skill-based matching (70% weight)
     - Embedding similarity (30% weight)
+
+    `embedding_mode="chunked"` embeds section/window chunks instead of the
+    whole text and aggregates them with `chunk_aggregation` (mean or max).
+
+    With `add_to_pool`, the resume vector, its skills (as extracted, not
+    expanded against this JD) and readability score are also stored in the
+    talent pool for `user_model`, as add_resume_to_pool stores them.
+
+    `jd_artifacts` (from the JD registry) supplies the JD's skills and
+    vector, so only the resume is extracted and embedded.
+
+    `resume_document` is the parsed file the resume text came from: spaCy
+    and chunking then use its layout (see document_layout).
+
+    Skill extraction and embeddings run concurrently.
     """
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+
     # --- Step 1: Skill extraction & comparison ---
-    skill_data = compare_skills(
-    resume_text,
-    jd_text,
-    model=user_model,
-    openai_key=openai_api_key or mistral_api_key,
-    groq_key=groq_api_key,
-    gemini_key=gemini_api_key
-)
+    async def skills():
+        if jd_artifacts is not None:
+            resume_skills = await ahybrid_extract_skills(
+                resume_text, user_model, openai_api_key or mistral_api_key, groq_api_key, gemini_api_key, resume_document
+            )
+            return resume_skills, match_skills(resume_skills, jd_artifacts["jd_skills"], jd_artifacts["jd_norm_set"])
+        return await acompare_skill_sets(
+            resume_text,
+            jd_text,
+            model=user_model,
+            openai_key=openai_api_key or mistral_api_key,
+            groq_key=groq_api_key,
+            gemini_key=gemini_api_key,
+            resume_document=resume_document
+        )
+
+    # --- Step 2: Embedding-based similarity ---
+    async def similarity():
+        if (embedding_mode or EMBEDDING_MODE) == "chunked":
+            # chunk vectors go through the sync (cached) chunk pipeline
+            embedding_similarity = await run_blocking(
+                chunked_similarity, resume_text, jd_text, embedder, user_model, chunk_aggregation or CHUNK_AGGREGATION,
+                resume_document
+            )
+            resume_vec = None
+            if add_to_pool:
+                resume_vec = await run_blocking(chunked_document_vector, resume_text, embedder, user_model, resume_document)
+            return embedding_similarity, resume_vec
+
+        if jd_artifacts is not None:
+            resume_vec, jd_vec = await embedder.aembed_query(resume_text), jd_artifacts["jd_vec"]
+        else:
+            resume_vec, jd_vec = await asyncio.gather(embedder.aembed_query(resume_text), embedder.aembed_query(jd_text))
+        return _cosine_similarity(np.array(resume_vec), np.array(jd_vec)), resume_vec
+
+    (resume_skills, skill_data), (embedding_similarity, resume_vec) = await asyncio.gather(skills(), similarity())
 
     matched_count = len(skill_data["matched_skills"])
     total_jd_skills = len(skill_data["total_jd_skills"])
     skill_score = round((matched_count / max(1, total_jd_skills)) * 100, 2)
-
-    # --- Step 2: Embedding-based similarity ---
-    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
-    resume_vec = embedder.embed_query(resume_text)
-    jd_vec = embedder.embed_query(jd_text)
-
-    embedding_similarity = _cosine_similarity(np.array(resume_vec), np.array(jd_vec))
     embedding_score = round(embedding_similarity * 100, 2)
 
     # --- Step 3: Hybrid ATS Score ---
     final_score = round((0.7 * skill_score) + (0.3 * embedding_score), 2)
 
     # --- Step 4: Return structured result ---
-    return {
+    result = {
         "score": final_score,
         "skill_score": skill_score,
         "embedding_score": embedding_score,
@@ -107,3 +285,271 @@ def calculate_gap_score(
         "total_resume_skills": len(skill_data["total_resume_skills"]),
         "total_jd_skills": total_jd_skills,
     }
+
+    if add_to_pool:
+        readability = await run_cpu(calculate_readability_score, resume_text, None, resume_document)
+        result["candidate_id"] = await run_blocking(
+            get_candidate_store(user_model).add, resume_vec, resume_skills,
+            name=candidate_name, readability_score=readability["readability_score"]
+        )
+
+    return result
+
+
+def calculate_gap_score(
+    resume_text: str,
+    jd_text: str,
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    add_to_pool: bool = False,
+    candidate_name: Optional[str] = None,
+    embedding_mode: Optional[str] = None,
+    chunk_aggregation: Optional[str] = None,
+    jd_artifacts: Optional[Dict] = None,
+    resume_document: Optional[Dict] = None
+) -> Dict:
+    """Sync wrapper of acalculate_gap_score."""
+    return run_sync(acalculate_gap_score(
+        resume_text, jd_text, user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key,
+        add_to_pool, candidate_name, embedding_mode, chunk_aggregation, jd_artifacts, resume_document
+    ))
+
+def embedding_similarity(
+    resume_text: str,
+    jd_text: str,
+    embedder,
+    user_model: str,
+    embedding_mode: Optional[str] = None,
+    chunk_aggregation: Optional[str] = None,
+    jd_vec: Optional[Sequence[float]] = None,
+    resume_document: Optional[Dict] = None
+) -> float:
+    """
+    The embedding similarity of acalculate_gap_score (same mode, same
+    value) for sync callers; `jd_vec` is a registered JD's vector.
+    """
+    if (embedding_mode or EMBEDDING_MODE) == "chunked":
+        return chunked_similarity(
+            resume_text, jd_text, embedder, user_model, chunk_aggregation or CHUNK_AGGREGATION, resume_document
+        )
+    resume_vec = embedder.embed_query(resume_text)
+    if jd_vec is None:
+        jd_vec = embedder.embed_query(jd_text)
+    return _cosine_similarity(np.array(resume_vec), np.array(jd_vec))
+
+def _as_bitset_rows(skill_sets, n: int) -> np.ndarray:
+    """(n x N_SKILLS) bool matrix from skill-name sets, or the matrix itself if already one."""
+    if isinstance(skill_sets, np.ndarray):
+        return skill_sets.astype(bool, copy=False)
+    return np.vstack([skills_to_bitset(s) for s in skill_sets]) if n else np.zeros((0, N_SKILLS), dtype=bool)
+
+
+def _score_rows(skill_bits, jd_bits, similarities) -> List[Dict]:
+    """
+    Hybrid 70/30 scores for aligned rows of (expanded) skill bitsets, JD
+    bitsets and embedding similarities, in row order.
+
+    Scores are rounded per row exactly as calculate_gap_score rounds them:
+    similarities given as numpy floats round like the full-text path, as
+    Python floats like the chunked one.
+    """
+    n = len(similarities)
+    matched = skill_bits & jd_bits
+    missing = jd_bits & ~skill_bits
+
+    matched_counts = matched.sum(axis=1)
+    total_jd_skills = np.broadcast_to(jd_bits.sum(axis=-1), (n,))
+
+    results = []
+    for i in range(n):
+        skill_score = round((int(matched_counts[i]) / max(1, int(total_jd_skills[i]))) * 100, 2)
+        embedding_score = round(similarities[i] * 100, 2)
+        results.append({
+            "score": float(round((0.7 * skill_score) + (0.3 * embedding_score), 2)),
+            "skill_score": skill_score,
+            "embedding_score": float(embedding_score),
+            "matched_skills": sorted(SKILL_NAMES[j] for j in np.flatnonzero(matched[i])),
+            "missing_skills": sorted(SKILL_NAMES[j] for j in np.flatnonzero(missing[i])),
+            "total_resume_skills": int(skill_bits[i].sum()),
+            "total_jd_skills": int(total_jd_skills[i]),
+        })
+
+    return results
+
+
+def _rank_scores(names, skill_bits, jd_bits, similarities) -> List[Dict]:
+    """_score_rows ranked by score descending, each row tagged with its name."""
+    rows = _score_rows(skill_bits, jd_bits, similarities)
+    order = np.argsort([-row["score"] for row in rows], kind="stable")
+    return [{"name": names[i], **rows[i]} for i in order]
+
+
+def batch_gap_scores(
+    jd_vec: Sequence[float],
+    resume_matrix: np.ndarray,
+    jd_skills: Iterable[str],
+    resume_skill_sets,
+    names: Optional[Sequence[str]] = None,
+) -> List[Dict]:
+    """
+    Scores N resumes against one JD in a single vectorized pass and returns
+    them ranked by score descending.
+
+    `resume_matrix` is (N x d), row i being the embedding of resume i (from
+    embed_queries, the vectors calculate_gap_score uses), and
+    `resume_skill_sets[i]` its skills already expanded against the JD (as in
+    compare_skills), either as names or as an (N x N_SKILLS) bitset matrix.
+    Uses the same 70/30 hybrid formula as calculate_gap_score.
+    """
+    n = len(resume_skill_sets)
+    names = list(names) if names is not None else list(range(n))
+
+    resume_bits = _as_bitset_rows(resume_skill_sets, n)
+    similarities = batch_cosine_similarity(jd_vec, resume_matrix) if n else np.zeros(0)
+
+    return _rank_scores(names, resume_bits, skills_to_bitset(jd_skills), similarities)
+
+
+def batch_job_scores(
+    resume_vec: Sequence[float],
+    jd_matrix: np.ndarray,
+    resume_skills: Iterable[str],
+    jd_skill_sets: Sequence[Iterable[str]],
+    jd_norm_sets: Sequence[Iterable[str]],
+    names: Optional[Sequence] = None,
+) -> List[Dict]:
+    """
+    Scores one resume against M JDs in a single vectorized pass and returns
+    them ranked by score descending.
+
+    `jd_matrix` is (M x d), row i being the embedding of JD i, and
+    `jd_skill_sets[i]` / `jd_norm_sets[i]` its output of extract_jd_skills.
+    Parent expansion of the resume skills is done per JD on bitsets, so the
+    result equals calculate_gap_score for each pair.
+    """
+    m = len(jd_skill_sets)
+    names = list(names) if names is not None else list(range(m))
+
+    jd_bits = _as_bitset_rows(jd_skill_sets, m)
+    jd_norm_bits = np.vstack([norms_to_bitset(s) for s in jd_norm_sets]) if m else np.zeros((0, N_SKILLS), dtype=bool)
+
+    # resume skills expanded with the parents each JD expects
+    expanded = expand_bitsets(skills_to_bitset(resume_skills), jd_norm_bits)
+    similarities = batch_cosine_similarity(resume_vec, jd_matrix) if m else np.zeros(0)
+
+    return _rank_scores(names, expanded, jd_bits, similarities)
+
+
+def pairwise_cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity of row i of `a` with row i of `b` (both N x d), in float64 as in calculate_gap_score."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return np.einsum("ij,ij->i", a, b) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def pairwise_gap_scores(
+    similarities: Sequence[float],
+    resume_skill_sets,
+    jd_skill_sets,
+    jd_norm_sets,
+) -> List[Dict]:
+    """
+    Scores N independent (resume, JD) pairs in one vectorized pass, in input
+    order.
+
+    Row i pairs `resume_skill_sets[i]` (unexpanded, as from
+    hybrid_extract_skills) with `jd_skill_sets[i]` / `jd_norm_sets[i]` (the
+    output of extract_jd_skills); `similarities[i]` is their embedding
+    similarity. Skill sets may also be given as bitset matrices. The result
+    equals calculate_gap_score for each pair.
+    """
+    n = len(similarities)
+    jd_bits = _as_bitset_rows(jd_skill_sets, n)
+    if isinstance(jd_norm_sets, np.ndarray):
+        jd_norm_bits = jd_norm_sets.astype(bool, copy=False)
+    else:
+        jd_norm_bits = np.vstack([norms_to_bitset(s) for s in jd_norm_sets]) if n else np.zeros((0, N_SKILLS), dtype=bool)
+
+    expanded = expand_bitsets(_as_bitset_rows(resume_skill_sets, n), jd_norm_bits)
+    return _score_rows(expanded, jd_bits, similarities)
+
+# ---------- Talent Pool ---------- #
+
+def add_resume_to_pool(
+    resume_text: str,
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    candidate_name: Optional[str] = None,
+    document: Optional[Dict] = None
+) -> str:
+    """
+    Extracts skills, embeds the resume and stores it in the talent pool with
+    its readability score; `document` is the parsed file, if there is one.
+    """
+    skills = hybrid_extract_skills(
+        resume_text, user_model, openai_api_key or mistral_api_key, groq_api_key, gemini_api_key, document
+    )
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+    resume_vec = embedder.embed_query(resume_text)
+
+    readability_score = calculate_readability_score(resume_text, document=document)["readability_score"]
+
+    return get_candidate_store(user_model).add(resume_vec, skills, name=candidate_name, readability_score=readability_score)
+
+
+def search_candidate_pool(
+    jd_text: str,
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    top_k: int = 20,
+    shortlist_size: Optional[int] = None
+) -> List[Dict]:
+    """
+    Returns the top_k pooled candidates for a JD.
+
+    An ANN search over the pool picks a shortlist by embedding similarity,
+    which is then re-scored with the hybrid 70/30 formula (stored skills
+    expanded against this JD) and re-ranked.
+    """
+    jd_skills, jd_norm_set = extract_jd_skills(
+        jd_text,
+        model=user_model,
+        openai_key=openai_api_key or mistral_api_key,
+        groq_key=groq_api_key,
+        gemini_key=gemini_api_key
+    )
+
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+    jd_vec = embedder.embed_query(jd_text)
+
+    store = get_candidate_store(user_model)
+    with stage("pool_search"):
+        shortlist = store.search(jd_vec, k=shortlist_size or top_k * 5)
+    if not shortlist:
+        return []
+
+    rows = [row for row, _ in shortlist]
+    skill_bits = expand_bitsets(store.skill_bitsets(rows), norms_to_bitset(jd_norm_set))
+
+    ranked = batch_gap_scores(jd_vec, store.vectors(rows), jd_skills, skill_bits, names=list(range(len(rows))))
+
+    results = []
+    for result in ranked[:top_k]:
+        candidate = store.candidate(rows[result.pop("name")])
+        results.append({
+            "candidate_id": candidate["id"],
+            "candidate_name": candidate["name"],
+            **result,
+            "readability_score": candidate["readability_score"],
+        })
+
+    return results
@@ -0,0 +1,170 @@
+import os
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from services.lru_cache import LRUCache
+from services.skill_extractor import (
+    cached_extract_jd_skills,
+    extract_skills_llm,
+    extract_skills_spacy,
+    match_skills,
+    normalize_skill,
+)
+from services.embeddings import embedding_similarity, get_embedding_model
+from services.readability import calculate_readability_score, detect_sections
+from services.document_layout import body_text, document_sections, has_sections, layout_for
+
+BLOCK_CACHE_SIZE = int(os.getenv("BLOCK_CACHE_SIZE", "50000"))
+
+# (model, block hash) -> LLM skills found in that block
+_block_skills = LRUCache(BLOCK_CACHE_SIZE, name="block_skills")
+# block hash -> spaCy skills of that block
+_block_spacy_skills = LRUCache(BLOCK_CACHE_SIZE, name="block_spacy_skills")
+# block hash -> sections detected in that block
+_block_sections = LRUCache(BLOCK_CACHE_SIZE, name="block_sections")
+
+# ---------- Blocks ---------- #
+
+def split_blocks(text: str) -> List[str]:
+    """Paragraph blocks separated by blank lines; lines never span blocks."""
+    return [b for b in re.split(r"\n\s*\n", text) if b.strip()]
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ---------- Per-block Stages ---------- #
+
+def _resume_skills(
+    blocks: List[str],
+    hashes: List[str],
+    model: str,
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None,
+    spacy_blocks: Optional[List[str]] = None
+) -> Tuple[set, int]:
+    """
+    Union of per-block skills; only blocks not seen before are extracted.
+    Changed blocks share a single LLM call and its skills are attributed
+    back to the blocks that mention them.
+
+    spaCy reads `spacy_blocks` (default: `blocks`): the blocks of the
+    layout's body text when the resume has a parsed document, as the full
+    pipeline's spaCy pass reads body_text.
+    """
+    cached = {h: _block_skills.get((model, h)) for h in set(hashes)}
+    changed = {h: b for h, b in zip(hashes, blocks) if cached[h] is None}
+
+    if changed:
+        llm_skills = extract_skills_llm("\n\n".join(changed.values()), model, openai_key, groq_key, gemini_key)
+
+        for h, block in changed.items():
+            block_norm = normalize_skill(block)
+            skills = frozenset(s for s in llm_skills if normalize_skill(s) in block_norm)
+            _block_skills.put((model, h), skills)
+            cached[h] = skills
+
+    spacy_skills = set()
+    for block in blocks if spacy_blocks is None else spacy_blocks:
+        h = _hash(block)
+        skills = _block_spacy_skills.get(h)
+        if skills is None:
+            skills = frozenset(extract_skills_spacy(block))
+            _block_spacy_skills.put(h, skills)
+        spacy_skills |= skills
+
+    return spacy_skills.union(*cached.values()), len(changed)
+
+
+def _resume_sections(blocks: List[str], hashes: List[str]) -> Dict[str, bool]:
+    """detect_sections OR-ed over blocks; equal to running it on the whole text."""
+    merged: Optional[Dict[str, bool]] = None
+
+    for h, block in zip(hashes, blocks):
+        sections = _block_sections.get(h)
+        if sections is None:
+            sections = detect_sections(block)
+            _block_sections.put(h, sections)
+        merged = dict(sections) if merged is None else {k: merged[k] or v for k, v in sections.items()}
+
+    return merged if merged is not None else detect_sections("")
+
+# ---------- Incremental Analysis ---------- #
+
+def analyze_incremental(
+    resume_text: str,
+    jd_text: str,
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    jd_artifacts: Optional[Dict] = None,
+    document: Optional[Dict] = None
+) -> Dict:
+    """
+    Gap analysis for the edit/re-run loop.
+
+    The resume is split into paragraph blocks keyed by content hash. Skills
+    and section detection are cached per block, so a re-run after an edit
+    only recomputes the blocks that changed; the JD is extracted once per
+    (model, JD text). The embedding score uses EMBEDDING_MODE like
+    /gap-analyzer: chunked mode reuses the cached vectors of unchanged
+    chunks, full mode embeds the whole resume again. Scores use the same
+    70/30 hybrid and readability formulas as the full pipeline.
+
+    `document` is the parsed file the resume was uploaded as: spaCy reads
+    its body text and readability its sections, as in the full pipeline.
+    Once the text is edited it no longer applies and the text heuristics
+    are used.
+    """
+    openai_key = openai_api_key or mistral_api_key
+    document = layout_for(resume_text, document)
+
+    blocks = split_blocks(resume_text)
+    hashes = [_hash(b) for b in blocks]
+
+    # --- Skills (a registered JD brings its own) ---
+    if jd_artifacts is not None:
+        jd_skills, jd_norm_set = jd_artifacts["jd_skills"], jd_artifacts["jd_norm_set"]
+    else:
+        jd_skills, jd_norm_set = cached_extract_jd_skills(jd_text, user_model, openai_key, groq_api_key, gemini_api_key)
+    resume_skills, changed_blocks = _resume_skills(
+        blocks, hashes, user_model, openai_key, groq_api_key, gemini_api_key,
+        spacy_blocks=split_blocks(body_text(document)) if document is not None else None
+    )
+    skill_data = match_skills(resume_skills, jd_skills, jd_norm_set)
+
+    total_jd_skills = len(skill_data["total_jd_skills"])
+    skill_score = round((len(skill_data["matched_skills"]) / max(1, total_jd_skills)) * 100, 2)
+
+    # --- Embeddings (same mode as the full pipeline) ---
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+    similarity = embedding_similarity(
+        resume_text, jd_text, embedder, user_model,
+        jd_vec=jd_artifacts["jd_vec"] if jd_artifacts is not None else None,
+        resume_document=document
+    )
+    embedding_score = round(similarity * 100, 2)
+
+    # --- Readability rules ---
+    # a parsed file's layout names its sections outright
+    if document is not None and has_sections(document):
+        sections = document_sections(document)
+    else:
+        sections = _resume_sections(blocks, hashes)
+    readability = calculate_readability_score(resume_text, sections_detected=sections)
+
+    return {
+        "score": round((0.7 * skill_score) + (0.3 * embedding_score), 2),
+        "skill_score": skill_score,
+        "embedding_score": embedding_score,
+        "matched_skills": skill_data["matched_skills"],
+        "missing_skills": skill_data["missing_skills"],
+        "total_resume_skills": len(skill_data["total_resume_skills"]),
+        "total_jd_skills": total_jd_skills,
+        "readability": readability,
+        "changed_blocks": changed_blocks,
+        "total_blocks": len(set(hashes)),
+    }
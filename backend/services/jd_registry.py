@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from services.skill_extractor import extract_jd_skills
+from services.embeddings import get_embedding_model
+from services.single_flight import SingleFlight, credential_digest
+
+JD_REGISTRY_DIR = os.getenv(
+    "JD_REGISTRY_DIR",
+    os.path.join(os.path.dirname(__file__), ".cache", "jd_registry")
+)
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): single-process serving only
+    fcntl = None
+
+_artifact_flights = SingleFlight("jd_artifacts")
+
+# ---------- Registry ---------- #
+
+class JDRegistry:
+    """
+    Job descriptions registered once and referenced by `jd_id`.
+
+    One JSON file per JD under `path` holds the text, title and, per model,
+    the derived artifacts: JD skills (expanded with parents), the normalized
+    JD skill set and the JD embedding. Artifacts for a model are computed at
+    registration or on first use with that model, then reused by every
+    request, so all candidates are compared against the same skill set.
+
+    `jd_id` is derived from the JD text, so registering the same text twice
+    returns the same id.
+
+    The files are the source of truth for every worker process: reads take
+    a shared flock on `.lock` and revalidate the in-memory copy against the
+    file's stat, writes re-read the record under the exclusive lock before
+    changing it, so a JD deleted or extended by another worker is seen here.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._records: Dict[str, Tuple[Tuple[int, int, int], Dict]] = {}  # jd_id -> (file stat, record)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def jd_id_for(jd_text: str) -> str:
+        return "jd_" + hashlib.sha256(jd_text.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _valid_id(jd_id: str) -> bool:
+        # ids are used as file names; reject anything that is not one of ours
+        return jd_id.startswith("jd_") and jd_id[3:].isalnum()
+
+    def _file(self, jd_id: str) -> str:
+        return os.path.join(self.path, f"{jd_id}.json")
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """Inter-process lock on the registry files: shared for reads, exclusive for writes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.path, ".lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read(self, jd_id: str) -> Optional[Dict]:
+        """The record as currently on disk (None when missing); call under _file_lock."""
+        if not self._valid_id(jd_id):
+            return None
+        try:
+            st = os.stat(self._file(jd_id))
+        except FileNotFoundError:
+            self._records.pop(jd_id, None)
+            return None
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._records.get(jd_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(self._file(jd_id), "r", encoding="utf-8") as f:
+            record = json.load(f)
+        self._records[jd_id] = (stamp, record)
+        return record
+
+    def _save(self, record: Dict) -> None:
+        """Write `record` atomically; call under the exclusive _file_lock."""
+        tmp = self._file(record["jd_id"]) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, self._file(record["jd_id"]))
+        self._records.pop(record["jd_id"], None)
+
+    def get(self, jd_id: str) -> Optional[Dict]:
+        with self._file_lock(shared=True):
+            return self._read(jd_id)
+
+    def register(self, jd_text: str, title: Optional[str] = None) -> Dict:
+        jd_id = self.jd_id_for(jd_text)
+        with self._file_lock():
+            record = self._read(jd_id)
+            if record is None:
+                record = {"jd_id": jd_id, "title": title, "jd_text": jd_text, "created_at": time.time(), "artifacts": {}}
+                self._save(record)
+            elif title and record.get("title") != title:
+                record = {**record, "title": title}
+                self._save(record)
+            return record
+
+    def delete(self, jd_id: str) -> bool:
+        if not self._valid_id(jd_id):
+            return False
+        with self._file_lock():
+            self._records.pop(jd_id, None)
+            try:
+                os.remove(self._file(jd_id))
+            except FileNotFoundError:  # never registered, or deleted by another worker
+                return False
+            return True
+
+    def list(self) -> List[Dict]:
+        ids = sorted(f[:-len(".json")] for f in os.listdir(self.path) if f.endswith(".json"))
+        records = (self.get(jd_id) for jd_id in ids)
+        return [summarize_jd(record) for record in records if record is not None]
+
+    def _compute_artifacts(self, jd_id: str, user_model: str, keys: Dict[str, Optional[str]]) -> Dict:
+        record = self.get(jd_id)
+        if record is None:
+            raise KeyError(jd_id)
+        stored = record["artifacts"].get(user_model)
+        if stored is not None:  # written by another worker meanwhile
+            return stored
+
+        jd_skills, jd_norm_set = extract_jd_skills(
+            record["jd_text"],
+            model=user_model,
+            openai_key=keys["openai_api_key"] or keys["mistral_api_key"],
+            groq_key=keys["groq_api_key"],
+            gemini_key=keys["gemini_api_key"]
+        )
+        embedder = get_embedding_model(
+            user_model, keys["openai_api_key"], keys["gemini_api_key"], keys["mistral_api_key"], keys["groq_api_key"]
+        )
+        stored = {
+            "jd_skills": sorted(jd_skills),
+            "jd_norm_set": sorted(jd_norm_set),
+            "jd_vec": [float(x) for x in embedder.embed_query(record["jd_text"])],
+        }
+
+        # merge into the record as it is now: other workers may have added
+        # artifacts for other models, or deleted the JD, while we computed
+        with self._file_lock():
+            record = self._read(jd_id)
+            if record is None:
+                raise KeyError(jd_id)
+            if user_model not in record["artifacts"]:
+                self._save({**record, "artifacts": {**record["artifacts"], user_model: stored}})
+        return stored
+
+    def artifacts(
+        self,
+        jd_id: str,
+        user_model: str,
+        openai_api_key: Optional[str] = None,
+        gemini_api_key: Optional[str] = None,
+        mistral_api_key: Optional[str] = None,
+        groq_api_key: Optional[str] = None
+    ) -> Dict:
+        """
+        {"jd_id", "jd_text", "jd_skills", "jd_norm_set", "jd_vec"} for
+        `user_model`, computing and storing them on first use (once per
+        process for concurrent requests with the same credentials).
+        Raises KeyError for an unknown jd_id.
+        """
+        record = self.get(jd_id)
+        if record is None:
+            raise KeyError(jd_id)
+
+        stored = record["artifacts"].get(user_model)
+        if stored is None:
+            keys = {
+                "openai_api_key": openai_api_key,
+                "gemini_api_key": gemini_api_key,
+                "mistral_api_key": mistral_api_key,
+                "groq_api_key": groq_api_key,
+            }
+            key = (self.path, jd_id, user_model, credential_digest(openai_api_key, gemini_api_key, mistral_api_key, groq_api_key))
+            stored = _artifact_flights.do(key, self._compute_artifacts, jd_id, user_model, keys)
+
+        return {
+            "jd_id": jd_id,
+            "jd_text": record["jd_text"],
+            "jd_skills": set(stored["jd_skills"]),
+            "jd_norm_set": set(stored["jd_norm_set"]),
+            "jd_vec": np.array(stored["jd_vec"]),
+        }
+
+
+def summarize_jd(record: Dict) -> Dict:
+    """Registry record without the stored vectors."""
+    return {
+        "jd_id": record["jd_id"],
+        "title": record.get("title"),
+        "created_at": record.get("created_at"),
+        "skills": {model: a["jd_skills"] for model, a in record["artifacts"].items()},
+    }
+
+
+_registry: Optional[JDRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_jd_registry() -> JDRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JDRegistry(JD_REGISTRY_DIR)
+        return _registry
@@ -0,0 +1,107 @@
+import os
+import hashlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from services.lru_cache import LRUCache
+from services.skill_extractor import cached_extract_jd_skills, hybrid_extract_skills
+from services.embeddings import get_embedding_model, batch_job_scores
+from services.metrics import stage
+
+JD_VECTOR_CACHE_SIZE = int(os.getenv("JD_VECTOR_CACHE_SIZE", "5000"))
+
+# Uncached JDs are extracted concurrently (their LLM calls are I/O bound)
+JD_EXTRACTION_WORKERS = int(os.getenv("JD_EXTRACTION_WORKERS", "8"))
+
+# (model, JD hash) -> JD embedding
+_jd_vectors = LRUCache(JD_VECTOR_CACHE_SIZE, name="jd_vectors")
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ---------- JD Side (cached) ---------- #
+
+def jd_skill_sets(jd_texts: List[str], model: str, openai_key=None, groq_key=None, gemini_key=None) -> List[tuple]:
+    """(JD skills, normalized JD skill set) per JD; cache misses run in parallel."""
+    def extract(jd_text):
+        return cached_extract_jd_skills(jd_text, model, openai_key, groq_key, gemini_key)
+
+    workers = max(1, min(JD_EXTRACTION_WORKERS, len(jd_texts)))
+    if workers == 1:
+        return [extract(t) for t in jd_texts]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract, jd_texts))
+
+
+def jd_vector_matrix(jd_texts: List[str], embedder, model: str) -> np.ndarray:
+    """
+    (M x d) float64 JD embeddings. Uncached JDs are embedded in one
+    embed_queries call: the vectors calculate_gap_score gets from
+    embed_query (providers such as Gemini embed documents differently).
+    """
+    keys = [(model, _hash(t)) for t in jd_texts]
+    vectors = [_jd_vectors.get(k) for k in keys]
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        embedded = embedder.embed_queries([jd_texts[i] for i in missing])
+        for i, vec in zip(missing, embedded):
+            vec = np.asarray(vec, dtype=np.float64)
+            _jd_vectors.put(keys[i], vec)
+            vectors[i] = vec
+
+    return np.vstack(vectors)
+
+# ---------- One Resume, Many JDs ---------- #
+
+def rank_jobs_for_resume(
+    resume_text: str,
+    jobs: List[Dict],
+    user_model: str,
+    openai_api_key: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    mistral_api_key: Optional[str] = None,
+    groq_api_key: Optional[str] = None,
+    top_k: Optional[int] = None
+) -> Dict:
+    """
+    Scores one resume against every job in `jobs` ({"job_id", "title",
+    "jd_text"}) with the 70/30 hybrid of calculate_gap_score.
+
+    The resume is extracted and embedded once; JD skill sets and vectors
+    come from per-(model, JD text) caches, so repeated roles cost nothing,
+    and all pairs are scored in one vectorized pass.
+    """
+    openai_key = openai_api_key or mistral_api_key
+    jd_texts = [job["jd_text"] for job in jobs]
+
+    with stage("resume_skills"):
+        resume_skills = hybrid_extract_skills(resume_text, user_model, openai_key, groq_api_key, gemini_api_key)
+
+    with stage("jd_skills_batch"):
+        jd_sets = jd_skill_sets(jd_texts, user_model, openai_key, groq_api_key, gemini_api_key)
+
+    embedder = get_embedding_model(user_model, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key)
+    resume_vec = embedder.embed_query(resume_text)
+    jd_matrix = jd_vector_matrix(jd_texts, embedder, user_model)
+
+    ranked = batch_job_scores(
+        resume_vec,
+        jd_matrix,
+        resume_skills,
+        [skills for skills, _ in jd_sets],
+        [norms for _, norms in jd_sets],
+        names=list(range(len(jobs)))
+    )
+
+    results = []
+    for result in ranked[:top_k] if top_k else ranked:
+        job = jobs[result.pop("name")]
+        results.append({"job_id": job.get("job_id"), "title": job.get("title"), **result})
+
+    return {
+        "resume_skills": sorted(resume_skills),
+        "total_jobs": len(jobs),
+        "results": results,
+    }
@@ -0,0 +1,263 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+from services.lru_cache import LRUCache
+from services.skill_matcher import SEMANTIC_MODEL
+from services.prompt_builder import record_llm_call
+from services.metrics import METRIC_PREFIX, format_sample, provider_call, register_collector
+from services.chunked_embeddings import chunked_document_vector
+from services.single_flight import SingleFlight, credential_digest
+from services.async_runtime import run_cpu
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+
+# Comma-separated call names that never use the cache, e.g. "resume_advisor"
+LLM_CACHE_DISABLED_ENDPOINTS = {
+    e.strip() for e in os.getenv("LLM_CACHE_DISABLED_ENDPOINTS", "").split(",") if e.strip()
+}
+
+# Near-duplicate lookup for free-text feedback prompts (off by default)
+LLM_CACHE_SEMANTIC = os.getenv("LLM_CACHE_SEMANTIC", "0") == "1"
+LLM_CACHE_SEMANTIC_ENDPOINTS = {
+    e.strip()
+    for e in os.getenv(
+        "LLM_CACHE_SEMANTIC_ENDPOINTS", "readability_feedback,video_feedback,resume_advisor"
+    ).split(",")
+    if e.strip()
+}
+LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0.98"))
+LLM_CACHE_SEMANTIC_SIZE = int(os.getenv("LLM_CACHE_SEMANTIC_SIZE", "2000"))
+
+# prompt key -> response text
+_responses = LRUCache(LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL, name="llm_responses")
+
+# hit/miss counters per call name
+CACHE_STATS: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+# ---------- Keys ---------- #
+
+def llm_cache_key(provider: str, model: str, temperature: Optional[float], prompt: str) -> str:
+    raw = "\x1f".join([provider, model, repr(temperature), prompt])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _count(endpoint: str, outcome: str) -> None:
+    with _stats_lock:
+        stats = CACHE_STATS.setdefault(endpoint, {"hits": 0, "semantic_hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+
+def _render_cache_stats():
+    name = f"{METRIC_PREFIX}_llm_cache_lookups_total"
+    lines = [f"# HELP {name} LLM response cache lookups by call and outcome.", f"# TYPE {name} counter"]
+    with _stats_lock:
+        snapshot = sorted((endpoint, dict(stats)) for endpoint, stats in CACHE_STATS.items())
+    for endpoint, stats in snapshot:
+        for outcome, count in stats.items():
+            lines.append(format_sample(name, {"call": endpoint, "outcome": outcome}, count))
+    return lines
+
+
+register_collector(_render_cache_stats)
+
+# ---------- Semantic Index ---------- #
+
+class _SemanticIndex:
+    """
+    Ring buffer of normalized prompt embeddings -> exact cache keys, one per
+    (provider, model, temperature, endpoint) namespace.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._embedder = None
+        self._spaces: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        # chunked, so long inputs are not cut at the model's 256-token limit
+        if self._embedder is None:
+            from langchain_community.embeddings import HuggingFaceEmbeddings  # pulls in sentence-transformers
+            self._embedder = HuggingFaceEmbeddings(model_name=SEMANTIC_MODEL)
+        return chunked_document_vector(text, self._embedder, SEMANTIC_MODEL)
+
+    def lookup(self, namespace: str, vec: np.ndarray, threshold: float) -> Optional[str]:
+        with self._lock:
+            space = self._spaces.get(namespace)
+            if not space or space["count"] == 0:
+                return None
+            sims = space["vectors"][:space["count"]] @ vec
+            best = int(sims.argmax())
+            return space["keys"][best] if sims[best] >= threshold else None
+
+    def add(self, namespace: str, vec: np.ndarray, key: str) -> None:
+        with self._lock:
+            space = self._spaces.get(namespace)
+            if space is None:
+                space = {
+                    "vectors": np.zeros((self.size, len(vec)), dtype=np.float32),
+                    "keys": [None] * self.size,
+                    "next": 0,
+                    "count": 0,
+                }
+                self._spaces[namespace] = space
+            slot = space["next"]
+            space["vectors"][slot] = vec
+            space["keys"][slot] = key
+            space["next"] = (slot + 1) % self.size
+            space["count"] = min(self.size, space["count"] + 1)
+
+
+_semantic_index = _SemanticIndex(LLM_CACHE_SEMANTIC_SIZE)
+
+_llm_flights = SingleFlight("llm")
+
+# ---------- Cached Call ---------- #
+
+def _cacheable(endpoint: str, use_cache: bool) -> bool:
+    return use_cache and LLM_CACHE_ENABLED and endpoint not in LLM_CACHE_DISABLED_ENDPOINTS
+
+
+def _exact_hit(endpoint: str, key: str) -> Optional[str]:
+    response = _responses.get(key)
+    if response is not None:
+        _count(endpoint, "hits")
+    return response
+
+
+def _semantic_scope(endpoint: str, provider: str, model: str, temperature: Optional[float], semantic_text: Optional[str]) -> Optional[str]:
+    """The semantic index namespace, or None when near-duplicate lookup does not apply."""
+    if not (semantic_text and LLM_CACHE_SEMANTIC and endpoint in LLM_CACHE_SEMANTIC_ENDPOINTS):
+        return None
+    return f"{provider}\x1f{model}\x1f{temperature!r}\x1f{endpoint}"
+
+
+def _semantic_hit(endpoint: str, namespace: str, vec: np.ndarray) -> Optional[str]:
+    near_key = _semantic_index.lookup(namespace, vec, LLM_CACHE_SEMANTIC_THRESHOLD)
+    response = _responses.get(near_key) if near_key else None
+    if response is not None:
+        _count(endpoint, "semantic_hits")
+    return response
+
+
+def _store(key: str, response: str, namespace: Optional[str], vec: Optional[np.ndarray]) -> None:
+    if response:
+        _responses.put(key, response)
+        if namespace is not None:
+            _semantic_index.add(namespace, vec, key)
+
+
+def cached_llm_call(
+    endpoint: str,
+    provider: str,
+    model: str,
+    temperature: Optional[float],
+    prompt: str,
+    call: Callable[[], str],
+    use_cache: bool = True,
+    semantic_text: Optional[str] = None,
+    credentials: Sequence[Optional[str]] = ()
+) -> str:
+    """
+    Returns the cached response for (provider, model, temperature, prompt)
+    or runs `call()` and caches its result.
+
+    `endpoint` is the call name ("extract_skills", "readability_feedback",
+    ...) used for per-endpoint opt-out, semantic lookup and hit counters.
+    Token usage is only recorded for calls that reach the provider.
+
+    `semantic_text` (the variable inputs, without the fixed instructions)
+    enables near-duplicate lookup for endpoints in LLM_CACHE_SEMANTIC_ENDPOINTS.
+
+    `credentials` are the API keys `call()` runs with: concurrent misses are
+    only coalesced between callers with the same keys.
+    """
+    def call_provider() -> str:
+        with provider_call(endpoint, provider, model):
+            response = call()
+        record_llm_call(endpoint, provider, prompt, response)
+        return response
+
+    if not _cacheable(endpoint, use_cache):
+        return call_provider()
+
+    key = llm_cache_key(provider, model, temperature, prompt)
+    response = _exact_hit(endpoint, key)
+    if response is not None:
+        return response
+
+    namespace = _semantic_scope(endpoint, provider, model, temperature, semantic_text)
+    vec = None
+    if namespace is not None:
+        vec = _semantic_index.embed(semantic_text)
+        response = _semantic_hit(endpoint, namespace, vec)
+        if response is not None:
+            return response
+
+    _count(endpoint, "misses")
+    # identical prompts missing at the same time reach the provider once
+    response = _llm_flights.do((key, credential_digest(*credentials)), call_provider)
+    _store(key, response, namespace, vec)
+    return response
+
+
+async def acached_llm_call(
+    endpoint: str,
+    provider: str,
+    model: str,
+    temperature: Optional[float],
+    prompt: str,
+    call: Callable[[], Awaitable[str]],
+    use_cache: bool = True,
+    semantic_text: Optional[str] = None,
+    credentials: Sequence[Optional[str]] = ()
+) -> str:
+    """cached_llm_call for an async provider call: `call()` returns an awaitable."""
+    async def call_provider() -> str:
+        with provider_call(endpoint, provider, model):
+            response = await call()
+        record_llm_call(endpoint, provider, prompt, response)
+        return response
+
+    if not _cacheable(endpoint, use_cache):
+        return await call_provider()
+
+    key = llm_cache_key(provider, model, temperature, prompt)
+    response = _exact_hit(endpoint, key)
+    if response is not None:
+        return response
+
+    namespace = _semantic_scope(endpoint, provider, model, temperature, semantic_text)
+    vec = None
+    if namespace is not None:
+        vec = await run_cpu(_semantic_index.embed, semantic_text)
+        response = _semantic_hit(endpoint, namespace, vec)
+        if response is not None:
+            return response
+
+    _count(endpoint, "misses")
+    response = await _llm_flights.ado((key, credential_digest(*credentials)), call_provider)
+    _store(key, response, namespace, vec)
+    return response
+
+# ---------- Out-of-band Responses ---------- #
+
+def cached_response(endpoint: str, provider: str, model: str, temperature: Optional[float], prompt: str) -> Optional[str]:
+    """Exact-match lookup only, e.g. to leave answered prompts out of a provider batch."""
+    if not _cacheable(endpoint, True):
+        return None
+    response = _exact_hit(endpoint, llm_cache_key(provider, model, temperature, prompt))
+    if response is None:
+        _count(endpoint, "misses")
+    return response
+
+
+def cache_response(endpoint: str, provider: str, model: str, temperature: Optional[float], prompt: str, response: str) -> None:
+    """Stores a response obtained outside cached_llm_call (a provider batch job)."""
+    if _cacheable(endpoint, True):
+        _store(llm_cache_key(provider, model, temperature, prompt), response, None, None)
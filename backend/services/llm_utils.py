@@ -1,8 +1,7 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain_mistralai import ChatMistralAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq  # Groq integration (Llama 3 models)
+
+# Provider SDKs are imported in get_llm, on first use of their provider:
+# a process that never calls a provider never pays for importing it.
 
 # Supported models mapping
 MODEL_MAP = {
@@ -12,6 +11,13 @@ MODEL_MAP = {
     "groq": "llama-3.3-70b-versatile"  # Default Groq model
 }
 
+LLM_TEMPERATURE = 0.4
+
+# Offline provider: spaCy/whitelist extraction, local embeddings, rule-based feedback
+LOCAL_MODEL = "local"
+
+SUPPORTED_MODELS = [*MODEL_MAP, LOCAL_MODEL]
+
 def get_llm(
     model_name: str,
     openai_api_key: str = None,
@@ -24,25 +30,32 @@ def get_llm(
     if model_name == "openai":
         if not openai_api_key:
             raise ValueError("OpenAI API key required for OpenAI models.")
-        return ChatOpenAI(model=MODEL_MAP["openai"], temperature=0.4, openai_api_key=openai_api_key)
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=MODEL_MAP["openai"], temperature=LLM_TEMPERATURE, openai_api_key=openai_api_key)
 
     elif model_name == "mistral":
         key = mistral_api_key or os.getenv("MISTRAL_API_KEY")
         if not key:
             raise ValueError("Mistral API key required for Mistral models.")
-        return ChatMistralAI(model=MODEL_MAP["mistral"], temperature=0.4, api_key=key)
+        from langchain_mistralai import ChatMistralAI
+        return ChatMistralAI(model=MODEL_MAP["mistral"], temperature=LLM_TEMPERATURE, api_key=key)
 
     elif model_name == "gemini":
         key = gemini_api_key or os.getenv("GEMINI_API_KEY")
         if not key:
             raise ValueError("Gemini API key required for Gemini models.")
-        return ChatGoogleGenerativeAI(model=MODEL_MAP["gemini"], temperature=0.4, google_api_key=key)
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=MODEL_MAP["gemini"], temperature=LLM_TEMPERATURE, google_api_key=key)
 
     elif model_name == "groq":
         key = groq_api_key or os.getenv("GROQ_API_KEY")
         if not key:
             raise ValueError("Groq API key required for Groq models.")
-        return ChatGroq(model=MODEL_MAP["groq"], temperature=0.4, api_key=key)
+        from langchain_groq import ChatGroq  # Groq integration (Llama 3 models)
+        return ChatGroq(model=MODEL_MAP["groq"], temperature=LLM_TEMPERATURE, api_key=key)
+
+    elif model_name == LOCAL_MODEL:
+        raise ValueError("The local provider has no chat model; use the rule-based feedback in services.local_provider.")
 
     else:
-        raise ValueError(f"Unsupported model: {model_name}. Choose from openai, mistral, gemini, groq.")
+        raise ValueError(f"Unsupported model: {model_name}. Choose from openai, mistral, gemini, groq, local.")
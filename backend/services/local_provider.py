@@ -0,0 +1,80 @@
+from typing import Dict, List
+
+# Rule-based feedback for the offline "local" provider, which pairs these
+# templates with the whitelist extractor and local MiniLM embeddings.
+
+SECTION_LABELS = {
+    "contact_info": "Contact Info",
+    "summary": "Summary",
+    "work_experience": "Work Experience",
+    "education": "Education",
+    "skills": "Skills",
+}
+
+# ---------- Templated Feedback ---------- #
+
+def _bullets(lines: List[str]) -> str:
+    return "\n".join(f"- {line}" for line in lines)
+
+
+def local_readability_feedback(rules_result: Dict) -> str:
+    """Readability suggestions derived from calculate_readability_score output."""
+    lines = []
+
+    missing = [SECTION_LABELS.get(k, k) for k, found in rules_result["sections_detected"].items() if not found]
+    if missing:
+        lines.append(f"Add clearly labelled sections for: {', '.join(missing)}.")
+
+    grammar = rules_result["grammar_issues"]
+    if grammar["spelling_errors"]:
+        lines.append(f"Fix {grammar['spelling_errors']} common misspelling(s) (e.g. 'managment', 'recieve').")
+    if grammar["punctuation_issues"] > 5:
+        lines.append("Many lines end without punctuation; end sentences and bullet points consistently.")
+
+    if rules_result["readability_score"] < 70:
+        lines.append(
+            f"Readability score is {rules_result['readability_score']}/100; use standard section headings "
+            "and avoid long runs of blank lines so ATS parsers read the layout correctly."
+        )
+
+    if not lines:
+        lines.append("Structure, sections and grammar look good; keep bullet points short and results-focused.")
+
+    return _bullets(lines)
+
+
+def local_video_feedback(matched_skills: List[str], missing_skills: List[str]) -> str:
+    lines = []
+
+    if matched_skills:
+        lines.append(f"Strengths: you clearly mention {', '.join(matched_skills[:8])}.")
+    if missing_skills:
+        lines.append(f"Gaps: the job description also asks for {', '.join(missing_skills[:8])}; mention them if you have the experience.")
+        lines.append("Give a short concrete example (project, impact) for each key skill rather than listing it.")
+    else:
+        lines.append("You cover every skill the job description lists; back them with concrete results.")
+    lines.append("Keep the video concise and state your role and strongest skills in the first 30 seconds.")
+
+    return _bullets(lines)
+
+
+def local_advisor_feedback(skill_data: Dict) -> str:
+    """Resume advice from compare_skills output."""
+    missing = skill_data["missing_skills"]
+    matched = skill_data["matched_skills"]
+
+    sections = ["Missing Skills"]
+    sections.append(_bullets(missing) if missing else "- None: every required skill is present.")
+
+    suggestions = []
+    if missing:
+        suggestions.append("Add the missing skills you actually have to your Skills section and show them in a project or role.")
+    if matched:
+        suggestions.append(f"Quantify results for your matching skills ({', '.join(matched[:5])}).")
+    suggestions.append("Mirror the job description's wording for tools and technologies.")
+
+    sections.append("")
+    sections.append("Suggestions")
+    sections.append(_bullets(suggestions))
+
+    return "\n".join(sections)
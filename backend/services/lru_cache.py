@@ -0,0 +1,110 @@
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+from services.metrics import METRIC_PREFIX, format_sample, register_collector
+from services.shared_cache import get_shared_store
+
+# named caches, reported on /metrics
+_named_caches: "weakref.WeakValueDictionary[str, LRUCache]" = weakref.WeakValueDictionary()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU mapping. With `ttl` (seconds), entries
+    also expire that long after they were written.
+
+    Caches given a `name` report size, hits and misses on /metrics, and
+    those listed in SHARED_CACHES fall back to the cross-process shared
+    store on a local miss when SHARED_CACHE_DIR is set (multi-worker mode).
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None, name: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared = get_shared_store(name) if name else None
+        if name:
+            _named_caches[name] = self
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at >= time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self._shared is not None:
+            found, value = self._shared.get(self.name, key)
+            if found:
+                self._put_local(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _put_local(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._put_local(key, value)
+        if self._shared is not None:
+            self._shared.put(self.name, key, value, self.ttl, self.max_size)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        if self._shared is not None:
+            self._shared.clear(self.name)
+
+
+def _render_cache_metrics() -> List[str]:
+    lines = []
+    for metric, kind, help_text in (
+        ("cache_entries", "gauge", "Entries held per named in-process cache."),
+        ("cache_hits_total", "counter", "Cache lookups that found an entry."),
+        ("cache_misses_total", "counter", "Cache lookups that found nothing (or an expired entry)."),
+        ("cache_shared_hits_total", "counter", "Hits served by the cross-process shared store."),
+        ("cache_hit_ratio", "gauge", "hits / (hits + misses) since start."),
+    ):
+        name = f"{METRIC_PREFIX}_{metric}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for cache_name, cache in sorted(_named_caches.items()):
+            lookups = cache.hits + cache.misses
+            value = {
+                "cache_entries": len(cache),
+                "cache_hits_total": cache.hits,
+                "cache_misses_total": cache.misses,
+                "cache_shared_hits_total": cache.shared_hits,
+                "cache_hit_ratio": cache.hits / lookups if lookups else 0.0,
+            }[metric]
+            lines.append(format_sample(name, {"cache": cache_name}, value))
+    return lines
+
+
+register_collector(_render_cache_metrics)
@@ -0,0 +1,247 @@
+import os
+import time
+import bisect
+import inspect
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# In-process metrics in the Prometheus text format, cheap enough to leave on:
+# one lock + bisect per observation, no background threads.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Also emit OpenTelemetry spans for stages and provider calls; exporter
+# setup is left to the OTel SDK (e.g. `opentelemetry-instrument`).
+OTEL_ENABLED = os.getenv("OTEL_ENABLED", "0") == "1"
+
+METRIC_PREFIX = "hireminds"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# ---------- Tracing ---------- #
+
+_tracer = None
+
+if OTEL_ENABLED:
+    try:
+        from opentelemetry import trace
+        _tracer = trace.get_tracer("hireminds")
+    except ImportError:
+        logger.warning("OTEL_ENABLED=1 but opentelemetry is not installed; spans disabled")
+
+# ---------- Exposition Helpers ---------- #
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_sample(name: str, labels: Dict[str, object], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        return f"{name}{{{rendered}}} {value:.6g}"
+    return f"{name} {value:.6g}"
+
+# ---------- Metric Types ---------- #
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+
+        for labels, counts, total, count in sorted(snapshot):
+            base = dict(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                lines.append(format_sample(f"{self.name}_bucket", {**base, "le": bound}, cumulative))
+            lines.append(format_sample(f"{self.name}_sum", base, total))
+            lines.append(format_sample(f"{self.name}_count", base, count))
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for labels, value in snapshot:
+            lines.append(format_sample(self.name, dict(zip(self.label_names, labels)), value))
+        return lines
+
+
+class Counter(Gauge):
+    """Monotonic counter; same storage as Gauge, exposed with the counter type."""
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} counter"
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "stage_seconds", "Wall time of pipeline stages (parse, spacy, embed, transcription, ...).", ["stage"]
+)
+PROVIDER_CALL_SECONDS = Histogram(
+    "provider_call_seconds", "Wall time of calls that reach an LLM or embedding provider.", ["call", "provider", "model"]
+)
+REQUEST_SECONDS = Histogram(
+    "request_seconds", "HTTP request latency by route and status.", ["route", "method", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "requests_in_flight", "Requests currently being handled (queued or running) per route.", ["route"]
+)
+
+_METRICS = [STAGE_SECONDS, PROVIDER_CALL_SECONDS, REQUEST_SECONDS, REQUESTS_IN_FLIGHT]
+
+# Modules with their own counters (LLM cache, token usage, LRU caches)
+# register a callable returning exposition lines.
+_collectors: List[Callable[[], Iterable[str]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[str]]) -> None:
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            lines.extend(collector())
+        except Exception:
+            logger.exception("metrics collector %r failed", collector)
+    return "\n".join(lines) + "\n"
+
+# ---------- Timers ---------- #
+
+@contextmanager
+def _span(name: str, attributes: Optional[Dict[str, str]] = None):
+    if _tracer is None:
+        yield
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+@contextmanager
+def stage(name: str):
+    """Times a pipeline stage into STAGE_SECONDS (and an OTel span)."""
+    if not METRICS_ENABLED and _tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        with _span(name):
+            yield
+    finally:
+        if METRICS_ENABLED:
+            STAGE_SECONDS.observe(time.perf_counter() - start, name)
+
+
+def timed(stage_name: str):
+    """Decorator form of stage(), for plain and coroutine functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(stage_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def provider_call(call: str, provider: str, model: Optional[str]):
+    """Times one provider round-trip into PROVIDER_CALL_SECONDS."""
+    if not METRICS_ENABLED and _tracer is None:
+        yield
+        return
+    model = model or "unknown"
+    start = time.perf_counter()
+    try:
+        with _span(f"provider.{call}", {"provider": provider, "model": model}):
+            yield
+    finally:
+        if METRICS_ENABLED:
+            PROVIDER_CALL_SECONDS.observe(time.perf_counter() - start, call, provider, model)
+
+# ---------- HTTP Middleware ---------- #
+
+def _route_template(request) -> str:
+    """Route path ("/api/gap-analyzer") rather than the raw URL, so labels stay bounded."""
+    from starlette.routing import Match
+
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+async def metrics_middleware(request, call_next):
+    """Request latency and in-flight (queued or running) requests per route."""
+    if not METRICS_ENABLED:
+        return await call_next(request)
+
+    route = _route_template(request)
+    REQUESTS_IN_FLIGHT.inc(route)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec(route)
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method, str(status))
@@ -1,34 +1,113 @@
-import fitz  # PyMuPDF
-import docx
 import os
+from typing import Dict
+from services.metrics import timed
+from services.document_layout import build_document
 
-def extract_text_from_pdf(file_path: str) -> str:
+# PyMuPDF span flag for bold text
+_BOLD = 16
+
+def parse_pdf(file_path: str) -> Dict:
     """
-    Extract text from a PDF file.
+    Parse a PDF into a structured document (see document_layout) in one
+    get_text("dict") pass per page. Its "text" is exactly what
+    page.get_text() would give.
     """
-    text = ""
+    import fitz  # PyMuPDF
+    text_parts = []
+    lines = []
     with fitz.open(file_path) as doc:
-        for page in doc:
-            text += page.get_text()
-    return text.strip()
+        for page_no, page in enumerate(doc):
+            for block in page.get_text("dict")["blocks"]:
+                if block["type"] != 0:  # image block
+                    continue
+                block_id = (page_no, block["number"])
+                for line in block["lines"]:
+                    spans = line["spans"]
+                    line_text = "".join(span["text"] for span in spans)
+                    text_parts.append(line_text + "\n")
+                    styled = [span for span in spans if span["text"].strip()]
+                    lines.append({
+                        "text": line_text,
+                        "size": max((span["size"] for span in styled), default=None),
+                        "bold": bool(styled) and all(span["flags"] & _BOLD or "Bold" in span["font"] for span in styled),
+                        "page": page_no,
+                        "block": block_id,
+                    })
+    return build_document("".join(text_parts).strip(), lines)
 
-def extract_text_from_docx(file_path: str) -> str:
+def parse_docx(file_path: str) -> Dict:
     """
-    Extract text from a DOCX file.
+    Parse a DOCX into a structured document; heading styles mark headings,
+    sizes and weights come from the runs (or the paragraph style).
     """
+    import docx
     doc = docx.Document(file_path)
-    return "\n".join([p.text for p in doc.paragraphs]).strip()
 
-def extract_text(file_path: str) -> str:
-    """
-    Determine file type and extract text accordingly.
-    """
+    # resolving paragraph.style searches the styles part every time, so
+    # each style is resolved once: style id -> (name, size, bold)
+    styles = {}
+
+    def style_of(p):
+        style_id = p._p.style
+        if style_id not in styles:
+            style = p.style
+            font = style.font if style is not None else None
+            styles[style_id] = (
+                style.name if style is not None else "",
+                font.size.pt if font is not None and font.size is not None else None,
+                bool(font is not None and font.bold),
+            )
+        return styles[style_id]
+
+    lines = []
+    for i, p in enumerate(doc.paragraphs):
+        style_name, style_size, style_bold = style_of(p)
+        runs = [r for r in p.runs if r.text.strip()]
+        sizes = [r.font.size.pt for r in runs if r.font.size is not None]
+        lines.append({
+            "text": p.text,
+            "size": max(sizes) if sizes else style_size,
+            "bold": bool(runs) and all(r.bold or (r.bold is None and style_bold) for r in runs),
+            "page": 0,
+            "block": i,
+            "heading": style_name.startswith("Heading") or style_name == "Title",
+        })
+    return build_document("\n".join(line["text"] for line in lines).strip(), lines)
+
+def parse_document(file_path: str) -> Dict:
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
 
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return parse_pdf(file_path)
     elif ext == ".docx":
-        return extract_text_from_docx(file_path)
+        return parse_docx(file_path)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
+
+def extract_text_from_pdf(file_path: str) -> str:
+    """
+    Extract text from a PDF file.
+    """
+    return parse_pdf(file_path)["text"]
+
+def extract_text_from_docx(file_path: str) -> str:
+    """
+    Extract text from a DOCX file.
+    """
+    return parse_docx(file_path)["text"]
+
+@timed("parse")
+def extract_document(file_path: str) -> Dict:
+    """
+    Parse a file into its structured document (see document_layout). Pass
+    it on to the stages that can use the layout; its "text" is what
+    extract_text returns.
+    """
+    return parse_document(file_path)
+
+def extract_text(file_path: str) -> str:
+    """
+    Determine file type and extract text accordingly.
+    """
+    return extract_document(file_path)["text"]
@@ -0,0 +1,409 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import random
+import pstats
+import hashlib
+import inspect
+import cProfile
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Opt-in request profiling. Two triggers:
+# - sampled: PROFILE_SAMPLE_RATE of requests run under cProfile + tracemalloc
+# - slow: every other request runs under a low-overhead stack sampler and is
+#   kept only when it takes at least PROFILE_SLOW_THRESHOLD seconds
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.0"))
+PROFILE_SLOW_THRESHOLD = float(os.getenv("PROFILE_SLOW_THRESHOLD", "0"))  # 0 = off
+PROFILE_SAMPLER_INTERVAL = float(os.getenv("PROFILE_SAMPLER_INTERVAL", "0.01"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "profiles"))
+PROFILE_MAX_RECORDS = int(os.getenv("PROFILE_MAX_RECORDS", "200"))
+# Request bodies (resumes, JDs) are stored next to the profile for replay,
+# with every *_api_key field redacted; they still hold candidates' personal
+# data, so this is opt-in
+PROFILE_STORE_INPUTS = os.getenv("PROFILE_STORE_INPUTS", "0") == "1"
+PROFILE_TOP_N = 40
+
+# Only one request is profiled at a time: cProfile and the stack sampler
+# both attribute work per thread, and async requests share the loop thread.
+_profile_lock = threading.Lock()
+
+# The profile of the current request, seen by the worker threads that run
+# its sync endpoint (the threadpool copies the request's context)
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+# ---------- Stack Sampler ---------- #
+
+class StackSampler:
+    """
+    Samples the Python stacks of a set of threads every `interval` seconds
+    from a background thread and counts collapsed stacks ("a;b;c" -> samples).
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLER_INTERVAL):
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def add_thread(self, thread_id: int) -> None:
+        self.thread_ids = self.thread_ids | {thread_id}
+
+    def remove_thread(self, thread_id: int) -> None:
+        self.thread_ids = self.thread_ids - {thread_id}
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def top_functions(self, n: int = PROFILE_TOP_N) -> List[Dict]:
+        """Leaf-frame share of samples, the sampling analogue of tottime."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = max(1, sum(leaves.values()))
+        return [
+            {"frame": frame, "samples": count, "share": round(count / total, 4)}
+            for frame, count in leaves.most_common(n)
+        ]
+
+# ---------- Sessions ---------- #
+
+class ProfileSession:
+    """
+    One request's profile: a cProfile per thread that ran part of it (the
+    event-loop thread plus threadpool workers), or one sampler over all of
+    those threads.
+    """
+
+    def __init__(self, cpu: bool, sampler: Optional[StackSampler] = None):
+        self.cpu = cpu
+        self.sampler = sampler
+        self.loop_thread = threading.get_ident()
+        self.profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def new_profiler(self) -> cProfile.Profile:
+        profiler = cProfile.Profile()
+        with self._lock:
+            self.profilers.append(profiler)
+        return profiler
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            profilers = list(self.profilers)
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+
+@contextmanager
+def profile_session(cpu: bool = True, sampler: Optional[StackSampler] = None):
+    """Profiles the current thread and every worker thread that joins via profile_thread()."""
+    session = ProfileSession(cpu, sampler)
+    token = _session.set(session)
+    profiler = session.new_profiler() if cpu else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield session
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _session.reset(token)
+
+
+@contextmanager
+def profile_thread():
+    """Joins the current request's profile from a worker thread (no-op when not profiled)."""
+    session = _session.get()
+    thread_id = threading.get_ident()
+    if session is None or thread_id == session.loop_thread:
+        yield
+        return
+
+    profiler = session.new_profiler() if session.cpu else None
+    if session.sampler is not None:
+        session.sampler.add_thread(thread_id)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if session.sampler is not None:
+            session.sampler.remove_thread(thread_id)
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose sync endpoints, run in the threadpool, join the request's profile."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _in_profile_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _in_profile_thread(endpoint):
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with profile_thread():
+            return endpoint(*args, **kwargs)
+    return wrapper
+
+# ---------- Redaction ---------- #
+
+# Provider credentials arrive as openai_api_key, gemini_api_key, ... in JSON
+# bodies, form fields and (rarely) the query string. Values are replaced, not
+# dropped, so a replay against the recorded stand-ins still passes the
+# endpoints' "key required" checks.
+REDACTED = "REDACTED"
+_SECRET_FIELD = re.compile(r"_api_key$")
+_PART_NAME = re.compile(rb'\bname="([^"]*)"', re.IGNORECASE)
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+
+def _is_secret(name) -> bool:
+    return isinstance(name, str) and _SECRET_FIELD.search(name) is not None
+
+
+def _redact_json(value):
+    if isinstance(value, dict):
+        return {
+            key: (REDACTED if item is not None else None) if _is_secret(key) else _redact_json(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    return value
+
+
+def redact_query(query: str) -> str:
+    pairs = parse_qsl(query, keep_blank_values=True)
+    if not any(_is_secret(name) for name, _ in pairs):
+        return query
+    return urlencode([(name, REDACTED if _is_secret(name) else value) for name, value in pairs])
+
+
+def _redact_multipart(body: bytes, content_type: str) -> Optional[bytes]:
+    match = _BOUNDARY.search(content_type)
+    if match is None:
+        return None
+    delimiter = b"--" + match.group(1).encode("latin-1")
+    parts = body.split(delimiter)
+    for i, part in enumerate(parts[1:], start=1):
+        head, sep, content = part.partition(b"\r\n\r\n")
+        if not sep:
+            continue
+        name = _PART_NAME.search(head)
+        if name is not None and _is_secret(name.group(1).decode("latin-1")):
+            ending = b"\r\n" if content.endswith(b"\r\n") else b""
+            parts[i] = head + sep + REDACTED.encode() + ending
+    return delimiter.join(parts)
+
+
+def redact_body(body: bytes, content_type: str) -> Optional[bytes]:
+    """
+    `body` with every *_api_key field's value replaced by REDACTED, for JSON,
+    multipart and urlencoded bodies. None when the body cannot be parsed,
+    so it is not stored.
+    """
+    if not body:
+        return body
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "multipart/form-data":
+        return _redact_multipart(body, content_type)
+    if media_type == "application/x-www-form-urlencoded":
+        try:
+            return redact_query(body.decode("utf-8")).encode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if media_type.endswith("json"):
+        try:
+            return json.dumps(_redact_json(json.loads(body))).encode("utf-8")
+        except ValueError:
+            return None
+    return None
+
+# ---------- Storage ---------- #
+
+def input_digest(method: str, path: str, query: str, body: bytes) -> str:
+    h = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query.encode(), body):
+        h.update(part)
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _prune(directory: str, keep: int) -> None:
+    records = sorted(
+        (f for f in os.listdir(directory) if f.endswith(".json")),
+        key=lambda f: os.path.getmtime(os.path.join(directory, f))
+    )
+    for name in records[:max(0, len(records) - keep)]:
+        stem = name[:-len(".json")]
+        for suffix in (".json", ".prof", ".folded", ".body"):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def store_profile(
+    record: Dict,
+    body: Optional[bytes],
+    stats: Optional[pstats.Stats] = None,
+    sampler: Optional[StackSampler] = None,
+    allocations: Optional[List[Dict]] = None
+) -> str:
+    """
+    Writes <stem>.json (summary) plus <stem>.prof (pstats dump, for snakeviz
+    or pstats), <stem>.folded (collapsed stacks, for flamegraph tools) and
+    <stem>.body (request input, already redacted) when one is given.
+    Returns the stem path.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{int(record['timestamp'])}_{record['digest'][:16]}")
+
+    if stats is not None:
+        stats.dump_stats(stem + ".prof")
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        record["cpu_top"] = out.getvalue()
+
+    if sampler is not None:
+        with open(stem + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        record["cpu_top"] = sampler.top_functions()
+
+    if allocations is not None:
+        record["allocations_top"] = allocations
+
+    if body is not None:
+        with open(stem + ".body", "wb") as f:
+            f.write(body)
+
+    with open(stem + ".json", "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+
+    _prune(PROFILE_DIR, PROFILE_MAX_RECORDS)
+    return stem
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, n: int = PROFILE_TOP_N) -> List[Dict]:
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]).statistics("lineno")
+    return [
+        {"location": str(stat.traceback[0]), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in stats[:n]
+    ]
+
+# ---------- Middleware ---------- #
+
+async def profiling_middleware(request, call_next):
+    """
+    Profiles sampled or slow requests and stores the profile together with
+    the request's input digest (and, opt-in, its redacted body) under
+    PROFILE_DIR.
+    """
+    sampled = PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+    watch_slow = PROFILE_SLOW_THRESHOLD > 0
+
+    if not (sampled or watch_slow) or not _profile_lock.acquire(blocking=False):
+        return await call_next(request)
+
+    sampler = None
+    started_tracemalloc = False
+    try:
+        body = await request.body()
+
+        if sampled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracemalloc = True
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            with profile_session(cpu=sampled, sampler=sampler) as session:
+                response = await call_next(request)
+            status = response.status_code
+        finally:
+            elapsed = time.perf_counter() - start
+            if sampler is not None:
+                sampler.stop()
+
+        allocations = None
+        if started_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            allocations = _top_allocations(tracemalloc.take_snapshot())
+            allocations.insert(0, {"current_kb": round(current / 1024, 1), "peak_kb": round(peak / 1024, 1)})
+
+        if sampled or elapsed >= PROFILE_SLOW_THRESHOLD:
+            # the digest covers the raw input; what is stored is redacted
+            content_type = request.headers.get("content-type", "")
+            record = {
+                "digest": input_digest(request.method, request.url.path, request.url.query, body),
+                "method": request.method,
+                "path": request.url.path,
+                "query": redact_query(request.url.query),
+                "content_type": content_type,
+                "status": status,
+                "elapsed_seconds": round(elapsed, 4),
+                "trigger": "sampled" if sampled else "slow",
+                "timestamp": time.time(),
+            }
+            try:
+                stored = redact_body(body, content_type) if PROFILE_STORE_INPUTS else None
+                stem = store_profile(record, stored, session.stats(), sampler, allocations)
+                logger.info("profiled %s %s in %.2fs -> %s", request.method, request.url.path, elapsed, stem)
+            except OSError:
+                logger.exception("could not store profile for %s", request.url.path)
+
+        return response
+    finally:
+        if started_tracemalloc:
+            tracemalloc.stop()
+        _profile_lock.release()
@@ -0,0 +1,187 @@
+import os
+import re
+import logging
+import threading
+from typing import Dict, Optional
+from services.metrics import METRIC_PREFIX, format_sample, register_collector
+
+logger = logging.getLogger(__name__)
+
+# Input-token budget for a whole prompt; PROMPT_TOKEN_BUDGET_<PROVIDER> overrides per provider
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+TRUNCATION_MARKER = "\n[...truncated...]"
+
+# ---------- Token Counting ---------- #
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _tiktoken_encoding():
+    """cl100k encoder if tiktoken is available (it ships with langchain-openai)."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str, provider: str = "openai") -> int:
+    """
+    Exact for OpenAI (tiktoken), ~4 characters per token for the other
+    providers, whose tokenizers are not available locally.
+    """
+    encoding = _tiktoken_encoding() if provider == "openai" else None
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def token_budget(provider: str) -> int:
+    return int(os.getenv(f"PROMPT_TOKEN_BUDGET_{provider.upper()}", PROMPT_TOKEN_BUDGET))
+
+# ---------- Compression ---------- #
+
+# explicit page markers only ("Page 2", "Page 2 of 3", "2 of 3", "- 2 -"); a
+# bare number may be content, e.g. a "2019" line in an experience entry
+_PAGE_NUMBER = re.compile(
+    r"^\s*(?:page\s*\d+(?:\s*of\s*\d+)?|\d+\s*of\s*\d+|[-\u2013\u2014]\s*\d+\s*[-\u2013\u2014])\s*$",
+    re.IGNORECASE
+)
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0]+")
+
+
+def compress_text(text: str) -> str:
+    """
+    Cheap cleanup before prompting: collapses runs of spaces, drops page
+    number lines and exact repeated lines (headers/footers), and keeps at
+    most one blank line between paragraphs.
+    """
+    seen = set()
+    lines = []
+    blank = False
+
+    for raw in text.splitlines():
+        line = _INLINE_SPACE.sub(" ", raw).strip()
+
+        if not line:
+            if lines and not blank:
+                lines.append("")
+            blank = True
+            continue
+
+        if _PAGE_NUMBER.match(line):
+            continue
+
+        key = line.lower()
+        if key in seen and len(line) > 2:
+            continue
+        seen.add(key)
+
+        lines.append(line)
+        blank = False
+
+    return "\n".join(lines).strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int, provider: str = "openai") -> str:
+    if count_tokens(text, provider) <= max_tokens:
+        return text
+    max_tokens -= count_tokens(TRUNCATION_MARKER, provider)
+    if max_tokens <= 0:
+        return ""
+
+    encoding = _tiktoken_encoding() if provider == "openai" else None
+    if encoding is not None:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        head = text[:max_tokens * 4]
+
+    # cut back to a line boundary when one is reasonably close
+    cut = head.rfind("\n")
+    if cut > len(head) * 0.8:
+        head = head[:cut]
+
+    return head + TRUNCATION_MARKER
+
+# ---------- Budget Fitting ---------- #
+
+def fit_to_budget(
+    overhead: str,
+    sections: Dict[str, str],
+    provider: str,
+    priorities: Optional[Dict[str, int]] = None,
+    budget: Optional[int] = None,
+    compress: bool = True
+) -> Dict[str, str]:
+    """
+    Compress every section, then truncate sections lowest priority first
+    until `overhead` (the fixed instruction text) plus all sections fit the
+    token budget. Returns the fitted section texts.
+
+    `compress=False` keeps the texts as they are (only truncating), for
+    prompts that judge the layout itself.
+    """
+    budget = token_budget(provider) if budget is None else budget
+    priorities = priorities or {}
+
+    fitted = {name: compress_text(text or "") if compress else (text or "") for name, text in sections.items()}
+    sizes = {name: count_tokens(text, provider) for name, text in fitted.items()}
+
+    overflow = count_tokens(overhead, provider) + sum(sizes.values()) - budget
+
+    for name in sorted(fitted, key=lambda n: priorities.get(n, 0)):
+        if overflow <= 0:
+            break
+        keep = max(0, sizes[name] - overflow)
+        fitted[name] = truncate_to_tokens(fitted[name], keep, provider)
+        overflow -= sizes[name] - count_tokens(fitted[name], provider)
+
+    return fitted
+
+# ---------- Usage Reporting ---------- #
+
+# (call, provider) -> {"calls", "tokens_in", "tokens_out"}
+TOKEN_USAGE: Dict[tuple, Dict[str, int]] = {}
+_usage_lock = threading.Lock()
+
+
+def record_llm_call(call: str, provider: str, prompt: str, response: str) -> Dict[str, int]:
+    """Counts tokens in/out for one LLM call, logs them and adds them to TOKEN_USAGE."""
+    usage = {
+        "tokens_in": count_tokens(prompt, provider),
+        "tokens_out": count_tokens(response or "", provider),
+    }
+
+    with _usage_lock:
+        totals = TOKEN_USAGE.setdefault((call, provider), {"calls": 0, "tokens_in": 0, "tokens_out": 0})
+        totals["calls"] += 1
+        totals["tokens_in"] += usage["tokens_in"]
+        totals["tokens_out"] += usage["tokens_out"]
+
+    logger.info("llm call=%s provider=%s tokens_in=%d tokens_out=%d", call, provider, usage["tokens_in"], usage["tokens_out"])
+    return usage
+
+
+def _render_token_usage():
+    lines = []
+    with _usage_lock:
+        snapshot = sorted((key, dict(totals)) for key, totals in TOKEN_USAGE.items())
+    for field, help_text in (
+        ("calls", "LLM calls that reached the provider."),
+        ("tokens_in", "Prompt tokens sent (estimated for non-OpenAI providers)."),
+        ("tokens_out", "Response tokens received (estimated for non-OpenAI providers)."),
+    ):
+        name = f"{METRIC_PREFIX}_llm_{field}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (call, provider), totals in snapshot:
+            lines.append(format_sample(name, {"call": call, "provider": provider}, totals[field]))
+    return lines
+
+
+register_collector(_render_token_usage)
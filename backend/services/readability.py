@@ -1,67 +1,43 @@
-import re
+import asyncio
 from typing import Dict
-from fuzzywuzzy import fuzz
-from services.llm_utils import get_llm
+from services.llm_utils import get_llm, MODEL_MAP, LLM_TEMPERATURE, LOCAL_MODEL
+from services.local_provider import local_readability_feedback
+from services.llm_cache import acached_llm_call
+from services.prompt_builder import fit_to_budget
+from services.metrics import timed
+from services.async_runtime import run_cpu, run_sync
+# rule checks live in readability_rules (no LLM imports, so batch worker processes stay light)
+from services.readability_rules import (
+    batch_readability_scores, calculate_readability_score, check_grammar, detect_sections, resume_sections
+)
 
-# --- Section keywords mapping for flexible detection ---
-SECTION_KEYWORDS = {
-    "contact_info": ["contact", "email", "phone", "address", "mobile"],
-    "summary": ["summary", "objective", "profile", "overview"],
-    "work_experience": ["experience", "employment", "professional", "projects", "roles"],
-    "education": ["education", "degree", "university", "college", "school"],
-    "skills": ["skills", "technologies", "tools", "competencies"]
-}
-
-# --- Grammar / syntax checks ---
-def check_grammar(text: str) -> Dict:
-    spelling_errors = len(re.findall(r'\bteh\b|\brecieve\b|\bmanagment\b', text.lower()))
-    punctuation_issues = len(re.findall(r'[^.!?]\n', text))
-    return {
-        "spelling_errors": spelling_errors,
-        "punctuation_issues": punctuation_issues
-    }
-
-# --- Section detection using fuzzy matching ---
-def detect_sections(text: str) -> Dict[str, bool]:
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    detected = {}
-    for section, keywords in SECTION_KEYWORDS.items():
-        detected[section] = any(
-            fuzz.partial_ratio(line.lower(), kw.lower()) > 70 or kw.lower() in line.lower()
-            for line in lines
-            for kw in keywords
-        )
-    return detected
-
-# --- Readability score calculation ---
-def calculate_readability_score(resume_text: str) -> Dict:
-    sections_detected = detect_sections(resume_text)
-    grammar_issues = check_grammar(resume_text)
-
-    total_lines = len(resume_text.split("\n"))
-    non_empty_lines = len([l for l in resume_text.split("\n") if l.strip()])
-    blank_ratio = (total_lines - non_empty_lines) / max(1, total_lines)
-    parsability_score = max(0, 100 - int(blank_ratio * 100))
+# --- Optional LLM feedback ---
+READABILITY_PROMPT = """
+    You are a resume expert. Evaluate the following resume for readability, clarity, and formatting.
+    Suggest improvements for:
+    - Section completeness (Contact Info, Summary, Work Experience, Education, Skills)
+    - Grammar, punctuation, and sentence clarity
+    - Overall text layout and structure
 
-    section_score = int((sum(sections_detected.values()) / len(sections_detected)) * 100)
-    grammar_penalty = min(20, grammar_issues["spelling_errors"] * 5 + grammar_issues["punctuation_issues"] * 3)
-    readability_score = max(0, int(0.4 * parsability_score + 0.4 * section_score + 0.2 * (100 - grammar_penalty)))
+    Resume Text:
+    {resume_text}
 
-    return {
-        "readability_score": readability_score,
-        "sections_detected": sections_detected,
-        "grammar_issues": grammar_issues
-    }
+    Provide clear actionable suggestions for improvement in 3-5 bullet points.
+    """
 
-# --- Optional LLM feedback ---
-def get_readability_feedback(
+@timed("readability_feedback")
+async def aget_readability_feedback(
     resume_text: str,
     model_name: str,
     openai_api_key: str = None,
     gemini_api_key: str = None,
     mistral_api_key: str = None,   # ✅ Added Mistral
-    groq_api_key: str = None
+    groq_api_key: str = None,
+    document: Dict = None
 ) -> str:
+    if model_name == LOCAL_MODEL:
+        return local_readability_feedback(await run_cpu(calculate_readability_score, resume_text, None, document))
+
     llm = get_llm(
         model_name,
         openai_api_key=openai_api_key,
@@ -70,40 +46,72 @@ def get_readability_feedback(
         groq_api_key=groq_api_key
     )
 
-    prompt = f"""
-    You are a resume expert. Evaluate the following resume for readability, clarity, and formatting.
-    Suggest improvements for:
-    - Section completeness (Contact Info, Summary, Work Experience, Education, Skills)
-    - Grammar, punctuation, and sentence clarity
-    - Overall text layout and structure
-
-    Resume Text:
-    {resume_text}
+    # the LLM judges blank lines and layout, so the resume is not compressed
+    fitted = fit_to_budget(
+        READABILITY_PROMPT.format(resume_text=""), {"resume_text": resume_text}, provider=model_name, compress=False
+    )
+    prompt = READABILITY_PROMPT.format(resume_text=fitted["resume_text"])
 
-    Provide clear actionable suggestions for improvement in 3-5 bullet points.
-    """
-    response = llm.predict(prompt)
+    response = await acached_llm_call(
+        "readability_feedback", model_name, MODEL_MAP[model_name], LLM_TEMPERATURE, prompt,
+        lambda: llm.apredict(prompt),
+        credentials=(openai_api_key, gemini_api_key, mistral_api_key, groq_api_key),
+        semantic_text=fitted["resume_text"]
+    )
     return response.strip()
 
+
+def get_readability_feedback(
+    resume_text: str,
+    model_name: str,
+    openai_api_key: str = None,
+    gemini_api_key: str = None,
+    mistral_api_key: str = None,
+    groq_api_key: str = None,
+    document: Dict = None
+) -> str:
+    return run_sync(aget_readability_feedback(
+        resume_text, model_name, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key, document
+    ))
+
 # --- Combined function for gap analyzer ---
-def calculate_readability(
+async def acalculate_readability(
     resume_text: str,
     model_name: str,
     openai_api_key: str = None,
     gemini_api_key: str = None,
     mistral_api_key: str = None,  # ✅ Added Mistral
-    groq_api_key: str = None
+    groq_api_key: str = None,
+    document: Dict = None
 ) -> Dict:
-    rules_result = calculate_readability_score(resume_text)
-    llm_feedback = get_readability_feedback(
-        resume_text,
-        model_name,
-        openai_api_key=openai_api_key,
-        gemini_api_key=gemini_api_key,
-        mistral_api_key=mistral_api_key,  # ✅ Pass Mistral key
-        groq_api_key=groq_api_key
+    # rule checks run in the offload pool while the LLM call is in flight
+    rules_result, llm_feedback = await asyncio.gather(
+        run_cpu(calculate_readability_score, resume_text, None, document),
+        aget_readability_feedback(
+            resume_text,
+            model_name,
+            openai_api_key=openai_api_key,
+            gemini_api_key=gemini_api_key,
+            mistral_api_key=mistral_api_key,  # ✅ Pass Mistral key
+            groq_api_key=groq_api_key,
+            document=document
+        )
     )
     return {
         **rules_result,
         "llm_feedback": llm_feedback
     }
+
+
+def calculate_readability(
+    resume_text: str,
+    model_name: str,
+    openai_api_key: str = None,
+    gemini_api_key: str = None,
+    mistral_api_key: str = None,
+    groq_api_key: str = None,
+    document: Dict = None
+) -> Dict:
+    return run_sync(acalculate_readability(
+        resume_text, model_name, openai_api_key, gemini_api_key, mistral_api_key, groq_api_key, document
+    ))
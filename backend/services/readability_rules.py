@@ -0,0 +1,297 @@
+import os
+import re
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from services.metrics import timed
+from services.document_layout import SECTION_KEYWORDS, document_sections, has_sections, layout_for
+
+# Rule-based readability for one resume or many. Per document, one split
+# into lines gives the line features (blank ratio, punctuation endings,
+# misspellings); sections are found by exact keyword search first, and only
+# the sections still missing get the fuzzy line scan. That scan is
+# vectorized over a whole batch: a keyword can only fuzzy-match a line that
+# has a window holding enough of the keyword's letters, which NumPy checks
+# for every line and keyword at once, so fuzz.partial_ratio only runs on
+# the few pairs that pass. Scores are identical to the per-line scan.
+
+# Worker processes for batches of READABILITY_PROCESS_MIN_DOCS or more (0: in-process)
+READABILITY_PROCESSES = int(os.getenv("READABILITY_PROCESSES", "0"))
+READABILITY_PROCESS_MIN_DOCS = int(os.getenv("READABILITY_PROCESS_MIN_DOCS", "2000"))
+# Characters per vectorized section scan; bounds its memory
+READABILITY_SCAN_CHARS = int(os.getenv("READABILITY_SCAN_CHARS", "250000"))
+
+SPELLING_PATTERN = re.compile(r'\bteh\b|\brecieve\b|\bmanagment\b')
+PUNCTUATION_PATTERN = re.compile(r'[^.!?]\n')
+
+_SECTIONS = list(SECTION_KEYWORDS)
+_SECTION_PATTERNS = [re.compile("|".join(re.escape(kw.lower()) for kw in SECTION_KEYWORDS[s])) for s in _SECTIONS]
+
+# fuzz.partial_ratio(line, kw) > 70 needs a ratio 2M / (len(shorter) +
+# len(window)) of more than 0.705 between the shorter string and some
+# window of the longer one (M: matching characters). M is at most the
+# number of the keyword's letters in the window, which bounds the ratio
+# from counts alone.
+_MIN_RATIO = 0.705
+
+_ALPHABET = sorted({c for keywords in SECTION_KEYWORDS.values() for kw in keywords for c in kw.lower()})
+_OTHER = len(_ALPHABET)
+_CHAR_CODES = np.full(128, _OTHER, dtype=np.int8)
+for _i, _c in enumerate(_ALPHABET):
+    _CHAR_CODES[ord(_c)] = _i
+
+# (section index, keyword, letter codes, counts of each letter)
+_KEYWORDS = []
+for _s, _section in enumerate(_SECTIONS):
+    for _kw in SECTION_KEYWORDS[_section]:
+        _kw = _kw.lower()
+        _letters = sorted(set(_kw))
+        _KEYWORDS.append((
+            _s, _kw,
+            np.array([_ALPHABET.index(c) for c in _letters]),
+            np.array([_kw.count(c) for c in _letters]),
+        ))
+
+# ---------- Line Features ---------- #
+
+def check_grammar(text: str) -> Dict:
+    spelling_errors = len(SPELLING_PATTERN.findall(text.lower()))
+    punctuation_issues = len(PUNCTUATION_PATTERN.findall(text))
+    return {
+        "spelling_errors": spelling_errors,
+        "punctuation_issues": punctuation_issues
+    }
+
+
+def _line_features(text: str):
+    """
+    (total lines, non-empty lines, punctuation issues, lowered non-empty
+    lines, their text joined by newlines) from one split of `text`.
+    """
+    lines = text.split("\n")
+    lowered = [l.lower() for l in (l.strip() for l in lines) if l]
+    return len(lines), len(lowered), len(PUNCTUATION_PATTERN.findall(text)), lowered, "\n".join(lowered)
+
+# ---------- Section Scan ---------- #
+
+def _char_codes(joined: str) -> np.ndarray:
+    """Alphabet index of every character, _OTHER for the rest (non-ASCII too)."""
+    points = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    return _CHAR_CODES[np.minimum(points, 127)]
+
+
+def _scan_sections(docs: List[List[str]], missing: np.ndarray) -> np.ndarray:
+    """
+    Fuzzy section detection over many documents' lowered lines, for the
+    (document, section) pairs flagged in `missing`. Returns which of them a
+    line matches with fuzz.partial_ratio > 70.
+    """
+    from fuzzywuzzy import fuzz
+    found = np.zeros_like(missing)
+    line_doc = np.array([d for d, lines in enumerate(docs) for _ in lines], dtype=np.int64)
+    if not len(line_doc):
+        return found
+    lines = [line for doc_lines in docs for line in doc_lines]
+    lengths = np.fromiter((len(line) for line in lines), dtype=np.int64, count=len(lines))
+
+    # line i spans [starts[i], starts[i] + lengths[i]) of the joined lines
+    codes = _char_codes("\n".join(lines))
+    starts = np.zeros(len(lines), dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=starts[1:])
+    ends = starts + lengths
+
+    # counts[c, p]: occurrences of letter c in codes[:p]
+    counts = np.zeros((_OTHER, len(codes) + 1), dtype=np.int32)
+    np.cumsum(codes[None, :] == np.arange(_OTHER, dtype=np.int8)[:, None], axis=1, out=counts[:, 1:])
+    line_counts = counts[:, ends] - counts[:, starts]
+
+    # each window start's line, and how far it is from that line's end
+    pos_line = np.repeat(np.arange(len(lines)), lengths + 1)
+    positions = np.arange(len(pos_line))
+    pos_left = ends[pos_line] - positions
+
+    for s, kw, letters, need in _KEYWORDS:
+        wanted = missing[line_doc, s] & ~found[line_doc, s]
+        if not wanted.any():
+            continue
+        k = len(kw)
+
+        # lines no longer than the keyword are the shorter side: with H of
+        # its letters in the line, M <= H and the ratio is at most 2H / (n + H)
+        short = wanted & (lengths <= k)
+        hits = np.minimum(line_counts[letters][:, short], need[:, None]).sum(axis=0)
+        passed = hits * (2 - _MIN_RATIO) >= _MIN_RATIO * lengths[short]
+        candidates = set(np.flatnonzero(short)[passed].tolist())
+
+        # longer lines: the keyword against the window of (up to) k
+        # characters at each position, clipped at the line end
+        long_lines = wanted & (lengths > k)
+        if long_lines.any():
+            size = np.minimum(k, pos_left)
+            window = counts[letters][:, positions + size] - counts[letters][:, positions]
+            hits = np.minimum(window, need[:, None]).sum(axis=0)
+            passed = (2 * hits >= _MIN_RATIO * (k + size)) & long_lines[pos_line]
+            candidates.update(np.unique(pos_line[passed]).tolist())
+
+        for i in sorted(candidates):
+            d = line_doc[i]
+            if not found[d, s] and fuzz.partial_ratio(lines[i], kw) > 70:
+                found[d, s] = True
+
+    return found
+
+
+def _exact_sections(joined: str) -> List[bool]:
+    return [pattern.search(joined) is not None for pattern in _SECTION_PATTERNS]
+
+
+def detect_sections(text: str) -> Dict[str, bool]:
+    """
+    A section is present when a line contains one of its keywords or
+    fuzzy-matches one (fuzz.partial_ratio > 70).
+    """
+    _, _, _, lowered, joined = _line_features(text)
+    return _detect_many([lowered], [joined])[0]
+
+
+def _detect_many(lowered: List[List[str]], joined: List[str]) -> List[Dict[str, bool]]:
+    exact = np.array([_exact_sections(j) for j in joined], dtype=bool).reshape(len(joined), len(_SECTIONS))
+    detected = exact.copy()
+
+    # scan the documents that still miss a section, READABILITY_SCAN_CHARS at a time
+    pending = np.flatnonzero(~exact.all(axis=1))
+    batch, size = [], 0
+    for n, d in enumerate(pending):
+        batch.append(d)
+        size += len(joined[d])
+        if size >= READABILITY_SCAN_CHARS or n == len(pending) - 1:
+            detected[batch] |= _scan_sections([lowered[i] for i in batch], ~exact[batch])
+            batch, size = [], 0
+
+    return [dict(zip(_SECTIONS, row.tolist())) for row in detected]
+
+
+def _layout_sections(text: str, document: Optional[Dict]) -> Optional[Dict[str, bool]]:
+    document = layout_for(text, document)
+    return document_sections(document) if document is not None and has_sections(document) else None
+
+
+def resume_sections(text: str, document: Optional[Dict] = None) -> Dict[str, bool]:
+    """Sections from `document`'s layout (the file `text` was parsed from) when it has headings, else detect_sections."""
+    sections = _layout_sections(text, document)
+    return sections if sections is not None else detect_sections(text)
+
+# ---------- Scoring ---------- #
+
+def _scores(total_lines, non_empty_lines, section_counts, spelling_errors, punctuation_issues) -> np.ndarray:
+    """The readability formula over arrays of per-document features."""
+    total_lines = np.asarray(total_lines, dtype=np.int64)
+    blank_ratio = (total_lines - np.asarray(non_empty_lines, dtype=np.int64)) / np.maximum(1, total_lines)
+    parsability_score = np.maximum(0, 100 - np.trunc(blank_ratio * 100))
+
+    section_score = np.trunc((np.asarray(section_counts, dtype=np.int64) / len(_SECTIONS)) * 100)
+    grammar_penalty = np.minimum(
+        20, np.asarray(spelling_errors, dtype=np.int64) * 5 + np.asarray(punctuation_issues, dtype=np.int64) * 3
+    )
+    readability_score = np.maximum(0, np.trunc(0.4 * parsability_score + 0.4 * section_score + 0.2 * (100 - grammar_penalty)))
+    return readability_score.astype(np.int64)
+
+
+@timed("readability_rules")
+def calculate_readability_score(
+    resume_text: str,
+    sections_detected: Optional[Dict[str, bool]] = None,
+    document: Optional[Dict] = None
+) -> Dict:
+    total_lines, non_empty_lines, punctuation_issues, lowered, joined = _line_features(resume_text)
+    if sections_detected is None:
+        sections_detected = _layout_sections(resume_text, document)
+    if sections_detected is None:
+        sections_detected = _detect_many([lowered], [joined])[0]
+    grammar_issues = {
+        "spelling_errors": len(SPELLING_PATTERN.findall(joined)),
+        "punctuation_issues": punctuation_issues
+    }
+
+    blank_ratio = (total_lines - non_empty_lines) / max(1, total_lines)
+    parsability_score = max(0, 100 - int(blank_ratio * 100))
+
+    section_score = int((sum(sections_detected.values()) / len(sections_detected)) * 100)
+    grammar_penalty = min(20, grammar_issues["spelling_errors"] * 5 + grammar_issues["punctuation_issues"] * 3)
+    readability_score = max(0, int(0.4 * parsability_score + 0.4 * section_score + 0.2 * (100 - grammar_penalty)))
+
+    return {
+        "readability_score": readability_score,
+        "sections_detected": sections_detected,
+        "grammar_issues": grammar_issues
+    }
+
+# ---------- Batch ---------- #
+
+def _score_texts(texts: Sequence[str], sections: Sequence[Optional[Dict[str, bool]]]) -> List[Dict]:
+    features = [_line_features(text) for text in texts]
+    pending = [i for i, known in enumerate(sections) if known is None]
+    detected = list(sections)
+    for i, found in zip(pending, _detect_many([features[i][3] for i in pending], [features[i][4] for i in pending])):
+        detected[i] = found
+
+    spelling = [len(SPELLING_PATTERN.findall(f[4])) for f in features]
+    scores = _scores(
+        [f[0] for f in features],
+        [f[1] for f in features],
+        [sum(found.values()) for found in detected],
+        spelling,
+        [f[2] for f in features],
+    )
+    return [
+        {
+            "readability_score": int(score),
+            "sections_detected": found,
+            "grammar_issues": {"spelling_errors": misspelled, "punctuation_issues": f[2]},
+        }
+        for score, found, misspelled, f in zip(scores.tolist(), detected, spelling, features)
+    ]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None or _pool._max_workers != processes:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        # spawn: forking a server process with live threads is unsafe
+        _pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+@timed("readability_batch")
+def batch_readability_scores(
+    texts: Sequence[str],
+    processes: Optional[int] = None,
+    documents: Optional[Sequence[Optional[Dict]]] = None
+) -> List[Dict]:
+    """
+    calculate_readability_score for many resumes, in input order.
+    `documents[i]`, when given, is the parsed file of texts[i], whose layout
+    sections are read here; everything else is scored in vectorized
+    batches, split over `processes` (default READABILITY_PROCESSES) worker
+    processes when there are at least READABILITY_PROCESS_MIN_DOCS texts.
+    """
+    texts = list(texts)
+    documents = list(documents) if documents is not None else [None] * len(texts)
+    sections = [_layout_sections(text, document) for text, document in zip(texts, documents)]
+
+    processes = READABILITY_PROCESSES if processes is None else processes
+    if processes <= 1 or len(texts) < READABILITY_PROCESS_MIN_DOCS:
+        return _score_texts(texts, sections)
+
+    step = -(-len(texts) // (processes * 4))
+    parts = _get_pool(processes).map(
+        _score_texts,
+        [texts[i:i + step] for i in range(0, len(texts), step)],
+        [sections[i:i + step] for i in range(0, len(texts), step)],
+    )
+    return [result for part in parts for result in part]
@@ -0,0 +1,133 @@
+import os
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from typing import Any, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Second tier behind the named in-process LRU caches, shared by every worker
+# process on the host. Empty = process-local caches only (the default for a
+# single `uvicorn main:app`); serve.py sets it when running several workers.
+SHARED_CACHE_DIR = os.getenv("SHARED_CACHE_DIR", "")
+
+# Named caches backed by the shared tier: the ones whose misses cost a
+# provider call or a model pass. Cheap derived caches stay process-local.
+SHARED_CACHES = {
+    c.strip()
+    for c in os.getenv(
+        "SHARED_CACHES", "llm_responses,jd_skills,jd_vectors,chunk_vectors,block_skills,documents"
+    ).split(",")
+    if c.strip()
+}
+
+_PRUNE_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    ns TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    written_at REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+)
+"""
+
+# ---------- Store ---------- #
+
+class SharedCacheStore:
+    """
+    Cross-process key/value store in one SQLite file (WAL mode), so workers
+    share LLM responses, JD skills and embeddings instead of each paying the
+    cold miss.
+
+    Values are pickled; keys are stored by repr(), so they must be built from
+    str/int/tuple as every named cache key is. Each namespace holds at most
+    `max_rows` entries, oldest writes dropped first. Expiry uses wall-clock
+    time since monotonic clocks are per process. Errors (e.g. a locked
+    database under heavy write load) are logged and treated as misses.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._puts = 0
+        self._puts_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per thread and process; never reuse one across fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, ns: str, key: Hashable) -> Tuple[bool, Any]:
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires_at FROM entries WHERE ns = ? AND key = ?", (ns, repr(key))
+            ).fetchone()
+        except sqlite3.Error:
+            logger.warning("shared cache read failed (%s)", ns, exc_info=True)
+            return False, None
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def put(self, ns: str, key: Hashable, value: Any, ttl: Optional[float], max_rows: int) -> None:
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (ns, repr(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                 now + ttl if ttl is not None else None, now)
+            )
+            with self._puts_lock:
+                self._puts += 1
+                prune = self._puts % _PRUNE_EVERY == 0
+            if prune:
+                self._prune(conn, ns, max_rows, now)
+        except sqlite3.Error:
+            logger.warning("shared cache write failed (%s)", ns, exc_info=True)
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, ns: str, max_rows: int, now: float) -> None:
+        conn.execute("DELETE FROM entries WHERE ns = ? AND expires_at < ?", (ns, now))
+        conn.execute(
+            """
+            DELETE FROM entries WHERE ns = ? AND key IN (
+                SELECT key FROM entries WHERE ns = ? ORDER BY written_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (ns, ns, max_rows)
+        )
+
+    def clear(self, ns: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM entries WHERE ns = ?", (ns,))
+        except sqlite3.Error:
+            logger.warning("shared cache clear failed (%s)", ns, exc_info=True)
+
+
+_store: Optional[SharedCacheStore] = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store(cache_name: str) -> Optional[SharedCacheStore]:
+    """The shared store if `cache_name` should use it, else None."""
+    global _store
+    if not SHARED_CACHE_DIR or cache_name not in SHARED_CACHES:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SharedCacheStore(os.path.join(SHARED_CACHE_DIR, "caches.sqlite3"))
+        return _store
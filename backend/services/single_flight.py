@@ -0,0 +1,123 @@
+import os
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from services.metrics import Counter, register_collector
+
+# Coalesce concurrent identical calls (same stage, model, credentials and
+# input digest) into one computation whose result every caller receives.
+# Only calls that overlap in time are merged; nothing is kept once the
+# leader returns, that is what the caches are for. Keys of provider calls
+# carry a digest of the caller's API keys, so a call only ever runs through
+# (and fails with) the caller's own credentials.
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "1") == "1"
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Coalescable calls by group; role=follower calls reused an in-flight computation.",
+    ["group", "role"]
+)
+
+register_collector(SINGLE_FLIGHT_CALLS.render)
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of in-flight calls, across threads and event
+    loops. The first caller for a key (the leader) runs the function;
+    callers arriving while it runs wait for it and get its result, or its
+    exception. do() is for sync callers, ado() for coroutine functions;
+    both share the same in-flight table.
+
+    Results are handed to every caller as-is, so callers must not mutate
+    them (or the caller-facing function should return a copy).
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                SINGLE_FLIGHT_CALLS.inc(self.group, "follower")
+                return future, False
+            future = self._calls[key] = Future()
+        SINGLE_FLIGHT_CALLS.inc(self.group, "leader")
+        return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if not SINGLE_FLIGHT_ENABLED:
+            return fn(*args, **kwargs)
+
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        if not SINGLE_FLIGHT_ENABLED:
+            return await fn(*args, **kwargs)
+
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        # the computation runs as its own task, so a leader that is
+        # cancelled (client went away) does not fail its followers
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+
+        def done(task: asyncio.Task) -> None:
+            if task.cancelled():
+                self._finish(key, future, error=asyncio.CancelledError())
+            elif task.exception() is not None:
+                self._finish(key, future, error=task.exception())
+            else:
+                self._finish(key, future, task.result())
+
+        task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+# ---------- Digests ---------- #
+
+def text_digest(*parts: str) -> str:
+    """sha256 over one or more strings (NUL-separated, so part boundaries count)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def credential_digest(*credentials: Optional[str]) -> str:
+    """Short digest of the API keys a call runs with ("" when none), for flight keys."""
+    if not any(credentials):
+        return ""
+    return text_digest(*(credential or "" for credential in credentials))[:32]
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
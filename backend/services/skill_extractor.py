@@ -1,15 +1,38 @@
 import os
-import spacy
-from typing import Dict, Set
-from mistralai.client import MistralClient
-from openai import OpenAI
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
+import base64
+import asyncio
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import re
 import json
-
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+import hashlib
+from services.lru_cache import LRUCache
+from services.skill_matcher import SEMANTIC_SKILL_MATCHING, get_semantic_matcher
+from services.prompt_builder import fit_to_budget
+from services.llm_cache import acached_llm_call
+from services.llm_utils import MODEL_MAP, LOCAL_MODEL
+from services.metrics import stage, timed
+from services.single_flight import SingleFlight, credential_digest, text_digest
+from services.async_runtime import run_cpu, run_sync
+from services.text_normalization import normalize_skill, normalize_text
+from services.document_layout import body_text, layout_for
+
+# spaCy and its model load on first use (or in the pre-fork preload), not
+# at import
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded once."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 # Load curated skill list
 SKILLS_FILE = os.path.join(os.path.dirname(__file__), "skills_list.json")
@@ -23,18 +46,6 @@ with open(PARENT_SKILLS_FILE, "r", encoding="utf-8") as f:
 
 # ---------- Normalization ---------- #
 
-def normalize_skill(skill: str) -> str:
-    skill = skill.strip().lower()
-    skill = re.sub(r"\b\d+(\.\d+)?\b", "", skill)
-    skill = re.sub(r"[^a-z0-9\+\#\. ]", "", skill)
-    skill = re.sub(r"\s+", " ", skill).strip()
-
-    if skill.endswith("s") and len(skill) > 3:
-        skill = skill[:-1]
-
-    return skill
-
-
 NORMALIZED_WHITELIST = {normalize_skill(s): s for s in SKILL_WHITELIST}
 
 # ---------- Parent-child mapping ---------- #
@@ -50,6 +61,87 @@ for parent, children in PARENT_SKILL_MAP.items():
     for child in children:
         CHILD_TO_PARENT.setdefault(normalize_skill(child), set()).add(parent_norm)
 
+# ---------- Skill Ids & Bitsets ---------- #
+
+# Every whitelist skill gets an integer id: its column in skill bitsets
+SKILL_NORMS: List[str] = sorted(NORMALIZED_WHITELIST)
+SKILL_IDS: Dict[str, int] = {norm: i for i, norm in enumerate(SKILL_NORMS)}
+SKILL_NAMES: List[str] = [NORMALIZED_WHITELIST[norm] for norm in SKILL_NORMS]
+N_SKILLS = len(SKILL_NORMS)
+
+# Ids are positions in the sorted whitelist, so they change whenever
+# skills_list.json does; stored bitsets carry this digest of the id order
+# and are remapped (remap_bitset) when it differs
+SKILL_IDS_DIGEST = text_digest(*SKILL_NORMS)[:16]
+
+# whitelist display name -> id, so known names skip normalize_skill
+_NAME_IDS: Dict[str, int] = {s: SKILL_IDS[normalize_skill(s)] for s in SKILL_WHITELIST}
+
+# PARENT_MATRIX[c, p]: p is a whitelist parent of c (one level, as in expand_with_parents)
+PARENT_MATRIX = np.zeros((N_SKILLS, N_SKILLS), dtype=np.uint8)
+for child_norm, parent_norms in CHILD_TO_PARENT.items():
+    if child_norm in SKILL_IDS:
+        for parent_norm in parent_norms:
+            if parent_norm in SKILL_IDS:
+                PARENT_MATRIX[SKILL_IDS[child_norm], SKILL_IDS[parent_norm]] = 1
+
+
+def skill_id(skill: str) -> Optional[int]:
+    sid = _NAME_IDS.get(skill)
+    return sid if sid is not None else SKILL_IDS.get(normalize_skill(skill))
+
+
+def skills_to_bitset(skills: Iterable[str]) -> np.ndarray:
+    """Bool row over skill ids; skills outside the whitelist are ignored."""
+    bits = np.zeros(N_SKILLS, dtype=bool)
+    ids = [sid for sid in map(skill_id, skills) if sid is not None]
+    bits[ids] = True
+    return bits
+
+
+def norms_to_bitset(norms: Iterable[str]) -> np.ndarray:
+    """Like skills_to_bitset for already-normalized names (normalize_skill is not idempotent)."""
+    bits = np.zeros(N_SKILLS, dtype=bool)
+    ids = [SKILL_IDS[n] for n in norms if n in SKILL_IDS]
+    bits[ids] = True
+    return bits
+
+
+def bitset_to_skills(bits: np.ndarray) -> List[str]:
+    return sorted(SKILL_NAMES[i] for i in np.flatnonzero(bits))
+
+
+def expand_bitsets(skill_bits: np.ndarray, jd_norm_bits: np.ndarray) -> np.ndarray:
+    """
+    expand_with_parents on bitsets: adds each skill's parents that the JD
+    expects. Works on one row or an (n x N_SKILLS) matrix of rows, against
+    one JD row or a matrix of JD rows.
+    """
+    parents = (skill_bits.astype(np.uint8) @ PARENT_MATRIX) > 0
+    return skill_bits | (parents & jd_norm_bits)
+
+
+def pack_bitset(bits: np.ndarray) -> str:
+    """Compact text form of a skill bitset (a few dozen bytes) for storage."""
+    return base64.b64encode(np.packbits(bits).tobytes()).decode("ascii")
+
+
+def unpack_bitset(packed: str, count: int = N_SKILLS) -> np.ndarray:
+    """Inverse of pack_bitset for a bitset over `count` ids; raises ValueError on a length mismatch."""
+    raw = np.frombuffer(base64.b64decode(packed), dtype=np.uint8)
+    if len(raw) != (count + 7) // 8:
+        raise ValueError(f"Packed skill bitset holds {len(raw) * 8} bits, expected {count}.")
+    return np.unpackbits(raw, count=count).astype(bool)
+
+
+def remap_bitset(bits: np.ndarray, norms: List[str]) -> np.ndarray:
+    """
+    A bitset written with another whitelist (`norms`: its normalized skills
+    in id order) as a bitset over the current ids; skills no longer in the
+    whitelist are dropped.
+    """
+    return norms_to_bitset(norms[i] for i in np.flatnonzero(bits))
+
 # ---------- Mapping (FIXED) ---------- #
 
 def map_to_known_skill(norm: str):
@@ -68,8 +160,12 @@ def map_to_known_skill(norm: str):
 
 # ---------- Extraction ---------- #
 
-def extract_skills_spacy(text: str) -> Set[str]:
-    doc = nlp(text)
+def _skills_from_doc(doc, aliases: Optional[Dict[str, List[str]]] = None) -> Set[str]:
+    """
+    Whitelist skills among a parsed text's nouns and noun chunks. Skills
+    found only semantically are recorded in `aliases` (skill -> the
+    phrases that matched it), so the JD filter can see what the text said.
+    """
     raw = set()
 
     for token in doc:
@@ -81,19 +177,73 @@ def extract_skills_spacy(text: str) -> Set[str]:
             raw.add(chunk.text.strip())
 
     final = set()
+    unmapped = []
 
     for s in raw:
         norm = normalize_skill(s)
         mapped = map_to_known_skill(norm)
         if mapped:
             final.add(mapped)
+        elif norm:
+            unmapped.append(s)
+
+    # semantic fallback for aliases ("k8s", "Postgres") in one batched lookup
+    if SEMANTIC_SKILL_MATCHING and unmapped:
+        matches = get_semantic_matcher(SKILL_WHITELIST).match(unmapped)
+        final.update(matches.values())
+        if aliases is not None:
+            for phrase, skill in matches.items():
+                aliases.setdefault(skill, []).append(phrase)
 
     return final
 
 
-def extract_skills_llm(text: str, model: str, openai_key=None, groq_key=None, gemini_key=None) -> Set[str]:
+def spacy_input(text: str, document: Optional[Dict] = None) -> str:
+    """What spaCy reads: for text parsed from `document`, its body blocks without headings and contact lines."""
+    document = layout_for(text, document)
+    return body_text(document) if document is not None else text
+
+
+@timed("spacy")
+def extract_skills_spacy(text: str, document: Optional[Dict] = None, aliases: Optional[Dict[str, List[str]]] = None) -> Set[str]:
+    return _skills_from_doc(get_nlp()(spacy_input(text, document)), aliases)
+
+
+@timed("spacy_batch")
+def extract_skills_spacy_batch(
+    texts: List[str],
+    batch_size: int = 64,
+    aliases: Optional[List[Dict[str, List[str]]]] = None
+) -> List[Set[str]]:
+    """
+    extract_skills_spacy for many texts, parsed in batches by nlp.pipe;
+    `aliases` gets one dict per text.
+    """
+    results = []
+    for doc in get_nlp().pipe(texts, batch_size=batch_size):
+        found = {}
+        results.append(_skills_from_doc(doc, found))
+        if aliases is not None:
+            aliases.append(found)
+    return results
 
-    prompt = f"""
+
+# Longest skills first so multi-word skills win over their prefixes; the
+# optional trailing "s" mirrors the plural stripping in normalize_skill.
+WHITELIST_PATTERN = re.compile(
+    r"(?<![a-z0-9])("
+    + "|".join(re.escape(n) for n in sorted(NORMALIZED_WHITELIST, key=lambda n: (-len(n), n)) if n)
+    + r")s?(?![a-z0-9+#])"
+)
+
+
+def extract_skills_local(text: str) -> Set[str]:
+    """Whitelist skills mentioned verbatim in the text; the offline stand-in for the LLM pass."""
+    text_norm = normalize_text(text)
+    return {NORMALIZED_WHITELIST[m.group(1)] for m in WHITELIST_PATTERN.finditer(text_norm)}
+
+
+SKILL_EXTRACTION_PROMPT = """
     Extract ONLY skills that are EXACTLY mentioned in the text.
 
     STRICT RULES:
@@ -108,33 +258,52 @@ def extract_skills_llm(text: str, model: str, openai_key=None, groq_key=None, ge
     {text}
     """
 
+
+def skill_prompt(text: str, model: str) -> str:
+    fitted = fit_to_budget(SKILL_EXTRACTION_PROMPT.format(text=""), {"text": text}, provider=model)
+    return SKILL_EXTRACTION_PROMPT.format(text=fitted["text"])
+
+
+async def acall_skill_provider(prompt: str, model: str, openai_key=None, groq_key=None, gemini_key=None) -> Optional[str]:
+    # provider SDKs are imported on first use of their provider
     content = None
 
     if model == "openai" and openai_key:
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        from openai import AsyncOpenAI
+        async with AsyncOpenAI(api_key=openai_key) as client:
+            response = await client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=[{"role": "user", "content": prompt}]
+            )
         content = response.choices[0].message.content.strip()
 
     elif model == "groq" and groq_key:
+        from langchain_groq import ChatGroq
         llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=groq_key)
-        content = llm.invoke(prompt).content.strip()
+        content = (await llm.ainvoke(prompt)).content.strip()
 
     elif model == "gemini" and gemini_key:
+        from langchain_google_genai import ChatGoogleGenerativeAI
         llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=gemini_key)
-        content = llm.invoke(prompt).content.strip()
+        content = (await llm.ainvoke(prompt)).content.strip()
 
     elif model == "mistral":
+        from mistralai.async_client import MistralAsyncClient
         mistral_key = openai_key or os.getenv("MISTRAL_API_KEY")
-        mistral = MistralClient(api_key=mistral_key)
-        response = mistral.chat(
-            model="mistral-small-latest",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        mistral = MistralAsyncClient(api_key=mistral_key)
+        try:
+            response = await mistral.chat(
+                model="mistral-small-latest",
+                messages=[{"role": "user", "content": prompt}]
+            )
+        finally:
+            await mistral.close()
         content = response.choices[0].message.content.strip()
 
+    return content
+
+
+def parse_skills(content: str, text: str) -> Set[str]:
     skills = set()
 
     try:
@@ -152,17 +321,69 @@ def extract_skills_llm(text: str, model: str, openai_key=None, groq_key=None, ge
                 skills.add(mapped)
 
     # 🔥 remove hallucinations
-    text_norm = normalize_skill(text)
+    text_norm = normalize_text(text)
     skills = {s for s in skills if normalize_skill(s) in text_norm}
 
     return skills
 
 
-def hybrid_extract_skills(text, model, openai_key, groq_key, gemini_key):
-    return extract_skills_spacy(text).union(
-        extract_skills_llm(text, model, openai_key, groq_key, gemini_key)
+@timed("extract_skills_llm")
+async def aextract_skills_llm(text: str, model: str, openai_key=None, groq_key=None, gemini_key=None) -> Set[str]:
+
+    if model == LOCAL_MODEL:
+        return extract_skills_local(text)
+
+    prompt = skill_prompt(text, model)
+
+    # temperature None: the raw clients run with provider defaults
+    content = await acached_llm_call(
+        "extract_skills", model, MODEL_MAP.get(model, model), None, prompt,
+        lambda: acall_skill_provider(prompt, model, openai_key, groq_key, gemini_key),
+        credentials=(openai_key, groq_key, gemini_key)
     )
 
+    return parse_skills(content, text)
+
+
+def extract_skills_llm(text: str, model: str, openai_key=None, groq_key=None, gemini_key=None) -> Set[str]:
+    return run_sync(aextract_skills_llm(text, model, openai_key, groq_key, gemini_key))
+
+
+# concurrent extractions of the same text with the same model and keys run once
+_skill_flights = SingleFlight("skills")
+
+
+async def _ahybrid_extract_skills(text, model, openai_key, groq_key, gemini_key, document):
+    aliases = {}
+    # spaCy runs in the offload pool while the LLM call is in flight
+    spacy_skills, llm_skills = await asyncio.gather(
+        run_cpu(extract_skills_spacy, text, document, aliases),
+        aextract_skills_llm(text, model, openai_key, groq_key, gemini_key)
+    )
+    return spacy_skills.union(llm_skills), aliases
+
+
+async def _ahybrid_extract(text, model, openai_key, groq_key, gemini_key, document=None):
+    """(skills, semantic aliases of the spaCy pass); identical concurrent calls run once."""
+    document = layout_for(text, document)
+    layout = text_digest(body_text(document)) if document is not None else ""
+    key = (model, credential_digest(openai_key, groq_key, gemini_key), text_digest(text), layout)
+    return await _skill_flights.ado(key, _ahybrid_extract_skills, text, model, openai_key, groq_key, gemini_key, document)
+
+
+async def ahybrid_extract_skills(text, model, openai_key, groq_key, gemini_key, document=None):
+    """
+    spaCy and LLM skills of `text`. With the `document` it was parsed from,
+    spaCy reads the body blocks only (the LLM always gets the full text).
+    """
+    skills, _ = await _ahybrid_extract(text, model, openai_key, groq_key, gemini_key, document)
+    # copy: every coalesced caller gets the same set
+    return set(skills)
+
+
+def hybrid_extract_skills(text, model, openai_key, groq_key, gemini_key, document=None):
+    return run_sync(ahybrid_extract_skills(text, model, openai_key, groq_key, gemini_key, document))
+
 # ---------- Parent Expansion (FIXED) ---------- #
 
 def expand_with_parents(skills: Set[str], jd_norm_set: Set[str]) -> Set[str]:
@@ -183,66 +404,166 @@ def expand_with_parents(skills: Set[str], jd_norm_set: Set[str]) -> Set[str]:
 
 # ---------- Compare ---------- #
 
-def compare_skills(
-    resume_text: str,
+@timed("jd_skills")
+async def aextract_jd_skills(
     jd_text: str,
     model: str = "mistral",
     openai_key: str = None,
     groq_key: str = None,
     gemini_key: str = None
-) -> Dict:
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Returns (JD skills expanded with parents, normalized JD skill set).
+    The normalized set is what resume skills are expanded against.
+    """
 
-    jd_raw = hybrid_extract_skills(jd_text, model, openai_key, groq_key, gemini_key)
+    jd_raw, aliases = await _ahybrid_extract(jd_text, model, openai_key, groq_key, gemini_key)
+    return filter_jd_skills(jd_text, jd_raw, aliases)
 
-    jd_text_norm = normalize_skill(jd_text)
+
+def filter_jd_skills(
+    jd_text: str,
+    jd_raw: Iterable[str],
+    aliases: Optional[Dict[str, Iterable[str]]] = None
+) -> Tuple[Set[str], Set[str]]:
+    """
+    extract_jd_skills from already extracted (hybrid) skills: keeps those
+    the JD names itself, directly or through a semantic alias (`aliases`:
+    skill -> the JD phrases it was matched from), and expands them with the
+    parents it names.
+    """
+    jd_text_norm = normalize_text(jd_text)
 
     # ---------- STRICT JD FILTER ----------
-    jd_skills = set()
+    jd_bits = np.zeros(N_SKILLS, dtype=bool)
 
     for s in jd_raw:
-        norm = normalize_skill(s)
+        sid = skill_id(s)
+        if sid is None:
+            continue
+        norm = SKILL_NORMS[sid]
 
         if norm in jd_text_norm:
-            jd_skills.add(s)
+            jd_bits[sid] = True
             continue
 
         words = [w for w in norm.split() if len(w) > 3]
 
         if len(words) >= 2 and all(w in jd_text_norm for w in words):
-            jd_skills.add(s)
+            jd_bits[sid] = True
+            continue
+
+        # "k8s" in the JD, matched to Kubernetes
+        if aliases and any(normalize_skill(phrase) in jd_text_norm for phrase in aliases.get(s, ())):
+            jd_bits[sid] = True
 
     # prepare JD norm set
-    jd_norm = {normalize_skill(s): s for s in jd_skills}
-    jd_norm_set = set(jd_norm.keys())
+    jd_norm_set = {SKILL_NORMS[i] for i in np.flatnonzero(jd_bits)}
 
-    # expand JD
-    jd_skills = expand_with_parents(jd_skills, jd_norm_set)
+    # expand JD with the parents it names itself
+    jd_skills = set(bitset_to_skills(expand_bitsets(jd_bits, jd_bits)))
 
-    # resume
-    resume_skills = hybrid_extract_skills(resume_text, model, openai_key, groq_key, gemini_key)
-    resume_skills = expand_with_parents(resume_skills, jd_norm_set)
+    return jd_skills, jd_norm_set
+
+
+def extract_jd_skills(
+    jd_text: str,
+    model: str = "mistral",
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None
+) -> Tuple[Set[str], Set[str]]:
+    return run_sync(aextract_jd_skills(jd_text, model, openai_key, groq_key, gemini_key))
 
-    # ---------- MATCH ----------
-    resume_norm = {normalize_skill(s): s for s in resume_skills}
-    jd_norm = {normalize_skill(s): s for s in jd_skills}
 
-    matched = set()
+# (model, JD hash) -> (JD skills, normalized JD skill set)
+_jd_skill_cache = LRUCache(int(os.getenv("JD_SKILL_CACHE_SIZE", "1024")), name="jd_skills")
 
-    for r_norm, r_orig in resume_norm.items():
-        if r_norm in jd_norm:
-            matched.add(r_orig)
 
-    # ---------- MISSING ----------
-    missing = set()
+def cached_extract_jd_skills(
+    jd_text: str,
+    model: str = "mistral",
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None
+) -> Tuple[Set[str], Set[str]]:
+    """extract_jd_skills, cached per (model, JD text) for JDs scored repeatedly."""
+    key = (model, hashlib.sha256(jd_text.encode("utf-8")).hexdigest())
+    result = _jd_skill_cache.get(key)
+    if result is None:
+        result = extract_jd_skills(jd_text, model, openai_key, groq_key, gemini_key)
+        _jd_skill_cache.put(key, result)
+    return result
 
-    for jd_skill in jd_skills:
-        if normalize_skill(jd_skill) not in resume_norm:
-            missing.add(jd_skill)
+
+def match_skill_bitsets(resume_skills: Iterable[str], jd_skills: Iterable[str], jd_norm_set: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(expanded resume, matched, missing) bitsets for one resume against one JD."""
+    jd_bits = skills_to_bitset(jd_skills)
+    resume_bits = expand_bitsets(skills_to_bitset(resume_skills), norms_to_bitset(jd_norm_set))
+    return resume_bits, resume_bits & jd_bits, jd_bits & ~resume_bits
+
+
+def match_skills(resume_skills: Set[str], jd_skills: Set[str], jd_norm_set: Set[str]) -> Dict:
+    """Expands resume skills against the JD and computes matched/missing skills."""
+
+    resume_bits, matched, missing = match_skill_bitsets(resume_skills, jd_skills, jd_norm_set)
+    total_jd = int(matched.sum() + missing.sum())
 
     return {
-        "ats_score": round((len(matched) / max(1, len(jd_skills))) * 100, 2),
-        "matched_skills": sorted(matched),
-        "missing_skills": sorted(missing),
-        "total_resume_skills": sorted(resume_skills),
-        "total_jd_skills": sorted(jd_skills)
-    }
\ No newline at end of file
+        "ats_score": round((int(matched.sum()) / max(1, total_jd)) * 100, 2),
+        "matched_skills": bitset_to_skills(matched),
+        "missing_skills": bitset_to_skills(missing),
+        "total_resume_skills": bitset_to_skills(resume_bits),
+        "total_jd_skills": bitset_to_skills(matched | missing)
+    }
+
+
+async def acompare_skill_sets(
+    resume_text: str,
+    jd_text: str,
+    model: str = "mistral",
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None,
+    resume_document: Optional[Dict] = None
+) -> Tuple[Set[str], Dict]:
+    """(resume skills as extracted, before parent expansion; acompare_skills result)."""
+
+    async def resume():
+        with stage("resume_skills"):
+            return await ahybrid_extract_skills(resume_text, model, openai_key, groq_key, gemini_key, resume_document)
+
+    # JD and resume extraction run concurrently
+    (jd_skills, jd_norm_set), resume_skills = await asyncio.gather(
+        aextract_jd_skills(jd_text, model, openai_key, groq_key, gemini_key),
+        resume()
+    )
+
+    return resume_skills, match_skills(resume_skills, jd_skills, jd_norm_set)
+
+
+async def acompare_skills(
+    resume_text: str,
+    jd_text: str,
+    model: str = "mistral",
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None,
+    resume_document: Optional[Dict] = None
+) -> Dict:
+    _, skill_data = await acompare_skill_sets(
+        resume_text, jd_text, model, openai_key, groq_key, gemini_key, resume_document
+    )
+    return skill_data
+
+
+def compare_skills(
+    resume_text: str,
+    jd_text: str,
+    model: str = "mistral",
+    openai_key: str = None,
+    groq_key: str = None,
+    gemini_key: str = None,
+    resume_document: Optional[Dict] = None
+) -> Dict:
+    return run_sync(acompare_skills(resume_text, jd_text, model, openai_key, groq_key, gemini_key, resume_document))
@@ -0,0 +1,110 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+# Local model, so matching never costs a provider round-trip
+SEMANTIC_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Opt-in: aliases ("k8s", "Postgres") then count as their skills on both the
+# resume and the JD side, which changes ATS scores, and the MiniLM model is
+# loaded for extraction
+SEMANTIC_SKILL_MATCHING = os.getenv("SEMANTIC_SKILL_MATCHING", "0") == "1"
+SEMANTIC_MATCH_THRESHOLD = float(os.getenv("SEMANTIC_MATCH_THRESHOLD", "0.8"))
+
+CACHE_DIR = os.getenv(
+    "SKILL_VECTOR_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), ".cache")
+)
+
+# ---------- Helpers ---------- #
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def skill_vector_cache_path(skills: Iterable[str], model_name: str = SEMANTIC_MODEL, cache_dir: str = CACHE_DIR) -> str:
+    digest = hashlib.sha256(
+        "\n".join([model_name, *sorted(set(skills))]).encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(cache_dir, f"skill_vectors_{digest}.npy")
+
+# ---------- Matcher ---------- #
+
+class SemanticSkillMatcher:
+    """
+    Maps free-text phrases onto the skill whitelist by cosine similarity.
+
+    Every whitelist entry is embedded once into a row-normalized float32
+    matrix, cached on disk under a digest of (model, skills). A batch of
+    phrases is then matched with a single matrix multiply.
+    """
+
+    def __init__(self, skills: Iterable[str], model_name: str = SEMANTIC_MODEL, cache_dir: str = CACHE_DIR):
+        self.skills: List[str] = sorted(set(skills))
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        from langchain_community.embeddings import HuggingFaceEmbeddings  # pulls in sentence-transformers
+        self.embedder = HuggingFaceEmbeddings(model_name=model_name)
+        self.matrix = self._load_or_build_matrix()
+
+    def _cache_path(self) -> str:
+        return skill_vector_cache_path(self.skills, self.model_name, self.cache_dir)
+
+    def _load_or_build_matrix(self) -> np.ndarray:
+        path = self._cache_path()
+
+        if os.path.exists(path):
+            return np.load(path)
+
+        vectors = np.asarray(self.embedder.embed_documents(self.skills), dtype=np.float32)
+        matrix = _normalize_rows(vectors)
+
+        # replaced, not written in place: other workers (and preload's
+        # exists check) must never see a partly written file
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp, path)
+        return matrix
+
+    def match(self, phrases: List[str], threshold: Optional[float] = None) -> Dict[str, str]:
+        """
+        Returns {phrase: skill} for phrases whose nearest whitelist skill
+        scores at least `threshold`.
+        """
+        if not phrases:
+            return {}
+
+        threshold = SEMANTIC_MATCH_THRESHOLD if threshold is None else threshold
+
+        vectors = _normalize_rows(
+            np.asarray(self.embedder.embed_documents(phrases), dtype=np.float32)
+        )
+        sims = vectors @ self.matrix.T
+
+        best = sims.argmax(axis=1)
+        best_sims = sims[np.arange(len(phrases)), best]
+
+        return {
+            phrase: self.skills[idx]
+            for phrase, idx, sim in zip(phrases, best, best_sims)
+            if sim >= threshold
+        }
+
+
+_matcher: Optional[SemanticSkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_semantic_matcher(skills: Iterable[str]) -> SemanticSkillMatcher:
+    """Process-wide matcher, built once on first use (also under concurrent callers)."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SemanticSkillMatcher(skills)
+    return _matcher
@@ -0,0 +1,69 @@
+import os
+from typing import Dict, List, Optional
+
+# Routers a deployment serves: ENABLED_ROUTERS="resume_advisor,gap_analyzer"
+# imports only those (and their services), so a node that serves one
+# endpoint does not load the libraries of the others. Monitoring (/metrics,
+# /ready) is always on.
+ROUTERS = {  # router module -> OpenAPI tag
+    "gap_analyzer": "Gap Analyzer",
+    "resume_advisor": "Resume Advisor",
+    "resume_screening": "Resume Screening",
+    "video_gap_analyzer": "Video Gap Analyzer",
+    "talent_pool": "Talent Pool",
+    "job_matcher": "Job Matcher",
+    "jd_registry": "JD Registry",
+}
+MONITORING_ROUTERS = ("metrics", "health")
+
+ENABLED_ROUTERS = os.getenv("ENABLED_ROUTERS", "all")
+
+# Heavy libraries the app imports on first use only; startup_report.py
+# flags any of them that an import of the app pulls in
+DEFERRED_PACKAGES = (
+    "langchain",
+    "langchain_community",
+    "langchain_openai",
+    "langchain_mistralai",
+    "langchain_google_genai",
+    "langchain_groq",
+    "openai",
+    "mistralai",
+    "sentence_transformers",
+    "torch",
+    "spacy",
+    "faster_whisper",
+    "ctranslate2",
+    "ffmpeg",
+    "fuzzywuzzy",
+    "fitz",
+    "docx",
+)
+
+_startup: Dict = {"import_seconds": None, "routers": []}
+
+
+def enabled_routers(setting: Optional[str] = None) -> List[str]:
+    """Names of the routers to serve, in ROUTERS order; raises on unknown names."""
+    setting = ENABLED_ROUTERS if setting is None else setting
+    if setting.strip().lower() in ("", "all"):
+        return list(ROUTERS)
+    names = {name.strip() for name in setting.split(",") if name.strip()}
+    unknown = names - set(ROUTERS) - set(MONITORING_ROUTERS)
+    if unknown:
+        raise ValueError(f"Unknown routers in ENABLED_ROUTERS: {', '.join(sorted(unknown))}. Choose from {', '.join(ROUTERS)}.")
+    return [name for name in ROUTERS if name in names]
+
+
+def router_enabled(name: str) -> bool:
+    return name in enabled_routers()
+
+
+def record_startup(import_seconds: float, routers: List[str]) -> None:
+    """Called by main once the app is built."""
+    _startup["import_seconds"] = round(import_seconds, 3)
+    _startup["routers"] = list(routers)
+
+
+def startup_info() -> Dict:
+    return dict(_startup)
@@ -0,0 +1,80 @@
+import os
+import re
+from functools import lru_cache
+from services.lru_cache import LRUCache
+
+# Short strings (skill names, spaCy tokens, transcript words) repeat across
+# and within requests, so their normalized form is memoized; documents are
+# memoized separately in a small LRU so each resume/JD is normalized once.
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "65536"))
+NORMALIZE_MEMO_MAX_LEN = int(os.getenv("NORMALIZE_MEMO_MAX_LEN", "100"))
+NORMALIZED_TEXT_CACHE_SIZE = int(os.getenv("NORMALIZED_TEXT_CACHE_SIZE", "256"))
+
+# ---------- Patterns ---------- #
+
+# One pass drops version numbers ("3", "2.0") and every character outside
+# the skill alphabet; word boundaries are judged on the input, exactly as
+# when the two substitutions ran one after the other.
+_SKILL_DROP = re.compile(r"\b\d+(?:\.\d+)?\b|[^a-z0-9+#. ]")
+_SPOKEN_DROP = re.compile(r"[^a-z0-9\s.]")
+_REPEATED_WORD = re.compile(r"\b(\w+)( \1\b)+")
+
+
+def _collapse_spaces(text: str) -> str:
+    # same as re.sub(r"\s+", " ", text).strip()
+    return " ".join(text.split())
+
+# ---------- Skills & Documents ---------- #
+
+def _normalize(text: str) -> str:
+    text = _collapse_spaces(_SKILL_DROP.sub("", text.strip().lower()))
+
+    if text.endswith("s") and len(text) > 3:
+        text = text[:-1]
+
+    return text
+
+
+_normalize_short = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize)
+_normalized_texts = LRUCache(NORMALIZED_TEXT_CACHE_SIZE, name="normalized_texts")
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Lowercase, drop version numbers and punctuation outside `+#.`, collapse
+    whitespace and strip one trailing plural "s". Not idempotent.
+    """
+    if len(skill) <= NORMALIZE_MEMO_MAX_LEN:
+        return _normalize_short(skill)
+    return _normalize(skill)
+
+
+def normalize_text(text: str) -> str:
+    """
+    normalize_skill for a whole resume/JD, memoized so the stages of one
+    request (LLM hallucination filter, JD filter, local extraction) and
+    repeat JDs share one normalization.
+    """
+    normalized = _normalized_texts.get(text)
+    if normalized is None:
+        normalized = _normalize(text)
+        _normalized_texts.put(text, normalized)
+    return normalized
+
+# ---------- Transcripts ---------- #
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_spoken_short(text: str) -> str:
+    return _collapse_spaces(_SPOKEN_DROP.sub("", text.lower()))
+
+
+def normalize_spoken(text: str) -> str:
+    """Lowercase, keep letters, digits and dots, collapse whitespace."""
+    if len(text) <= NORMALIZE_MEMO_MAX_LEN:
+        return _normalize_spoken_short(text)
+    return _collapse_spaces(_SPOKEN_DROP.sub("", text.lower()))
+
+
+def collapse_repeated_words(text: str) -> str:
+    """Lowercase and collapse stutters ("the the the" -> "the")."""
+    return _collapse_spaces(_REPEATED_WORD.sub(r"\1", text.lower()))
@@ -1,32 +1,12 @@
 from typing import List
-from services.llm_utils import get_llm
-
-
-def get_video_feedback(
-    transcript_text: str,
-    jd_text: str,
-    matched_skills: List[str],
-    missing_skills: List[str],
-    model_name: str,
-    openai_api_key: str = None,
-    gemini_api_key: str = None,
-    mistral_api_key: str = None,
-    groq_api_key: str = None
-) -> str:
-    """
-    Generate human-readable video resume feedback using LLM.
-    Returns clean English text (NOT JSON).
-    """
-
-    llm = get_llm(
-        model_name,
-        openai_api_key=openai_api_key,
-        gemini_api_key=gemini_api_key,
-        mistral_api_key=mistral_api_key,
-        groq_api_key=groq_api_key
-    )
-
-    prompt = f"""
+from services.llm_utils import get_llm, MODEL_MAP, LLM_TEMPERATURE, LOCAL_MODEL
+from services.local_provider import local_video_feedback
+from services.llm_cache import acached_llm_call
+from services.prompt_builder import fit_to_budget
+from services.metrics import timed
+from services.async_runtime import run_sync
+
+VIDEO_FEEDBACK_PROMPT = """
 You are an expert recruiter evaluating a VIDEO RESUME.
 
 Analyze the candidate based on:
@@ -71,11 +51,60 @@ Focus on:
 Output:
 """
 
-    response = llm.predict(prompt)
+
+async def aget_video_feedback(
+    transcript_text: str,
+    jd_text: str,
+    matched_skills: List[str],
+    missing_skills: List[str],
+    model_name: str,
+    openai_api_key: str = None,
+    gemini_api_key: str = None,
+    mistral_api_key: str = None,
+    groq_api_key: str = None
+) -> str:
+    """
+    Generate human-readable video resume feedback using LLM.
+    Returns clean English text (NOT JSON).
+    """
+
+    if model_name == LOCAL_MODEL:
+        return local_video_feedback(matched_skills, missing_skills)
+
+    llm = get_llm(
+        model_name,
+        openai_api_key=openai_api_key,
+        gemini_api_key=gemini_api_key,
+        mistral_api_key=mistral_api_key,
+        groq_api_key=groq_api_key
+    )
+
+    fitted = fit_to_budget(
+        VIDEO_FEEDBACK_PROMPT.format(
+            jd_text="", transcript_text="", matched_skills=matched_skills, missing_skills=missing_skills
+        ),
+        {"jd_text": jd_text, "transcript_text": transcript_text},
+        provider=model_name,
+        priorities={"jd_text": 1, "transcript_text": 0},  # trim the transcript first
+    )
+    prompt = VIDEO_FEEDBACK_PROMPT.format(
+        jd_text=fitted["jd_text"],
+        transcript_text=fitted["transcript_text"],
+        matched_skills=matched_skills,
+        missing_skills=missing_skills,
+    )
+
+    response = await acached_llm_call(
+        "video_feedback", model_name, MODEL_MAP[model_name], LLM_TEMPERATURE, prompt,
+        lambda: llm.apredict(prompt),
+        credentials=(openai_api_key, gemini_api_key, mistral_api_key, groq_api_key),
+        semantic_text="\n\n".join([*fitted.values(), str(matched_skills), str(missing_skills)])
+    )
     return response.strip()
 
 
-def generate_video_feedback(
+@timed("video_feedback")
+async def agenerate_video_feedback(
     transcript_text: str,
     jd_text: str,
     matched_skills: List[str],
@@ -91,7 +120,7 @@ def generate_video_feedback(
     Returns clean feedback string.
     """
 
-    return get_video_feedback(
+    return await aget_video_feedback(
         transcript_text,
         jd_text,
         matched_skills,
@@ -101,4 +130,21 @@ def generate_video_feedback(
         gemini_api_key,
         mistral_api_key,
         groq_api_key
-    )
\ No newline at end of file
+    )
+
+
+def generate_video_feedback(
+    transcript_text: str,
+    jd_text: str,
+    matched_skills: List[str],
+    missing_skills: List[str],
+    model_name: str,
+    openai_api_key: str = None,
+    gemini_api_key: str = None,
+    mistral_api_key: str = None,
+    groq_api_key: str = None
+) -> str:
+    return run_sync(agenerate_video_feedback(
+        transcript_text, jd_text, matched_skills, missing_skills, model_name,
+        openai_api_key, gemini_api_key, mistral_api_key, groq_api_key
+    ))
@@ -1,11 +1,32 @@
 import os
 import re
 import json
-import ffmpeg
-from faster_whisper import WhisperModel
-
-# Load Whisper
-whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List
+from services import metrics
+from services.single_flight import SingleFlight, file_digest
+from services.text_normalization import collapse_repeated_words, normalize_spoken
+
+# Whisper is loaded on first use (or by the worker warm-up), never at import:
+# CTranslate2 starts its thread pool when the model is built, and those
+# threads would not survive a pre-fork preload. faster-whisper and ffmpeg
+# are only imported then too.
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = CTranslate2 default
+
+whisper_model = None
+_whisper_lock = threading.Lock()
+
+
+def get_whisper_model():
+    global whisper_model
+    if whisper_model is None:
+        with _whisper_lock:
+            if whisper_model is None:
+                from faster_whisper import WhisperModel
+                whisper_model = WhisperModel("base", device="cpu", compute_type="int8", cpu_threads=WHISPER_CPU_THREADS)
+    return whisper_model
 
 # -------------------------------
 # 📂 Load Skills List
@@ -20,11 +41,8 @@ with open(SKILLS_FILE, "r", encoding="utf-8") as f:
 # 🔧 Normalization Helpers
 # -------------------------------
 
-def normalize(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\.]", "", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+# memoized per word; shared with the rest of text normalization
+normalize = normalize_spoken
 
 
 # -------------------------------
@@ -73,11 +91,55 @@ def generate_variations(skill: str):
 
 
 # Build variation map
-VARIATION_MAP = {}
+def build_variation_map(skills) -> dict:
+    variation_map = {}
+
+    for skill in skills:
+        for variant in generate_variations(skill):
+            if variant:
+                variation_map[variant] = skill.lower()
+
+    return variation_map
+
+
+def compile_variation_pattern(variants) -> re.Pattern:
+    """
+    Compile all variants into a single regex factored as a character trie.
+
+    Each position in the transcript only walks the trie (bounded by the
+    longest variant), so matching cost does not grow with the number of
+    skills. Greedy optional groups make the longest variant win.
+    """
+    trie = {}
+
+    for variant in variants:
+        node = trie
+        for ch in variant:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-variant marker
+
+    def render(node) -> str:
+        branches = [
+            re.escape(ch) + render(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    body = render(trie)
+    if not body:
+        return re.compile(r"(?!)")  # no variants: never match
+
+    return re.compile(rf"\b{body}\b")
+
 
-for skill in SKILLS:
-    for variant in generate_variations(skill):
-        VARIATION_MAP[variant] = skill.lower()
+VARIATION_MAP = build_variation_map(SKILLS)
+VARIATION_PATTERN = compile_variation_pattern(VARIATION_MAP)
 
 
 # -------------------------------
@@ -87,21 +149,22 @@ for skill in SKILLS:
 def fix_transcript(text: str) -> str:
     """
     Replace spoken variations with canonical skill forms.
+
+    Single left-to-right pass: the longest variant starting at each position
+    wins and replaced text is never rescanned.
     """
     text = normalize(text)
 
-    for variant, canonical in VARIATION_MAP.items():
-        if variant in text:
-            text = re.sub(rf"\b{re.escape(variant)}\b", canonical, text)
-
-    return text
+    return VARIATION_PATTERN.sub(lambda m: VARIATION_MAP[m.group(0)], text)
 
 
 # -------------------------------
 # 🎯 Audio Extraction
 # -------------------------------
 
+@metrics.timed("audio_extract")
 def extract_audio(video_path: str) -> str:
+    import ffmpeg
     audio_path = video_path + ".wav"
 
     (
@@ -120,12 +183,7 @@ def extract_audio(video_path: str) -> str:
 # -------------------------------
 
 def clean_transcript(text: str) -> str:
-    text = text.lower()
-
-    text = re.sub(r"\b(\w+)( \1\b)+", r"\1", text)
-    text = re.sub(r"\s+", " ", text)
-
-    return text.strip()
+    return collapse_repeated_words(text)
 
 
 # -------------------------------
@@ -140,26 +198,136 @@ def llm_correct_transcript(text: str) -> str:
     return text
 
 
+# -------------------------------
+# ⏱️ Timestamped Transcript
+# -------------------------------
+
+class TimedTranscript:
+    """
+    Whisper output with segment and word timings kept in flat arrays.
+
+    `words` holds normalized word tokens; `word_starts` / `word_ends` are
+    parallel float32 arrays in seconds. Segment k spans words
+    `segment_first_word[k]` up to the next segment's first word.
+    """
+
+    __slots__ = (
+        "text",
+        "words",
+        "word_starts",
+        "word_ends",
+        "segment_starts",
+        "segment_ends",
+        "segment_first_word",
+    )
+
+    def __init__(self):
+        self.text = ""
+        self.words: List[str] = []
+        self.word_starts = array("f")
+        self.word_ends = array("f")
+        self.segment_starts = array("f")
+        self.segment_ends = array("f")
+        self.segment_first_word = array("I")
+
+    def add_segment(self, segment) -> None:
+        self.segment_starts.append(segment.start)
+        self.segment_ends.append(segment.end)
+        self.segment_first_word.append(len(self.words))
+
+        for word in segment.words or []:
+            token = normalize(word.word)
+            if not token:
+                continue
+            self.words.append(token)
+            self.word_starts.append(word.start)
+            self.word_ends.append(word.end)
+
+
+def find_skill_mentions(timed: TimedTranscript, skills: Iterable[str]) -> Dict[str, List[Dict]]:
+    """
+    Locate where each skill is spoken, using the same variation pattern as
+    fix_transcript over the word tokens.
+
+    Returns {skill: [{"start", "end", "text"}, ...]} for skills that were
+    mentioned; times are in seconds.
+    """
+    wanted = {s.lower(): s for s in skills}
+    if not wanted or not timed.words:
+        return {}
+
+    # char offset of each word in the space-joined token string
+    offsets = array("I")
+    pos = 0
+    for word in timed.words:
+        offsets.append(pos)
+        pos += len(word) + 1
+    text = " ".join(timed.words)
+
+    mentions: Dict[str, List[Dict]] = {}
+
+    for match in VARIATION_PATTERN.finditer(text):
+        skill = wanted.get(VARIATION_MAP[match.group(0)])
+        if not skill:
+            continue
+
+        first = bisect_right(offsets, match.start()) - 1
+        last = bisect_right(offsets, match.end() - 1) - 1
+
+        mentions.setdefault(skill, []).append({
+            "start": round(timed.word_starts[first], 2),
+            "end": round(timed.word_ends[last], 2),
+            "text": match.group(0),
+        })
+
+    return mentions
+
+
 # -------------------------------
 # 🎤 Main Pipeline
 # -------------------------------
 
-def transcribe_video(video_path: str) -> str:
+# the same upload transcribed concurrently (keyed by content) runs once
+_transcription_flights = SingleFlight("transcription")
+
+
+def transcribe_video_timed(video_path: str) -> TimedTranscript:
+    """
+    Transcribe a video keeping segment and word timestamps.
+    `.text` holds the corrected, cleaned transcript.
+
+    Concurrent calls for identical video content share one transcription
+    and receive the same TimedTranscript; treat it as read-only.
+    """
+    return _transcription_flights.do(file_digest(video_path), _transcribe_video_timed, video_path)
+
+
+def _transcribe_video_timed(video_path: str) -> TimedTranscript:
     audio_path = extract_audio(video_path)
 
-    # 🌍 Domain-agnostic Whisper prompt
-    segments, _ = whisper_model.transcribe(
-        audio_path,
-        initial_prompt=(
-            "This is a technical interview discussing software engineering, programming, "
-            "web development, mobile apps, cloud computing, DevOps, cybersecurity, data science, "
-            "machine learning, and IT tools. Technologies may include Python, Java, JavaScript, React, "
-            "Next.js, Node.js, FastAPI, Django, Flutter, Android, AWS, Azure, Docker, Kubernetes, "
-            "TensorFlow, SQL, MongoDB, Git, APIs, and modern frameworks."
+    timed = TimedTranscript()
+    texts = []
+
+    # segments are decoded lazily, so the stage covers the loop
+    with metrics.stage("transcription"):
+        # 🌍 Domain-agnostic Whisper prompt
+        segments, _ = get_whisper_model().transcribe(
+            audio_path,
+            word_timestamps=True,
+            initial_prompt=(
+                "This is a technical interview discussing software engineering, programming, "
+                "web development, mobile apps, cloud computing, DevOps, cybersecurity, data science, "
+                "machine learning, and IT tools. Technologies may include Python, Java, JavaScript, React, "
+                "Next.js, Node.js, FastAPI, Django, Flutter, Android, AWS, Azure, Docker, Kubernetes, "
+                "TensorFlow, SQL, MongoDB, Git, APIs, and modern frameworks."
+            )
         )
-    )
 
-    transcript = " ".join(segment.text for segment in segments)
+        for segment in segments:
+            timed.add_segment(segment)
+            texts.append(segment.text)
+
+    transcript = " ".join(texts)
 
     os.remove(audio_path)
 
@@ -172,4 +340,9 @@ def transcribe_video(video_path: str) -> str:
     # 🧠 Step 3 (optional LLM)
     # transcript = llm_correct_transcript(transcript)
 
-    return transcript
\ No newline at end of file
+    timed.text = transcript
+    return timed
+
+
+def transcribe_video(video_path: str) -> str:
+    return transcribe_video_timed(video_path).text
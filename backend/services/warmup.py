@@ -0,0 +1,104 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from services.startup import router_enabled, startup_info
+
+logger = logging.getLogger(__name__)
+
+# Run the warm-up when a server process starts; /ready answers 503 until it
+# is done. Off = ready immediately, models load on first use.
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+# Whisper is only needed by the video endpoints
+WARMUP_WHISPER = os.getenv("WARMUP_WHISPER", "1" if router_enabled("video_gap_analyzer") else "0") == "1"
+
+_ready = threading.Event()
+_state: Dict = {"started_at": None, "finished_at": None, "steps": {}, "errors": {}}
+_state_lock = threading.Lock()
+
+
+def _step(name: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:
+        logger.exception("warm-up step %s failed", name)
+        with _state_lock:
+            _state["errors"][name] = str(exc)
+    finally:
+        with _state_lock:
+            _state["steps"][name] = round(time.perf_counter() - start, 3)
+
+# ---------- Pre-fork ---------- #
+
+def preload() -> None:
+    """
+    Loads state that is safe to share with forked workers, before forking,
+    so its pages are shared copy-on-write instead of loaded per worker.
+
+    Importing the app already loads the skill whitelist, parent maps,
+    bitset matrices and compiled patterns. This adds the spaCy pipeline
+    (deferred at import) and the semantic skill matcher, but the latter only
+    when its skill vectors are cached on disk: building them would run the
+    model here, and native thread pools started before a fork do not survive
+    into the workers. Whisper is never preloaded for the same reason.
+    """
+    from services.skill_extractor import SKILL_WHITELIST, get_nlp
+    from services.skill_matcher import SEMANTIC_SKILL_MATCHING, get_semantic_matcher, skill_vector_cache_path
+
+    _step("preload_spacy", get_nlp)
+    if SEMANTIC_SKILL_MATCHING and os.path.exists(skill_vector_cache_path(SKILL_WHITELIST)):
+        _step("preload_semantic_matcher", lambda: get_semantic_matcher(SKILL_WHITELIST))
+
+# ---------- Per Process ---------- #
+
+def warm_up() -> None:
+    """
+    Builds what cannot cross a fork (Whisper) and runs one small input
+    through each local model, so the first real request pays no cold start.
+    Marks the process ready when done, even if a step failed (its error is
+    reported by readiness()); the endpoints it does not affect still work.
+    """
+    from services.skill_extractor import SKILL_WHITELIST, extract_skills_spacy
+    from services.skill_matcher import SEMANTIC_SKILL_MATCHING, get_semantic_matcher
+    from services.video_processor import get_whisper_model
+
+    with _state_lock:
+        _state["started_at"] = time.time()
+
+    _step("spacy", lambda: extract_skills_spacy("Backend engineer working with Python, FastAPI and Docker."))
+    if SEMANTIC_SKILL_MATCHING:
+        _step("semantic_matcher", lambda: get_semantic_matcher(SKILL_WHITELIST).match(["python programming"]))
+    if WARMUP_WHISPER:
+        _step("whisper", get_whisper_model)
+
+    with _state_lock:
+        _state["finished_at"] = time.time()
+    _ready.set()
+    logger.info("warm-up done in %.1fs (pid %d)", _state["finished_at"] - _state["started_at"], os.getpid())
+
+
+def start_warm_up() -> Optional[threading.Thread]:
+    """Runs warm_up() in the background so liveness checks answer meanwhile."""
+    if not WARMUP_ENABLED:
+        _ready.set()
+        return None
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def readiness() -> Dict:
+    with _state_lock:
+        return {
+            "ready": _ready.is_set(),
+            "pid": os.getpid(),
+            "steps": dict(_state["steps"]),
+            "errors": dict(_state["errors"]),
+            "startup": startup_info(),
+        }
@@ -0,0 +1,138 @@
+"""
+Startup report: imports the app in a fresh interpreter under
+`python -X importtime` and summarizes where the import time goes, per
+top-level package and per module, and which of the heavy libraries that
+should load on first use only (services.startup.DEFERRED_PACKAGES) were
+imported anyway.
+
+Usage (from backend/):
+    python startup_report.py
+    python startup_report.py --routers resume_advisor --top 10
+    python startup_report.py --json
+
+Exits with 1 when a deferred package is imported at startup, so it can
+guard against regressions in CI.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Dict, List
+
+# prints the app's own measurement of its import (services.startup) on stdout
+_CHILD = "import json, main; from services.startup import startup_info; print(json.dumps(startup_info()))"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routers", default=None, help="ENABLED_ROUTERS for the import (default: the environment's)")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime lines in output order: {"module", "depth", "self_us", "cumulative_us"}."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return entries
+
+
+def app_imports(entries: List[Dict]) -> List[Dict]:
+    """The entries imported by `import main`: children are listed before their parent."""
+    start = 0
+    for i, entry in enumerate(entries):
+        if entry["depth"] == 0:
+            if entry["module"] == "main":
+                return entries[start:i + 1]
+            start = i + 1
+    return []
+
+
+def build_report(entries: List[Dict], top: int) -> Dict:
+    from services.startup import DEFERRED_PACKAGES
+
+    imported = app_imports(entries)
+    packages = defaultdict(int)
+    for entry in imported:
+        packages[entry["module"].split(".")[0]] += entry["self_us"]
+
+    main_us = imported[-1]["cumulative_us"] if imported else 0
+    deferred = sorted({entry["module"].split(".")[0] for entry in imported} & set(DEFERRED_PACKAGES))
+    return {
+        "import_seconds": round(main_us / 1e6, 3),
+        "modules_imported": len(imported),
+        "packages": [
+            {"package": name, "seconds": round(us / 1e6, 3)}
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+        "modules": [
+            {"module": e["module"], "self_seconds": round(e["self_us"] / 1e6, 3), "cumulative_seconds": round(e["cumulative_us"] / 1e6, 3)}
+            for e in sorted(imported, key=lambda e: -e["self_us"])[:top]
+        ],
+        "deferred_packages_imported": deferred,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"app import: {report['import_seconds']:.3f}s ({report['modules_imported']} modules), "
+          f"process: {report['process_seconds']:.3f}s")
+    if report.get("startup"):
+        print(f"routers: {', '.join(report['startup']['routers']) or '-'}")
+
+    print("\npackage (self time summed) | seconds")
+    for row in report["packages"]:
+        print(f"{row['package']:>26} | {row['seconds']:.3f}")
+
+    print("\nmodule | self s | cumulative s")
+    for row in report["modules"]:
+        print(f"{row['module']} | {row['self_seconds']:.3f} | {row['cumulative_seconds']:.3f}")
+
+    deferred = report["deferred_packages_imported"]
+    print("\ndeferred packages imported at startup: " + (", ".join(deferred) if deferred else "none"))
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    env = dict(os.environ)
+    if args.routers is not None:
+        env["ENABLED_ROUTERS"] = args.routers
+
+    started = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if child.returncode != 0:
+        sys.stderr.write("\n".join(line for line in child.stderr.splitlines() if not line.startswith("import time:")) + "\n")
+        return child.returncode
+
+    report = build_report(parse_importtime(child.stderr), args.top)
+    report["process_seconds"] = round(elapsed, 3)
+    report["startup"] = json.loads(child.stdout.strip().splitlines()[-1]) if child.stdout.strip() else None
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report["deferred_packages_imported"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import tempfile
+from typing import List
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# stores and caches the services open at import go to a scratch directory
+_scratch = tempfile.mkdtemp(prefix="hireminds-tests-")
+for _name in ("SKILL_VECTOR_CACHE_DIR", "CANDIDATE_STORE_DIR", "JD_REGISTRY_DIR", "PROFILE_DIR"):
+    os.environ.setdefault(_name, os.path.join(_scratch, _name.lower()))
+
+# ---------- Stand-ins ---------- #
+
+class FakeToken:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos_ = "PROPN"
+
+
+class FakeDoc:
+    """Every word is a proper noun; enough for the whitelist mapping in _skills_from_doc."""
+
+    def __init__(self, text: str):
+        self.tokens = [FakeToken(w) for w in re.findall(r"[\w+#.]+", text)]
+        self.noun_chunks = []
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+
+class FakeNLP:
+    def __call__(self, text: str) -> FakeDoc:
+        return FakeDoc(text)
+
+    def pipe(self, texts, batch_size: int = 64):
+        return (FakeDoc(text) for text in texts)
+
+
+class TaskTypeEmbeddings:
+    """
+    Deterministic embeddings that, like Gemini's, give queries and documents
+    different vectors unless embed_documents is asked for the query task type.
+    """
+
+    dim = 16
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _vector(self, text: str, task_type: str) -> List[float]:
+        seed = int(hashlib.sha256(f"{task_type}\0{text}".encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).standard_normal(self.dim).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text, "RETRIEVAL_QUERY")
+
+    def embed_documents(self, texts: List[str], task_type: str = "RETRIEVAL_DOCUMENT") -> List[List[float]]:
+        return [self._vector(text, task_type) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str], task_type: str = "RETRIEVAL_DOCUMENT") -> List[List[float]]:
+        return self.embed_documents(texts, task_type)
+
+
+async def fake_skill_provider(prompt: str, model: str, openai_key=None, groq_key=None, gemini_key=None) -> str:
+    """An LLM that returns exactly the whitelist skills of the prompt's text."""
+    from services.skill_extractor import extract_skills_local
+    return json.dumps(sorted(extract_skills_local(prompt.split("Text:")[-1])))
+
+# ---------- Fixtures ---------- #
+
+@pytest.fixture
+def fake_nlp(monkeypatch):
+    from services import skill_extractor
+    monkeypatch.setattr(skill_extractor, "_nlp", FakeNLP())
+
+
+@pytest.fixture
+def fake_providers(monkeypatch, fake_nlp):
+    """spaCy, the skill LLM and the embedding models replaced by the stand-ins above."""
+    from services import batch_analysis, embeddings, skill_extractor
+    monkeypatch.setattr(skill_extractor, "acall_skill_provider", fake_skill_provider)
+    monkeypatch.setattr(batch_analysis, "acall_skill_provider", fake_skill_provider)
+    monkeypatch.setattr(embeddings, "_create_embedding_model", lambda *args, **kwargs: TaskTypeEmbeddings())
+
+
+@pytest.fixture
+def pool_dir(tmp_path):
+    return str(tmp_path / "pool")
@@ -0,0 +1,83 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from services.candidate_store import CandidateStore
+from services.skill_extractor import SKILL_NORMS, normalize_skill, pack_bitset, unpack_bitset
+
+SKILLS = ["Python", "Docker", "Kubernetes", "React"]
+
+
+def write_pool(path, norms, digest, skills):
+    """A one-row pool as a process with whitelist `norms` (ids digest `digest`) would have written it."""
+    bits = np.zeros(len(norms), dtype=bool)
+    for skill in skills:
+        bits[norms.index(normalize_skill(skill))] = True
+
+    os.makedirs(path)
+    with open(os.path.join(path, "info.json"), "w", encoding="utf-8") as f:
+        json.dump({"dim": 2, "trained_size": 0, "skill_ids": {digest: norms}}, f)
+    np.array([[1.0, 0.0]], dtype=np.float32).tofile(os.path.join(path, "vectors.f32"))
+    with open(os.path.join(path, "meta.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "c1", "name": "old", "skill_bits": pack_bitset(bits), "skill_ids": digest}) + "\n")
+
+
+def test_round_trip(pool_dir):
+    CandidateStore(pool_dir).add([0.6, 0.8], SKILLS, name="jane", readability_score=80)
+
+    candidate = CandidateStore(pool_dir).candidate(0)
+    assert candidate["skills"] == sorted(SKILLS)
+    assert (candidate["name"], candidate["readability_score"]) == ("jane", 80)
+
+
+def test_rows_from_an_older_whitelist_are_remapped(pool_dir):
+    # the older whitelist had another order, one skill the current one
+    # lacks, and lacked the last current skill
+    old_norms = ["retired skill"] + list(reversed(SKILL_NORMS))[1:]
+    write_pool(pool_dir, old_norms, "old-whitelist", SKILLS)
+
+    store = CandidateStore(pool_dir)
+    assert store.candidate(0)["skills"] == sorted(SKILLS)
+
+    # rows added now are packed with the current ids, next to the old ones
+    store.add([0.0, 1.0], ["Go"])
+    reopened = CandidateStore(pool_dir)
+    assert [reopened.candidate(i)["skills"] for i in range(2)] == [sorted(SKILLS), ["Go"]]
+
+
+def test_rows_from_an_unknown_whitelist_are_rejected(pool_dir):
+    write_pool(pool_dir, list(SKILL_NORMS), "other", SKILLS)
+    with open(os.path.join(pool_dir, "info.json"), "w", encoding="utf-8") as f:
+        json.dump({"dim": 2, "trained_size": 0, "skill_ids": {}}, f)
+
+    with pytest.raises(ValueError):
+        CandidateStore(pool_dir)
+
+
+def test_unpack_bitset_rejects_a_wrong_length():
+    packed = pack_bitset(np.ones(len(SKILL_NORMS) + 8, dtype=bool))
+    with pytest.raises(ValueError):
+        unpack_bitset(packed)
+
+
+@pytest.mark.usefixtures("fake_providers")
+def test_gap_analysis_pools_the_same_entry_as_add_resume_to_pool(monkeypatch, tmp_path):
+    from services import candidate_store
+    from services.embeddings import add_resume_to_pool, calculate_gap_score
+
+    monkeypatch.setattr(candidate_store, "CANDIDATE_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(candidate_store, "_stores", {})
+    resume = "Skills\nDocker, Kubernetes, Kafka\n\nExperience\nRan event-driven services."
+    # the JD expects parents of the resume's skills, which must not be pooled
+    jd = "Microservices and Data Engineering role: Docker, Kubernetes and Kafka."
+
+    calculate_gap_score(resume, jd, "gemini", gemini_api_key="test-key", add_to_pool=True)
+    add_resume_to_pool(resume, "gemini", gemini_api_key="test-key")
+
+    store = candidate_store.get_candidate_store("gemini")
+    pooled = [{k: v for k, v in store.candidate(i).items() if k != "id"} for i in range(2)]
+    assert pooled[0] == pooled[1]
+    assert pooled[0]["skills"] == ["Docker", "Kafka", "Kubernetes"]
+    assert pooled[0]["readability_score"] is not None
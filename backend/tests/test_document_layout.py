@@ -0,0 +1,37 @@
+from services.document_layout import body_text, build_document
+
+
+def line(text, block, size=10.0, bold=False):
+    return {"text": text, "size": size, "bold": bold, "page": 0, "block": block}
+
+
+LINES = [
+    line("Jane Doe", 0, size=20, bold=True),
+    line("jane@example.com | +1 555 123 4567", 1),
+    line("Experience", 2, size=14, bold=True),
+    line("Senior Python Developer", 3, bold=True),
+    line("Built FastAPI services on Kubernetes for a payments team.", 4),
+    line("Skills", 5, size=14, bold=True),
+    line("Python, Java, Docker", 6, bold=True),
+    line("Go | Rust | Terraform", 7, bold=True),
+]
+
+
+def document():
+    return build_document("\n".join(l["text"] for l in LINES), LINES)
+
+
+def test_styled_lists_are_not_headings():
+    headings = {block["text"] for block in document()["blocks"] if block["heading"]}
+    assert headings == {"Jane Doe", "Experience", "Senior Python Developer", "Skills"}
+
+
+def test_body_text_keeps_bold_content_lines():
+    body = body_text(document()).split("\n\n")
+
+    assert "Python, Java, Docker" in body
+    assert "Go | Rust | Terraform" in body
+    assert "Senior Python Developer" in body
+    # section headings and contact details are what it drops
+    assert "Experience" not in body and "Skills" not in body
+    assert not any("jane@example.com" in part for part in body)
@@ -0,0 +1,71 @@
+"""The vectorized scoring paths give calculate_gap_score's result for every pair."""
+import pytest
+
+from services.batch_analysis import batch_gap_analysis
+from services.embeddings import batch_gap_scores, calculate_gap_score, get_embedding_model
+from services.job_matching import rank_jobs_for_resume
+from services.skill_extractor import extract_jd_skills, hybrid_extract_skills, match_skills
+
+MODEL = "gemini"
+KEY = "test-key"
+
+FIELDS = (
+    "score", "skill_score", "embedding_score", "matched_skills",
+    "missing_skills", "total_resume_skills", "total_jd_skills",
+)
+
+RESUMES = [
+    "Backend engineer.\n\nSkills\nPython, Django, Docker, PostgreSQL, AWS",
+    "Frontend developer building React and TypeScript apps with Redux and CSS.",
+    "Data engineer: Spark, Kafka, SQL and Airflow pipelines on Kubernetes.",
+]
+JDS = [
+    "We need a Python developer with Django, Docker and AWS experience.",
+    "Hiring a frontend engineer: React, TypeScript, JavaScript and CSS.",
+    "Data platform role using Spark, Kafka, SQL, Kubernetes and Python.",
+]
+
+
+def single(resume_text, jd_text):
+    result = calculate_gap_score(resume_text, jd_text, MODEL, gemini_api_key=KEY)
+    return {field: result[field] for field in FIELDS}
+
+
+@pytest.mark.usefixtures("fake_providers")
+def test_job_ranking_matches_single_pair():
+    jobs = [{"job_id": i, "title": f"job {i}", "jd_text": jd} for i, jd in enumerate(JDS)]
+
+    for resume_text in RESUMES:
+        for result in rank_jobs_for_resume(resume_text, jobs, MODEL, gemini_api_key=KEY)["results"]:
+            assert {field: result[field] for field in FIELDS} == single(resume_text, JDS[result["job_id"]])
+
+
+@pytest.mark.usefixtures("fake_providers")
+def test_screening_scores_match_single_pair():
+    jd_text = JDS[0]
+    jd_skills, jd_norm_set = extract_jd_skills(jd_text, model=MODEL, gemini_key=KEY)
+    embedder = get_embedding_model(MODEL, gemini_api_key=KEY)
+
+    # as /screen-resumes scores them
+    skill_sets = [
+        match_skills(hybrid_extract_skills(text, MODEL, None, None, KEY), jd_skills, jd_norm_set)["total_resume_skills"]
+        for text in RESUMES
+    ]
+    ranked = batch_gap_scores(embedder.embed_query(jd_text), embedder.embed_queries(RESUMES), jd_skills, skill_sets)
+
+    for result in ranked:
+        assert {field: result[field] for field in FIELDS} == single(RESUMES[result["name"]], jd_text)
+
+
+@pytest.mark.usefixtures("fake_providers")
+def test_batch_gap_analysis_matches_single_pair():
+    pairs = [
+        {"id": f"{r}-{j}", "resume_text": resume_text, "jd_text": jd_text}
+        for r, resume_text in enumerate(RESUMES)
+        for j, jd_text in enumerate(JDS)
+    ]
+    results, stats = batch_gap_analysis(pairs, MODEL, gemini_api_key=KEY)
+
+    assert stats["failed_pairs"] == 0
+    for pair, result in zip(pairs, results):
+        assert {field: result[field] for field in FIELDS} == single(pair["resume_text"], pair["jd_text"])
@@ -0,0 +1,73 @@
+"""analyze_incremental gives the full pipeline's result, with or without a parsed document."""
+import pytest
+
+from services.document_layout import build_document
+from services.embeddings import calculate_gap_score
+from services.incremental_analysis import analyze_incremental
+
+MODEL = "gemini"
+KEY = "test-key"
+
+FIELDS = (
+    "score", "skill_score", "embedding_score", "matched_skills",
+    "missing_skills", "total_resume_skills", "total_jd_skills",
+)
+
+JD = "Looking for Python, Rust, Docker, Kubernetes, FastAPI and Terraform experience."
+
+
+def line(text, block, size=10.0, bold=False):
+    return {"text": text, "size": size, "bold": bold, "page": 0, "block": block}
+
+
+# a skill only on the contact line: spaCy skips it when it reads the layout
+LINES = [
+    line("Jane Doe", 0, size=20, bold=True),
+    line("jane@example.com | Rust meetup organizer", 1),
+    line("Experience", 2, size=14, bold=True),
+    line("Senior Python Developer", 3, bold=True),
+    line("Built FastAPI services on Kubernetes.", 4),
+    line("Skills", 5, size=14, bold=True),
+    line("Docker, Terraform", 6, bold=True),
+]
+TEXT = "\n\n".join(l["text"] for l in LINES)
+
+
+@pytest.fixture
+def spacy_only(monkeypatch, fake_providers):
+    """An LLM that finds nothing, so the skills are the spaCy pass's."""
+    from services import skill_extractor
+
+    async def no_skills(*args, **kwargs):
+        return "[]"
+
+    monkeypatch.setattr(skill_extractor, "acall_skill_provider", no_skills)
+
+
+def full(text, document):
+    result = calculate_gap_score(text, JD, MODEL, gemini_api_key=KEY, resume_document=document)
+    return {field: result[field] for field in FIELDS}
+
+
+def incremental(text, document):
+    result = analyze_incremental(text, JD, MODEL, gemini_api_key=KEY, document=document)
+    return {field: result[field] for field in FIELDS}
+
+
+@pytest.mark.usefixtures("spacy_only")
+@pytest.mark.parametrize("with_document", [False, True])
+def test_incremental_matches_full_analysis(with_document):
+    document = build_document(TEXT, LINES) if with_document else None
+    assert incremental(TEXT, document) == full(TEXT, document)
+
+
+@pytest.mark.usefixtures("spacy_only")
+def test_incremental_matches_full_analysis_after_an_edit():
+    document = build_document(TEXT, LINES)
+    incremental(TEXT, document)
+
+    # the edited text no longer has the uploaded file's layout
+    edited = TEXT.replace("Docker, Terraform", "Docker, Terraform, Rust")
+    result = analyze_incremental(edited, JD, MODEL, gemini_api_key=KEY, document=document)
+    assert result["changed_blocks"] == 1
+    assert {field: result[field] for field in FIELDS} == full(edited, document)
@@ -0,0 +1,44 @@
+"""Two JDRegistry instances on one directory behave like two serve.py workers."""
+import pytest
+
+from services import jd_registry
+from services.jd_registry import JDRegistry
+
+JD = "Backend role: Python, Docker and Kubernetes."
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    def extract(jd_text, model, openai_key=None, groq_key=None, gemini_key=None):
+        return {model}, {model.lower()}
+
+    class Embedder:
+        def embed_query(self, text):
+            return [1.0, 0.0]
+
+    monkeypatch.setattr(jd_registry, "extract_jd_skills", extract)
+    monkeypatch.setattr(jd_registry, "get_embedding_model", lambda *args: Embedder())
+    return JDRegistry(str(tmp_path)), JDRegistry(str(tmp_path))
+
+
+def test_artifacts_of_other_workers_are_kept(workers):
+    a, b = workers
+    jd_id = a.register(JD)["jd_id"]
+
+    a.artifacts(jd_id, "openai")
+    b.artifacts(jd_id, "gemini")
+    a.artifacts(jd_id, "mistral")
+
+    assert sorted(b.get(jd_id)["artifacts"]) == ["gemini", "mistral", "openai"]
+
+
+def test_delete_is_seen_by_other_workers(workers):
+    a, b = workers
+    jd_id = a.register(JD)["jd_id"]
+    assert b.get(jd_id) is not None
+
+    assert a.delete(jd_id)
+    assert b.get(jd_id) is None
+    assert not b.delete(jd_id)
+    with pytest.raises(KeyError):
+        b.artifacts(jd_id, "openai")
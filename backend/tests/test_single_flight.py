@@ -0,0 +1,85 @@
+import time
+import uuid
+import threading
+
+from services.llm_cache import cached_llm_call
+from services.single_flight import SingleFlight, credential_digest
+
+
+def run_concurrently(*calls):
+    results, errors = [None] * len(calls), []
+
+    def run(i, call):
+        try:
+            results[i] = call()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    return results
+
+
+def test_credential_digest():
+    assert credential_digest() == credential_digest(None, None) == ""
+    assert credential_digest("key-a") == credential_digest("key-a")
+    assert credential_digest("key-a") != credential_digest("key-b")
+    # which provider a key is for counts
+    assert credential_digest("key-a", None) != credential_digest(None, "key-a")
+
+
+def test_same_key_runs_once():
+    flight = SingleFlight("test")
+    started, calls = threading.Event(), []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "result"
+
+    def follower():
+        started.wait()
+        return flight.do("key", compute)
+
+    assert run_concurrently(lambda: flight.do("key", compute), follower) == ["result", "result"]
+    assert len(calls) == 1
+
+
+def test_llm_calls_with_other_credentials_are_not_coalesced():
+    prompt = f"prompt {uuid.uuid4()}"
+    # each call waits for the other: coalescing them would break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def call(key):
+        def provider():
+            barrier.wait()
+            return f"answer with {key}"
+        return lambda: cached_llm_call("test", "openai", "model", None, prompt, provider, credentials=(key,))
+
+    assert run_concurrently(call("key-a"), call("key-b")) == ["answer with key-a", "answer with key-b"]
+
+
+def test_llm_calls_with_the_same_credentials_run_once():
+    prompt = f"prompt {uuid.uuid4()}"
+    started, calls = threading.Event(), []
+
+    def provider():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "answer"
+
+    def leader():
+        return cached_llm_call("test", "openai", "model", None, prompt, provider, credentials=("key-a",))
+
+    def follower():
+        started.wait()
+        return cached_llm_call("test", "openai", "model", None, prompt, provider, credentials=("key-a",))
+
+    assert run_concurrently(leader, follower) == ["answer", "answer"]
+    assert len(calls) == 1